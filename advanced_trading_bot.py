@@ -15,13 +15,22 @@ import hashlib
 import hmac
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import requests
 import numpy as np
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 from typing import Dict, List, Tuple, Optional
 import logging
 
+from state_store import StateStore
+from signal_journal import SignalJournal, ccxt_candle_fetcher
+from universe_prefilter import UniversePrefilter
+from http_clients import get_session
+from tail_windows import TailWindows
+from candle_resampler import CandleResampler
+from kline_cache import KlineCache
+from sector_analytics import SectorMap, SectorSnapshot, compute_sector_stats
+from analysis_cache import AnalysisCache, closed_candles, config_fingerprint, last_closed_ts
+
 # المكتبات الأساسية
 try:
     import ccxt
@@ -107,23 +116,49 @@ class TradingConfig:
     # الأطر الزمنية
     TREND_TIMEFRAME = '4h'    # تحديد الاتجاه
     ENTRY_TIMEFRAME = '15m'   # إشارات الدخول (15 دقيقة أو 5 دقائق)
+    # إطارات تُبنى محلياً من شموع الدخول (REST للتاريخ العميق أول مرة فقط)
+    RESAMPLED_TIMEFRAMES = ('4h',)
     
     # الفلاتر
     MIN_VOLUME_USDT = 10000000  # 10 مليون دولار حد أدنى
     MIN_24H_CHANGE = -5.0       # تقليل عدد العملات الضعيفة
     STABLE_COINS = ['USDT', 'USDC', 'DAI', 'BUSD', 'TUSD']  # عملات مستقرة
     
+    # وضع توسيع النطاق: كل أزواج USDT عبر فلتر مسبق بدل أعلى 25 فقط
+    UNIVERSE_EXPANSION_MODE = False
+    UNIVERSE_MIN_VOLUME_USDT = 1000000  # حد أدنى أخف في وضع التوسيع
+    UNIVERSE_MAX_SURVIVORS = 40         # عدد العملات التي تصل للتحليل الكامل
+    UNIVERSE_CORE_TOP = 10              # أعلى N بالحجم تمر دائماً
+    
+    # دوران القطاعات (كل دورة مسح)
+    SECTOR_ANALYTICS_ENABLED = True
+    SECTOR_RS_THRESHOLD = 1.0           # نقاط % فوق/تحت عائد السوق → قطاع قائد/متأخر
+    SECTOR_BREADTH_THRESHOLD = 0.6      # نسبة العملات الصاعدة في القطاع القائد
+    SECTOR_MIN_COINS = 2                # قطاع بعملة واحدة لا يُحتسب زخمه
+    
     # إعدادات الرسائل
     AVOID_DUPLICATE_HOURS = 1  # عدم تكرار الإشارات خلال ساعة واحدة
     
     # إعدادات الأداء
     MAX_CONCURRENT_ANALYSIS = 10  # عدد العملات التي تحلل بالتوازي
     CACHE_TIMEOUT = 300           # مدة كاش البيانات (5 دقائق)
+    CACHE_MAX_ENTRIES = 512       # حد أقصى لإطارات الشموع في الكاش (LRU)
+    ANALYSIS_CACHE_ENABLED = True     # تحليل الاتجاه (4h) مرة واحدة لكل شمعة مغلقة
+    ANALYSIS_CACHE_MAX_ENTRIES = 1024
     
     # API Rate Limiting
     API_CALLS_PER_MINUTE = 1200  # حد أقصى للطلبات
     HEARTBEAT_INTERVAL = 3600    # ثانية بين رسائل heartbeat (1 ساعة)
     
+    # لقطات الحالة (استرجاع الكاش وسجل التنبيهات بعد إعادة التشغيل)
+    STATE_FILE = 'advanced_bot_state.pkl'
+    STATE_CHECKPOINT_INTERVAL = 60  # ثانية بين اللقطات
+    STATE_HISTORY_PER_SYMBOL = 50   # آخر N تنبيه محفوظ لكل عملة
+    
+    # سجل الإشارات (SQLite مشترك بين البوتات)
+    JOURNAL_DB = 'signal_journal.db'
+    JOURNAL_MAX_HOURS = 24          # بعدها تُحسم الإشارة كـ EXPIRED
+    
     # قاموس القطاعات
     CRYPTO_SECTORS = {
         # Layer 1 / Blockchain
@@ -218,25 +253,21 @@ class TradingConfig:
         'XRP': 'Payment',
         'LTC': 'Payment',
         'BCH': 'Payment',
-        'DASH': 'Payment',
-        'DOGE': 'Payment',
         
         # RWA / Real World Assets
         'ONDO': 'RWA',
         'MKR': 'RWA/Governance',
         
         # Governance
-        'AAVE': 'Governance',
-        'UNI': 'Governance',
-        'MKR': 'Governance',
         'ENS': 'Governance',
     }
+    # كل رمز في قطاع واحد (القطاع الأساسي)؛ التكرار كان يستبدل القيمة الأولى بصمت
+    SECTOR_LOOKUP = SectorMap(CRYPTO_SECTORS)
     
     @staticmethod
     def get_sector(symbol: str) -> str:
         """احصل على قطاع العملة من الرمز"""
-        symbol_clean = symbol.replace('/USDT', '').replace('USDT', '').strip()
-        return TradingConfig.CRYPTO_SECTORS.get(symbol_clean, 'Other')
+        return TradingConfig.SECTOR_LOOKUP.sector(symbol)
 
 # ============================================================================
 # نظام التنبيهات عبر Telegram
@@ -248,7 +279,7 @@ class TelegramNotifier:
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.api_url = f"https://api.telegram.org/bot{bot_token}"
-        self.session = requests.Session()
+        self.session = get_session()  # اتصال مشترك (keep-alive)
         self.notification_history = defaultdict(deque)  # ذاكرة الإشارات
         self._last_update_id = None
         self._update_bot_commands()
@@ -346,6 +377,14 @@ class TelegramNotifier:
         t2_pct = ((t2 - price) / price * 100) if price > 0 else 0
         sl_pct = abs((sl - price) / price * 100) if price > 0 else 0
         
+        # القطاع وزخمه (إن توفر)
+        sector = data.get('sector')
+        sector_line = ""
+        if sector:
+            sector_icon = {'LEADING': '🟢', 'LAGGING': '🔴'}.get(sector['momentum'], '🟡')
+            sector_line = (f"\n🧭 {sector['sector']} {sector_icon} RS <code>{sector['relative_strength']:+.1f}%</code>"
+                           f" · صعود {sector['breadth'] * 100:.0f}%")
+        
         # التنبيه المضغوط الذكي مع مؤشر الوضع
         message = f"""
 ╔═══ {signal_emoji} <b>{signal_type}</b> {mode_badge} ═══╗
@@ -353,7 +392,7 @@ class TelegramNotifier:
 💲 <code>${price:.6f}</code> ({change:+.1f}%)
 
 🎯 T1: <code>+{t1_pct:.1f}%</code> | T2: <code>+{t2_pct:.1f}%</code> | SL: <code>-{sl_pct:.1f}%</code>
-📊 RSI {rsi_icon}<code>{rsi:.0f}</code> · {data.get('macd_signal', 'N/A')[:8]} · {data.get('ema_status', 'N/A')[:8]}
+📊 RSI {rsi_icon}<code>{rsi:.0f}</code> · {data.get('macd_signal', 'N/A')[:8]} · {data.get('ema_status', 'N/A')[:8]}{sector_line}
 
 <code>#{symbol}</code> · {datetime.now().strftime('%H:%M')}
         """
@@ -441,11 +480,12 @@ class ICTAnalyzer:
         """
         كشف Order Blocks (مناطق الكسر)
         آخر شمعة قبل الكسر = منطقة إعادة الترتد
+        (مقارنات مزاحة على كل الشموع دفعة واحدة بدل حلقة شمعة بشمعة)
         """
-        recent = df.tail(lookback)
-        close = recent['close'].values
-        high = recent['high'].values
-        low = recent['low'].values
+        # شرائح numpy مباشرة (أرخص من df.tail لكل دالة)
+        close = df['close'].values[-lookback:]
+        high = df['high'].values[-lookback:]
+        low = df['low'].values[-lookback:]
         
         order_blocks = {
             'buy_blocks': [],      # مناطق شراء (كسر لأعلى)
@@ -454,44 +494,45 @@ class ICTAnalyzer:
             'nearest_sell': None
         }
         
-        # البحث عن كسور صاعدة وهابطة
-        for i in range(2, len(close) - 1):
-            # كسر صاعد: اثنين من الشموع الهابطة تليها شمعة صاعدة قوية
-            if (close[i-2] > close[i-1] and close[i] > close[i-1] and 
-                close[i] > close[i-2] and (high[i] - low[i]) > (high[i-1] - low[i-1])):
-                
-                block_high = max(high[i-2], high[i-1])
-                block_low = min(low[i-2], low[i-1])
-                order_blocks['buy_blocks'].append({
-                    'high': float(block_high),
-                    'low': float(block_low),
-                    'strength': float((high[i] - low[i]) / (high[i-1] - low[i-1])) if (high[i-1] - low[i-1]) > 0 else 1.0,
-                    'bars_ago': len(close) - 1 - i
-                })
+        n = len(close)
+        if n >= 4:
+            # الشمعة i مع i-1 و i-2 (i من 2 حتى n-2)
+            c0, c1, c2 = close[2:n - 1], close[1:n - 2], close[0:n - 3]
+            h1, h2 = high[1:n - 2], high[0:n - 3]
+            l1, l2 = low[1:n - 2], low[0:n - 3]
+            range0 = high[2:n - 1] - low[2:n - 1]
+            range1 = h1 - l1
             
+            expanding = range0 > range1
+            # كسر صاعد: اثنين من الشموع الهابطة تليها شمعة صاعدة قوية
+            bullish = (c2 > c1) & (c0 > c1) & (c0 > c2) & expanding
             # كسر هابط: اثنين من الشموع الصاعدة تليها شمعة هابطة قوية
-            if (close[i-2] < close[i-1] and close[i] < close[i-1] and 
-                close[i] < close[i-2] and (high[i] - low[i]) > (high[i-1] - low[i-1])):
-                
-                block_high = max(high[i-2], high[i-1])
-                block_low = min(low[i-2], low[i-1])
-                order_blocks['sell_blocks'].append({
-                    'high': float(block_high),
-                    'low': float(block_low),
-                    'strength': float((high[i] - low[i]) / (high[i-1] - low[i-1])) if (high[i-1] - low[i-1]) > 0 else 1.0,
-                    'bars_ago': len(close) - 1 - i
-                })
-        
-        # أقرب order block
+            bearish = (c2 < c1) & (c0 < c1) & (c0 < c2) & expanding
+            
+            # مثل max()/min() في Python: العنصر الأول ما لم يكن الثاني أكبر/أصغر
+            block_high = np.where(h1 > h2, h1, h2)
+            block_low = np.where(l1 < l2, l1, l2)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                strength = np.where(range1 > 0, range0 / range1, 1.0)
+            bars_ago = n - 3 - np.arange(n - 3)
+            
+            for key, mask in (('buy_blocks', bullish), ('sell_blocks', bearish)):
+                order_blocks[key] = [
+                    {'high': bh, 'low': bl, 'strength': st, 'bars_ago': ago}
+                    for bh, bl, st, ago in zip(block_high[mask].tolist(), block_low[mask].tolist(),
+                                               strength[mask].tolist(), bars_ago[mask].tolist())
+                ]
+        
+        # أقرب order block (آخر كسر = أقل bars_ago)
         current_price = df['close'].iloc[-1]
         
         if order_blocks['buy_blocks']:
-            nearest_buy = min(order_blocks['buy_blocks'], key=lambda x: abs(x['bars_ago']))
+            nearest_buy = order_blocks['buy_blocks'][-1]
             if nearest_buy['low'] < current_price < nearest_buy['high']:
                 order_blocks['nearest_buy'] = nearest_buy
         
         if order_blocks['sell_blocks']:
-            nearest_sell = min(order_blocks['sell_blocks'], key=lambda x: abs(x['bars_ago']))
+            nearest_sell = order_blocks['sell_blocks'][-1]
             if nearest_sell['low'] < current_price < nearest_sell['high']:
                 order_blocks['nearest_sell'] = nearest_sell
         
@@ -502,9 +543,8 @@ class ICTAnalyzer:
         كشف Fair Value Gaps (الفراغات السعرية)
         فراغات غير مملوءة = السعر عادة يعود لملئها
         """
-        recent = df.tail(lookback).copy()
-        high = recent['high'].values
-        low = recent['low'].values
+        high = df['high'].values[-lookback:]
+        low = df['low'].values[-lookback:]
         
         fvgs = {
             'bullish_fvgs': [],    # فراغات صاعدة
@@ -512,49 +552,41 @@ class ICTAnalyzer:
             'active_fvg': None
         }
         
-        # البحث عن فراغات
-        for i in range(2, len(high)):
+        n = len(high)
+        if n >= 3:
+            # الشمعة i مقابل i-1 (i من 2)
+            h0, l0 = high[2:], low[2:]
+            h1, l1 = high[1:-1], low[1:-1]
+            bars_ago = n - 3 - np.arange(n - 2)
+            
             # Fair Value Gap صاعد: الشمعة الحالية فوق high السابقة بفراغ
-            if low[i] > high[i-1] and high[i] > high[i-1]:
-                gap_start = high[i-1]
-                gap_end = low[i]
-                gap_size = gap_end - gap_start
-                
-                if gap_size > 0:
-                    fvgs['bullish_fvgs'].append({
-                        'top': float(gap_end),
-                        'bottom': float(gap_start),
-                        'size': float(gap_size),
-                        'bars_ago': len(high) - 1 - i
-                    })
+            bull_size = l0 - h1
+            bullish = (l0 > h1) & (h0 > h1) & (bull_size > 0)
+            fvgs['bullish_fvgs'] = [
+                {'top': top, 'bottom': bottom, 'size': size, 'bars_ago': ago}
+                for top, bottom, size, ago in zip(l0[bullish].tolist(), h1[bullish].tolist(),
+                                                  bull_size[bullish].tolist(), bars_ago[bullish].tolist())
+            ]
             
             # Fair Value Gap هابط: الشمعة الحالية تحت low السابقة بفراغ
-            if high[i] < low[i-1] and low[i] < low[i-1]:
-                gap_start = low[i-1]
-                gap_end = high[i]
-                gap_size = gap_start - gap_end
-                
-                if gap_size > 0:
-                    fvgs['bearish_fvgs'].append({
-                        'top': float(gap_start),
-                        'bottom': float(gap_end),
-                        'size': float(gap_size),
-                        'bars_ago': len(high) - 1 - i
-                    })
-        
-        # أقرب FVG نشط
-        current_price = df['close'].iloc[-1]
+            bear_size = l1 - h0
+            bearish = (h0 < l1) & (l0 < l1) & (bear_size > 0)
+            fvgs['bearish_fvgs'] = [
+                {'top': top, 'bottom': bottom, 'size': size, 'bars_ago': ago}
+                for top, bottom, size, ago in zip(l1[bearish].tolist(), h0[bearish].tolist(),
+                                                  bear_size[bearish].tolist(), bars_ago[bearish].tolist())
+            ]
         
-        for fvg in fvgs['bullish_fvgs']:
-            if fvg['bottom'] < current_price < fvg['top']:
-                fvgs['active_fvg'] = {'type': 'bullish', **fvg}
-                break
+        # أقرب FVG نشط (الأقدم أولاً: الصاعدة ثم الهابطة)
+        current_price = df['close'].iloc[-1]
         
-        if not fvgs['active_fvg']:
-            for fvg in fvgs['bearish_fvgs']:
+        for kind in ('bullish', 'bearish'):
+            for fvg in fvgs[f'{kind}_fvgs']:
                 if fvg['bottom'] < current_price < fvg['top']:
-                    fvgs['active_fvg'] = {'type': 'bearish', **fvg}
+                    fvgs['active_fvg'] = {'type': kind, **fvg}
                     break
+            if fvgs['active_fvg']:
+                break
         
         return fvgs
     
@@ -562,12 +594,12 @@ class ICTAnalyzer:
         """
         كشف Liquidity Zones (مناطق السيولة)
         تجمعات الأسعار القديمة = السعر يذهب إليها
+        (تجميع الإغلاقات في 10 نطاقات بـ bincount)
         """
-        recent = df.tail(lookback)
-        close = recent['close'].values
-        high = recent['high'].values
-        low = recent['low'].values
-        volume = recent['volume'].values if 'volume' in recent.columns else None
+        close = df['close'].values[-lookback:]
+        high = df['high'].values[-lookback:]
+        low = df['low'].values[-lookback:]
+        volume = df['volume'].values[-lookback:] if 'volume' in df.columns else None
         
         # تحديد مناطق التجمع (Clustering)
         liquidity_zones = {
@@ -581,44 +613,42 @@ class ICTAnalyzer:
         price_max = high.max()
         price_range = price_max - price_min
         zone_size = price_range / 10  # 10 مناطق
-        
-        zone_counts = {}
-        
-        for i in range(len(close)):
-            zone_level = int((close[i] - price_min) / zone_size)
-            if zone_level not in zone_counts:
-                zone_counts[zone_level] = {'count': 0, 'high': 0, 'low': close[i], 'volume': 0}
-            
-            zone_counts[zone_level]['count'] += 1
-            zone_counts[zone_level]['high'] = max(zone_counts[zone_level]['high'], high[i])
-            zone_counts[zone_level]['low'] = min(zone_counts[zone_level]['low'], low[i])
-            if volume is not None:
-                zone_counts[zone_level]['volume'] += volume[i]
+        if not zone_size > 0:
+            return liquidity_zones  # سعر ثابت: لا نطاقات
+        
+        # رقم النطاق لكل شمعة (int() يقتطع نحو الصفر)
+        levels = np.trunc((close - price_min) / zone_size).astype(np.int64)
+        zone_levels, first_index, inverse = np.unique(levels, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        counts = np.bincount(inverse)
+        
+        zone_high = np.zeros(len(zone_levels))
+        np.maximum.at(zone_high, inverse, high)
+        zone_low = close[first_index].astype(np.float64)
+        np.minimum.at(zone_low, inverse, low)
+        zone_volume = (np.bincount(inverse, weights=volume) if volume is not None
+                       else np.zeros(len(zone_levels)))
+        
+        # الأكثر شموعاً أولاً، وعند التساوي حسب أول ظهور
+        by_appearance = np.argsort(first_index, kind='stable')
+        order = by_appearance[np.argsort(-counts[by_appearance], kind='stable')]
+        order = order[counts[order] >= 5]  # على الأقل 5 شموع في المنطقة
         
         # تحديد مناطق قوية (تجمعات)
         current_price = df['close'].iloc[-1]
-        current_zone = int((current_price - price_min) / zone_size)
-        
-        for zone_level, data in sorted(zone_counts.items(), key=lambda x: x[1]['count'], reverse=True):
-            if data['count'] >= 5:  # على الأقل 5 شموع في المنطقة
-                zone_price = price_min + (zone_level * zone_size)
-                
-                if zone_price > current_price:
-                    liquidity_zones['supply_zones'].append({
-                        'level': float(zone_price),
-                        'strength': data['count'],
-                        'volume': float(data['volume']) if volume is not None else 0,
-                        'high': float(data['high']),
-                        'low': float(data['low'])
-                    })
-                else:
-                    liquidity_zones['demand_zones'].append({
-                        'level': float(zone_price),
-                        'strength': data['count'],
-                        'volume': float(data['volume']) if volume is not None else 0,
-                        'high': float(data['high']),
-                        'low': float(data['low'])
-                    })
+        zone_prices = price_min + (zone_levels[order] * zone_size)
+        
+        for zone_price, count, vol, z_high, z_low in zip(
+                zone_prices.tolist(), counts[order].tolist(), zone_volume[order].tolist(),
+                zone_high[order].tolist(), zone_low[order].tolist()):
+            key = 'supply_zones' if zone_price > current_price else 'demand_zones'
+            liquidity_zones[key].append({
+                'level': zone_price,
+                'strength': count,
+                'volume': vol if volume is not None else 0,
+                'high': z_high,
+                'low': z_low
+            })
         
         # أقرب zone نشط
         if liquidity_zones['demand_zones']:
@@ -636,18 +666,16 @@ class ICTAnalyzer:
         if len(df) < 20:
             return {'supply_level': None, 'demand_level': None, 'imbalance': None}
         
-        recent = df.tail(20)
-        close = recent['close'].values
-        volume = recent['volume'].values if 'volume' in recent.columns else np.ones(len(close))
+        close = df['close'].values[-20:]
+        volume = df['volume'].values[-20:] if 'volume' in df.columns else np.ones(len(close))
         
-        # حساب ضغط البيع والشراء
+        # حساب ضغط البيع والشراء (مجاميع مقنّعة)
         price_changes = np.diff(close)
-        volume_weighted_up = np.sum([volume[i] if price_changes[i] > 0 else 0 for i in range(len(price_changes))])
-        volume_weighted_down = np.sum([volume[i] if price_changes[i] < 0 else 0 for i in range(len(price_changes))])
-        
-        # تحديد مستويات Supply و Demand
-        recent_high = recent['high'].max()
-        recent_low = recent['low'].min()
+        volume_weighted_up = np.sum(np.where(price_changes > 0, volume[:-1], 0))
+        volume_weighted_down = np.sum(np.where(price_changes < 0, volume[:-1], 0))
+        # تحديد مستويات Supply و Demand (nanmax/nanmin = تخطي NaN مثل pandas)
+        recent_high = np.nanmax(df['high'].values[-20:])
+        recent_low = np.nanmin(df['low'].values[-20:])
         
         supply_level = recent_high if volume_weighted_down > volume_weighted_up else None
         demand_level = recent_low if volume_weighted_up > volume_weighted_down else None
@@ -1028,9 +1056,10 @@ class TechnicalAnalyzer:
         close = recent['close'].values
         volume = recent['volume'].values if 'volume' in recent.columns else np.ones(len(close))
         
-        # 1. حساب نطاق السعر
-        range_high = high.max()
-        range_low = low.min()
+        # 1. حساب نطاق السعر (نفس نوافذ الذيل المشتركة مع البوتات الأخرى)
+        windows = TailWindows(df, lookback)
+        range_high = windows.high_of(lookback)
+        range_low = windows.low_of(lookback)
         range_value = range_high - range_low
         avg_price = close.mean()
         range_pct = (range_value / avg_price) if avg_price > 0 else 0
@@ -1277,8 +1306,9 @@ class TechnicalAnalyzer:
             '1.0': high
         }
     
-    def generate_trading_signal(self, analysis: Dict, trend_analysis: Dict) -> Tuple[str, float, List]:
-        """توليد إشارة تداول احترافية تدمج التحليل الفني + ICT"""
+    def generate_trading_signal(self, analysis: Dict, trend_analysis: Dict,
+                                sector: Optional[Dict] = None) -> Tuple[str, float, List]:
+        """توليد إشارة تداول احترافية تدمج التحليل الفني + ICT (+ زخم القطاع إن وُجد)"""
         
         buy_score = 0
         sell_score = 0
@@ -1493,6 +1523,17 @@ class TechnicalAnalyzer:
                 buy_score += 10
                 details.append(f"🔎 منطقة توحيد قوية ({consolidation_strength:.0f}/100)")
         
+        # ============================================================
+        # 5.5 زخم القطاع (5%)
+        # ============================================================
+        if sector and sector.get('count', 0) >= TradingConfig.SECTOR_MIN_COINS:
+            if sector['momentum'] == 'LEADING':
+                buy_score += 5
+                details.append(f"🧭 قطاع {sector['sector']} قائد (قوة نسبية {sector['relative_strength']:+.1f}%)")
+            elif sector['momentum'] == 'LAGGING':
+                sell_score += 5
+                details.append(f"🧭 قطاع {sector['sector']} متأخر (قوة نسبية {sector['relative_strength']:+.1f}%)")
+        
         # ============================================================
         # 6. حساب الإشارة النهائية
         # ============================================================
@@ -1563,8 +1604,30 @@ class AdvancedTradingBot:
         self.hammer_active = False
         
         # تخزين مؤقت للبيانات
-        self.kline_cache = {}
-        self.cache_timestamp = {}
+        self.kline_cache = KlineCache(TradingConfig.CACHE_TIMEOUT, TradingConfig.CACHE_MAX_ENTRIES)
+        self.resampler = CandleResampler(TradingConfig.ENTRY_TIMEFRAME, TradingConfig.RESAMPLED_TIMEFRAMES)
+        self.analysis_cache = AnalysisCache(TradingConfig.ANALYSIS_CACHE_MAX_ENTRIES)
+        
+        # 🌐 الفلتر المسبق لوضع توسيع النطاق
+        self.prefilter = UniversePrefilter(
+            self._safe_fetch_ohlcv,
+            timeframe=TradingConfig.ENTRY_TIMEFRAME,
+            min_volume_usdt=TradingConfig.UNIVERSE_MIN_VOLUME_USDT,
+            max_survivors=TradingConfig.UNIVERSE_MAX_SURVIVORS,
+            core_top=TradingConfig.UNIVERSE_CORE_TOP,
+            max_workers=TradingConfig.MAX_CONCURRENT_ANALYSIS
+        )
+        
+        # استرجاع آخر لقطة حالة (إعادة تشغيل دافئة)
+        self.state_store = StateStore(TradingConfig.STATE_FILE, TradingConfig.STATE_CHECKPOINT_INTERVAL)
+        self._restore_state(self.state_store.load())
+        
+        # 📒 سجل الإشارات وتتبع نتائجها
+        self.journal = SignalJournal(
+            TradingConfig.JOURNAL_DB, 'advanced',
+            candle_fetcher=ccxt_candle_fetcher(self.exchange),
+            default_max_hours=TradingConfig.JOURNAL_MAX_HOURS
+        )
         
         logging.info("🚀 تم تهيئة البوت بنجاح")
 
@@ -1608,6 +1671,8 @@ class AdvancedTradingBot:
         logging.info("🚀 بدء حلقة المراقبة الرئيسية")
         
         check_interval = 300  # 5 دقائق
+        self.state_store.start(self._snapshot_state)
+        self.journal.start()
         
         try:
             while True:
@@ -1637,6 +1702,30 @@ class AdvancedTradingBot:
             logging.info("\n⏹️ تم إيقاف البوت")
         except Exception as e:
             logging.error(f"❌ خطأ في الحلقة الرئيسية: {e}", exc_info=True)
+        finally:
+            self.state_store.stop()
+            self.journal.stop()
+    
+    def _snapshot_state(self) -> Dict:
+        """لقطة من الحالة القابلة للاسترجاع (نسخ سطحية آمنة مع الخيوط)"""
+        keep = TradingConfig.STATE_HISTORY_PER_SYMBOL
+        history = self.notifier.notification_history
+        return {
+            'klines': self.kline_cache.to_state(),
+            'notification_history': {
+                symbol: list(entries.copy())[-keep:]
+                for symbol, entries in list(history.items())
+            }
+        }
+    
+    def _restore_state(self, state: Dict):
+        """استرجاع الكاش وسجل التنبيهات من لقطة سابقة"""
+        if not state:
+            return
+        self.kline_cache.restore_state(state.get('klines', {}))
+        for symbol, entries in state.get('notification_history', {}).items():
+            self.notifier.notification_history[symbol].extend(entries)
+        logging.info(f"♻️ استرجاع {len(self.kline_cache)} إطار شموع و {len(self.notifier.notification_history)} سجل تنبيهات")
     
     def _get_top_25_coins(self) -> List[Dict]:
         """جلب أعلى 25 عملة بحجم التداول"""
@@ -1645,6 +1734,8 @@ class AdvancedTradingBot:
             markets, tickers = self._safe_fetch_markets_and_tickers()
             
             coins_data = []
+            expansion = TradingConfig.UNIVERSE_EXPANSION_MODE
+            min_volume = TradingConfig.UNIVERSE_MIN_VOLUME_USDT if expansion else TradingConfig.MIN_VOLUME_USDT
             
             for market in markets:
                 if market['quote'] == 'USDT' and market['spot']:
@@ -1661,7 +1752,7 @@ class AdvancedTradingBot:
                         change_24h = ticker.get('percentage', 0)
                         
                         # تطبيق الفلاتر
-                        if volume > TradingConfig.MIN_VOLUME_USDT:
+                        if volume > min_volume:
                             coins_data.append({
                                 'symbol': symbol,
                                 'base': base,
@@ -1676,6 +1767,13 @@ class AdvancedTradingBot:
             
             # الترتيب والتصفية
             coins_data.sort(key=lambda x: x['volume'], reverse=True)
+            
+            if expansion:
+                # فلتر مسبق رخيص لكل الأزواج → الناجون فقط للتحليل الكامل
+                by_symbol = {c['symbol']: c for c in coins_data}
+                survivors = self.prefilter.select(tickers, by_symbol.keys())
+                return [by_symbol[s] for s in survivors]
+            
             return coins_data[:25]
         
         except Exception as e:
@@ -1701,6 +1799,9 @@ class AdvancedTradingBot:
     
     def _analyze_all_coins(self):
         """تحليل كل العملات بكفاءة"""
+        sectors = self._compute_sectors()
+        config_hash = config_fingerprint(TradingConfig)
+        
         # Use a thread pool to analyze coins concurrently for speed
         def _process_coin(idx_coin):
             idx, coin = idx_coin
@@ -1708,7 +1809,7 @@ class AdvancedTradingBot:
             try:
                 logging.info(f"\n[{idx}/{len(self.top_coins)}] 📊 تحليل {symbol}...")
 
-                # load cached or fetch
+                # load cached or fetch (الاتجاه أولاً: أول مرة يُجلب تاريخه ثم يُبنى من شموع الدخول)
                 trend_df = self._get_cached_klines(symbol, TradingConfig.TREND_TIMEFRAME)
                 entry_df = self._get_cached_klines(symbol, TradingConfig.ENTRY_TIMEFRAME)
 
@@ -1717,19 +1818,20 @@ class AdvancedTradingBot:
                     return
 
                 # تمرير symbol للتحليل
-                trend_analysis = self.analyzer.analyze_candles(trend_df, symbol)
+                trend_analysis = self._analyze_trend(symbol, trend_df, config_hash)
                 entry_analysis = self.analyzer.analyze_candles(entry_df, symbol)
 
                 if trend_analysis is None or entry_analysis is None:
                     return
 
-                signal, strength, details = self.analyzer.generate_trading_signal(entry_analysis, trend_analysis)
+                sector = sectors.features(symbol) if sectors else None
+                signal, strength, details = self.analyzer.generate_trading_signal(entry_analysis, trend_analysis, sector)
 
                 # معايير ديناميكية حسب الوضع (Scalping أو Normal)
                 min_strength = TradingConfig.SCALPING_MIN_STRENGTH if TradingConfig.SCALPING_MODE else 60
                 
                 if signal != 'NEUTRAL' and strength >= min_strength:
-                    self._send_trading_alert(symbol, coin, signal, strength, entry_analysis, trend_analysis, details)
+                    self._send_trading_alert(symbol, coin, signal, strength, entry_analysis, trend_analysis, details, sector)
                 else:
                     logging.info(f"📊 {symbol}: {signal} (قوة: {strength:.0f}%) - ضعيفة")
 
@@ -1749,34 +1851,72 @@ class AdvancedTradingBot:
                 except Exception:
                     pass
     
+    def _analyze_trend(self, symbol: str, df: pd.DataFrame, config_hash: str) -> Optional[Dict]:
+        """تحليل الاتجاه على الشموع المغلقة فقط (مرة لكل شمعة 4h) + السعر اللحظي"""
+        closed = closed_candles(df)
+        if not TradingConfig.ANALYSIS_CACHE_ENABLED:
+            analysis = self.analyzer.analyze_candles(closed, symbol)
+        else:
+            analysis = self.analysis_cache.get_or_compute(
+                symbol, TradingConfig.TREND_TIMEFRAME, last_closed_ts(df), config_hash,
+                lambda: self.analyzer.analyze_candles(closed, symbol)
+            )
+        if analysis is None:
+            return None
+        # نسخة سطحية: المدخل المخزّن لا يتغير
+        return dict(analysis, current_price=float(df['close'].iloc[-1]))
+    
+    def _compute_sectors(self) -> Optional[SectorSnapshot]:
+        """إحصاءات القطاعات للعملات الممسوحة في هذه الدورة (من بيانات الـ tickers فقط)"""
+        if not TradingConfig.SECTOR_ANALYTICS_ENABLED or not self.top_coins:
+            return None
+        sectors = compute_sector_stats(
+            self.top_coins, TradingConfig.SECTOR_LOOKUP,
+            rs_threshold=TradingConfig.SECTOR_RS_THRESHOLD,
+            breadth_threshold=TradingConfig.SECTOR_BREADTH_THRESHOLD
+        )
+        leaders = ", ".join(
+            f"{name} {sectors.stats[name]['relative_strength']:+.1f}%" for name in sectors.leaders()
+        )
+        logging.info(f"🧭 القطاعات القائدة: {leaders} (السوق {sectors.market_return:+.1f}%)")
+        return sectors
+    
     def _get_cached_klines(self, symbol: str, timeframe: str, limit: int = 100) -> Optional[pd.DataFrame]:
-        """جلب البيانات مع التخزين المؤقت"""
-        
-        cache_key = f"{symbol}_{timeframe}"
-        current_time = time.time()
-        
-        # التحقق من صحة الكاش
-        if (cache_key in self.kline_cache and 
-            current_time - self.cache_timestamp.get(cache_key, 0) < TradingConfig.CACHE_TIMEOUT):
-            return self.kline_cache[cache_key]
-        
+        """جلب البيانات مع التخزين المؤقت (threads متزامنة على نفس المفتاح تنتظر جلباً واحداً)"""
         try:
-            klines = self._safe_fetch_ohlcv(symbol, timeframe, limit=limit)
-            
-            df = pd.DataFrame(klines, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df = df.set_index('timestamp')
-            
-            # حفظ في الكاش
-            self.kline_cache[cache_key] = df
-            self.cache_timestamp[cache_key] = current_time
-            
-            return df
-        
+            return self.kline_cache.get_or_fetch(
+                (symbol, timeframe, limit),
+                lambda: self._fetch_klines(symbol, timeframe, limit)
+            )
         except Exception as e:
             logging.error(f"❌ خطأ في جلب البيانات {symbol}/{timeframe}: {e}")
             return None
 
+    def _fetch_klines(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """إطار محلي من المُجمِّع أو جلب من REST"""
+        df = self._get_resampled_klines(symbol, timeframe, limit)
+        if df is not None:
+            return df
+        
+        klines = self._safe_fetch_ohlcv(symbol, timeframe, limit=limit)
+        if self.resampler.covers(timeframe):
+            self.resampler.seed(symbol, timeframe, klines)
+        elif timeframe == self.resampler.base_timeframe:
+            self.resampler.update(symbol, klines)
+        
+        df = pd.DataFrame(klines, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df.set_index('timestamp')
+
+    def _get_resampled_klines(self, symbol: str, timeframe: str, limit: int) -> Optional[pd.DataFrame]:
+        """إطار أعلى مبني من شموع الدخول (None = يلزم الجلب من REST)"""
+        if not self.resampler.covers(timeframe) or self.resampler.needs_seed(symbol, timeframe):
+            return None
+        # جلب/كاش شموع الدخول يغذي المُجمِّع
+        if self._get_cached_klines(symbol, self.resampler.base_timeframe) is None:
+            return None
+        return self.resampler.frame(symbol, timeframe, limit)
+
     def _safe_fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 100, retries: int = 3, backoff: float = 1.0):
         """Fetch OHLCV with retries/backoff for transient errors."""
         attempt = 0
@@ -1793,7 +1933,8 @@ class AdvancedTradingBot:
         raise last_exc
     
     def _send_trading_alert(self, symbol: str, coin: Dict, signal: str, strength: float,
-                           entry_analysis: Dict, trend_analysis: Dict, details: List):
+                           entry_analysis: Dict, trend_analysis: Dict, details: List,
+                           sector: Optional[Dict] = None):
         """إرسال تنبيه التداول عبر Telegram مع تفاصيل ICT"""
         
         current_price = coin['price']
@@ -1854,12 +1995,17 @@ class AdvancedTradingBot:
             'stop_loss': stop_loss,
             'rsi': entry_analysis['rsi']['value'],
             'macd_signal': entry_analysis['macd']['condition'],
-            'ema_status': entry_analysis['ema']['status']
+            'ema_status': entry_analysis['ema']['status'],
+            'sector': sector
         }
         
         # إرسال التنبيه (الآن نتحقق من نجاح الإرسال قبل تسجيله)
         sent = self.notifier.send_alert(symbol, alert_data)
         if sent:
+            self.journal.record(
+                symbol, signal, current_price, target1, target2, stop_loss,
+                strategy=signal_category, score=strength
+            )
             logging.info(f"✅ تم إرسال تنبيه جديد {symbol}: {signal} (قوة: {strength:.0f}%) - الصيغة الجديدة مع ICT")
             logging.info(f"   🎯 تحليل ICT: {ict_details[:150]}")
         else:
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+♻️ Analysis Cache
+إعادة استخدام نتيجة التحليل طالما لم تُغلق شمعة جديدة
+
+- المفتاح: (symbol, timeframe) والختم: (توقيت آخر شمعة مغلقة، بصمة الإعدادات)
+  → مدخل واحد لكل عملة/إطار، وشمعة جديدة أو تغيير إعداد يستبدله
+- المُستدعي يحلل الشموع المغلقة فقط (closed_candles) حتى تكون النتيجة ثابتة
+  بين دورتين: مع مسح كل 5 دقائق وشموع 4h ~47 من كل 48 تحليل للاتجاه من الكاش
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+
+def config_fingerprint(*configs) -> str:
+    """بصمة قيم الثوابت (UPPER_CASE) في كلاسات الإعداد"""
+    items = []
+    for config in configs:
+        for name in sorted(dir(config)):
+            if name.isupper():
+                items.append(f"{config.__name__}.{name}={getattr(config, name)!r}")
+    return hashlib.sha1("\n".join(items).encode('utf-8')).hexdigest()[:12]
+
+
+def last_closed_ts(df: Optional[pd.DataFrame]) -> Optional[Any]:
+    """توقيت آخر شمعة مغلقة (الأخيرة قيد التكوين) - من عمود timestamp أو الـ index"""
+    if df is None or len(df) < 2:
+        return None
+    if 'timestamp' in df.columns:
+        return df['timestamp'].iloc[-2]
+    return df.index[-2]
+
+
+def closed_candles(df: pd.DataFrame) -> pd.DataFrame:
+    """الإطار بدون الشمعة قيد التكوين"""
+    return df.iloc[:-1]
+
+
+class AnalysisCache:
+    """كاش LRU لنتائج التحليل، آمن للـ threads"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Tuple[Tuple, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get_or_compute(self, symbol: str, timeframe: str, frame_key: Any, config_hash: str,
+                       compute: Callable[[], Any]) -> Any:
+        """النتيجة السابقة إذا لم تُغلق شمعة جديدة ولم تتغير الإعدادات، وإلا compute()"""
+        key, stamp = (symbol, timeframe), (frame_key, config_hash)
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = frame_key is not None and entry is not None and entry[0] == stamp
+            self.stats['hits' if hit else 'misses'] += 1
+            if hit:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        result = compute()
+        if result is not None and frame_key is not None:
+            with self._lock:
+                self._entries[key] = (stamp, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats['evictions'] += 1
+        return result
+
+    def invalidate(self, symbol: str, timeframe: Optional[str] = None):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == symbol and (timeframe is None or k[1] == timeframe)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
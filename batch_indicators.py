@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧮 Batch Indicators
+حساب المؤشرات لكل العملات دفعة واحدة كمصفوفات 2-D (عملة × شمعة)
+
+- EMA / RSI / ATR / Bollinger / متوسط الحجم لكل العملات في تمريرة واحدة
+- السلاسل الأقصر تُحشى بـ NaN من اليسار (محاذاة على آخر شمعة)
+- EMA و RSI و ATR مطابقة بت-ببت لـ pandas ewm(adjust=False) ومكتبة ta
+- كل عملة تحصل على IndicatorView (مصفوفات 1-D بطول بياناتها)
+"""
+
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+# ============================================================================
+# دوال 2-D (صف لكل عملة)
+# ============================================================================
+
+def _row_positions(valid: np.ndarray) -> np.ndarray:
+    """رقم الشمعة داخل سلسلة كل عملة (0 عند أول قيمة صالحة)"""
+    return np.cumsum(valid, axis=1) - 1
+
+
+def ewm_mean(block: np.ndarray, com: float, min_periods: int = 0) -> np.ndarray:
+    """
+    مكافئ pandas ewm(com=..., adjust=False).mean() لكل صف - بنفس ترتيب العمليات
+    (الحلقة على الزمن، والعمليات متجهة على كل العملات)
+    """
+    alpha = 1. / (1. + com)
+    old_wt = 1. - alpha
+    denom = old_wt + alpha
+
+    out = np.empty_like(block)
+    weighted = block[:, 0].copy()
+    out[:, 0] = weighted
+    with np.errstate(invalid='ignore'):
+        for t in range(1, block.shape[1]):
+            cur = block[:, t]
+            updated = (old_wt * weighted + alpha * cur) / denom
+            weighted = np.where(
+                np.isnan(weighted), cur,
+                np.where((weighted != cur) & ~np.isnan(cur), updated, weighted)
+            )
+            out[:, t] = weighted
+
+    if min_periods > 1:
+        valid = ~np.isnan(block)
+        out[_row_positions(valid) < min_periods - 1] = np.nan
+    return out
+
+
+def ema(block: np.ndarray, span: int, min_periods: int = 0) -> np.ndarray:
+    """EMA بطريقة pandas ewm(span=..., adjust=False)"""
+    return ewm_mean(block, (span - 1) / 2., min_periods)
+
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """RSI مطابق لـ ta.momentum.rsi"""
+    valid = ~np.isnan(close)
+    diff = np.full_like(close, np.nan)
+    diff[:, 1:] = close[:, 1:] - close[:, :-1]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        up = np.where(valid, np.where(diff > 0, diff, 0.0), np.nan)
+        down = np.where(valid, -np.where(diff < 0, diff, 0.0), np.nan)
+
+        alpha = 1 / window
+        com = (1 - alpha) / alpha
+        ema_up = ewm_mean(up, com, window)
+        ema_down = ewm_mean(down, com, window)
+        relative_strength = ema_up / ema_down
+        return np.where(ema_down == 0, 100, 100 - (100 / (1 + relative_strength)))
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = np.full_like(close, np.nan)
+    prev_close[:, 1:] = close[:, :-1]
+    stacked = np.stack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    with np.errstate(invalid='ignore'):
+        # مثل DataFrame.max(axis=1): تجاهل NaN
+        tr = np.fmax(np.fmax(stacked[0], stacked[1]), stacked[2])
+    return tr
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """ATR (Wilder) مطابق لـ ta.volatility.average_true_range"""
+    tr = true_range(high, low, close)
+    n_rows, n_cols = tr.shape
+    valid = ~np.isnan(close)
+    starts = n_cols - valid.sum(axis=1)
+
+    out = np.where(valid, 0.0, np.nan)
+    seeded = starts + window - 1 < n_cols
+    rows = np.flatnonzero(seeded)
+    if len(rows):
+        idx = starts[rows, None] + np.arange(window)
+        out[rows, starts[rows] + window - 1] = np.take_along_axis(tr[rows], idx, axis=1).sum(axis=1) / window
+
+    first = starts + window
+    for t in range(int(first.min(initial=n_cols)), n_cols):
+        active = first <= t
+        out[active, t] = (out[active, t - 1] * (window - 1) + tr[active, t]) / float(window)
+    return out
+
+
+def rolling_mean(block: np.ndarray, window: int) -> np.ndarray:
+    """متوسط متحرك لكل صف (NaN قبل اكتمال النافذة)"""
+    out = np.full_like(block, np.nan)
+    if block.shape[1] >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(block, window, axis=1)
+        out[:, window - 1:] = windows.mean(axis=2)
+    return out
+
+
+def rolling_std(block: np.ndarray, window: int) -> np.ndarray:
+    """انحراف معياري متحرك (ddof=0 مثل ta.BollingerBands)"""
+    out = np.full_like(block, np.nan)
+    if block.shape[1] >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(block, window, axis=1)
+        out[:, window - 1:] = windows.std(axis=2)
+    return out
+
+
+# ============================================================================
+# الدفعة + عرض كل عملة
+# ============================================================================
+
+class BatchIndicators:
+    """مصفوفات OHLCV لكل العملات + مؤشرات محسوبة مرة واحدة عند أول طلب"""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self.symbols = [s for s, df in frames.items() if df is not None and len(df)]
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.lengths = np.array([len(frames[s]) for s in self.symbols], dtype=int)
+        width = int(self.lengths.max(initial=0))
+
+        self.data: Dict[str, np.ndarray] = {}
+        for field in FIELDS:
+            block = np.full((len(self.symbols), width), np.nan)
+            for i, symbol in enumerate(self.symbols):
+                block[i, width - self.lengths[i]:] = frames[symbol][field].to_numpy(dtype=float)
+            self.data[field] = block
+
+        self._cache: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str):
+        return symbol in self.index
+
+    def _cached(self, key: tuple, compute):
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = compute()
+            return self._cache[key]
+
+    # المؤشرات كمصفوفات 2-D
+    def ema(self, span: int, min_periods: int = 0) -> np.ndarray:
+        return self._cached(('ema', span, min_periods),
+                            lambda: ema(self.data['close'], span, min_periods))
+
+    def rsi(self, window: int = 14) -> np.ndarray:
+        return self._cached(('rsi', window), lambda: rsi(self.data['close'], window))
+
+    def atr(self, window: int = 14) -> np.ndarray:
+        return self._cached(('atr', window), lambda: atr(
+            self.data['high'], self.data['low'], self.data['close'], window))
+
+    def bollinger(self, window: int = 20, window_dev: float = 2) -> Dict[str, np.ndarray]:
+        def compute():
+            middle = rolling_mean(self.data['close'], window)
+            std = rolling_std(self.data['close'], window)
+            return {'upper': middle + window_dev * std, 'middle': middle,
+                    'lower': middle - window_dev * std}
+        return self._cached(('bollinger', window, window_dev), compute)
+
+    def volume_mean(self, window: int = 20) -> np.ndarray:
+        return self._cached(('volume_mean', window),
+                            lambda: rolling_mean(self.data['volume'], window))
+
+    def view(self, symbol: str) -> Optional['IndicatorView']:
+        if symbol not in self.index:
+            return None
+        return IndicatorView(self, self.index[symbol])
+
+
+class IndicatorView:
+    """مؤشرات عملة واحدة من الدفعة (مصفوفات 1-D بطول بياناتها الأصلية)"""
+
+    def __init__(self, batch: BatchIndicators, row: int):
+        self._batch = batch
+        self._row = row
+        self._start = batch.data['close'].shape[1] - int(batch.lengths[row])
+
+    def _slice(self, block: np.ndarray) -> np.ndarray:
+        return block[self._row, self._start:]
+
+    def field(self, name: str) -> np.ndarray:
+        return self._slice(self._batch.data[name])
+
+    def ema(self, span: int) -> np.ndarray:
+        """مثل df['close'].ewm(span=span, adjust=False).mean()"""
+        return self._slice(self._batch.ema(span))
+
+    def ema_indicator(self, span: int) -> np.ndarray:
+        """مثل ta.trend.ema_indicator (NaN قبل اكتمال النافذة)"""
+        return self._slice(self._batch.ema(span, span))
+
+    def rsi(self, window: int = 14) -> np.ndarray:
+        return self._slice(self._batch.rsi(window))
+
+    def atr(self, window: int = 14) -> np.ndarray:
+        return self._slice(self._batch.atr(window))
+
+    def bollinger(self, window: int = 20, window_dev: float = 2) -> Dict[str, np.ndarray]:
+        return {k: self._slice(v) for k, v in self._batch.bollinger(window, window_dev).items()}
+
+    def volume_mean(self, window: int = 20) -> np.ndarray:
+        return self._slice(self._batch.volume_mean(window))
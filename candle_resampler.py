@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🕯️ Candle Resampler
+بناء الإطارات الأعلى (1h / 4h / 1d) محلياً من شموع الإطار الأساسي (1m / 15m)
+
+- كل شمعة أساسية مغلقة تُدمج في شمعة الإطار الأعلى الحالية: O(1) لكل شمعة ولكل إطار
+- الشمعة الأساسية الأخيرة (قيد التكوين) تُضاف مؤقتاً عند القراءة فقط - مثل fetch_ohlcv
+- التاريخ العميق يُجلب من REST مرة واحدة (seed) ثم تكفي شموع الإطار الأساسي
+- المحاذاة حسب OKX: حتى 4h على حدود UTC، و 6h/12h/1d تفتح على توقيت هونغ كونغ
+  (00:00 HKT = 16:00 UTC)
+- فجوة في الشموع الأساسية (توقف طويل) → إعادة seed بدل بناء شموع ناقصة
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+TIMEFRAME_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000,
+    '6h': 21_600_000, '12h': 43_200_000, '1d': 86_400_000,
+}
+
+# OKX: شموع 6h وما فوق تبدأ من منتصف الليل بتوقيت هونغ كونغ (UTC+8)
+SESSION_OFFSET_MS = 8 * 3_600_000
+SESSION_ALIGNED = ('6h', '12h', '1d')
+
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+
+def bucket_start(ts: int, timeframe: str) -> int:
+    """بداية شمعة الإطار timeframe التي تقع فيها اللحظة ts (ms)"""
+    period = TIMEFRAME_MS[timeframe]
+    offset = SESSION_OFFSET_MS if timeframe in SESSION_ALIGNED else 0
+    return (ts + offset) // period * period - offset
+
+
+def _merge(bar: List, candle: List):
+    """دمج شمعة في شمعة الإطار الأعلى (في مكانها)"""
+    bar[2] = max(bar[2], candle[2])
+    bar[3] = min(bar[3], candle[3])
+    bar[4] = candle[4]
+    bar[5] += candle[5]
+
+
+class _Series:
+    """شموع إطار أعلى واحد لعملة واحدة"""
+    __slots__ = ('bars', 'partial', 'complete')
+
+    def __init__(self, history: int):
+        self.bars: Deque[List] = deque(maxlen=history)  # شموع مغلقة
+        self.partial: Optional[List] = None              # الشمعة الحالية من الشموع الأساسية المغلقة
+        self.complete = False                            # هل رأينا أول شمعة أساسية فيها؟
+
+    def clear(self):
+        self.bars.clear()
+        self.partial = None
+        self.complete = False
+
+
+class CandleResampler:
+    """يحتفظ بالإطارات الأعلى لكل عملة ويحدّثها من شموع الإطار الأساسي"""
+
+    def __init__(self, base_timeframe: str, timeframes: Iterable[str], history: int = 500):
+        self.base_timeframe = base_timeframe
+        self.base_ms = TIMEFRAME_MS[base_timeframe]
+        self.timeframes = tuple(timeframes)
+        self.history = history
+        self._symbols: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.stats = {'base_candles': 0, 'seeds': 0, 'resets': 0}
+
+    def covers(self, timeframe: str) -> bool:
+        return timeframe in self.timeframes
+
+    def _state(self, symbol: str) -> Dict:
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols[symbol] = {
+                'last_ts': None,
+                'forming': None,
+                'series': {tf: _Series(self.history) for tf in self.timeframes}
+            }
+        return state
+
+    def needs_seed(self, symbol: str, timeframe: str) -> bool:
+        """لا يوجد تاريخ مغلق لهذا الإطار → يجب جلبه من REST"""
+        with self._lock:
+            state = self._symbols.get(symbol)
+            return state is None or not state['series'][timeframe].bars
+
+    def seed(self, symbol: str, timeframe: str, ohlcv: List[List]):
+        """تاريخ الإطار الأعلى من REST (الشمعة الأخيرة قيد التكوين تُتجاهل وتُبنى من الشموع الأساسية)"""
+        with self._lock:
+            series = self._state(symbol)['series'][timeframe]
+            series.bars.clear()
+            series.bars.extend(list(bar) for bar in ohlcv[:-1])
+            if series.partial is not None and series.bars and series.partial[0] <= series.bars[-1][0]:
+                series.partial = None
+            self.stats['seeds'] += 1
+
+    def update(self, symbol: str, ohlcv: List[List]) -> int:
+        """دمج الشموع الأساسية المغلقة الجديدة (الأخيرة قيد التكوين) - يعيد عدد الشموع المدمجة"""
+        with self._lock:
+            state = self._state(symbol)
+            if not ohlcv:
+                return 0
+            state['forming'] = list(ohlcv[-1])
+
+            last_ts = state['last_ts']
+            fresh = [candle for candle in ohlcv[:-1] if last_ts is None or candle[0] > last_ts]
+            if not fresh:
+                return 0
+
+            if last_ts is not None and fresh[0][0] != last_ts + self.base_ms:
+                # فجوة: الشموع بين آخر تحديث وهذه النافذة مفقودة
+                for series in state['series'].values():
+                    series.clear()
+                self.stats['resets'] += 1
+
+            for candle in fresh:
+                for timeframe, series in state['series'].items():
+                    self._add(series, timeframe, candle)
+            state['last_ts'] = fresh[-1][0]
+            self.stats['base_candles'] += len(fresh)
+            return len(fresh)
+
+    @staticmethod
+    def _add(series: _Series, timeframe: str, candle: List):
+        start = bucket_start(candle[0], timeframe)
+        if series.bars and start <= series.bars[-1][0]:
+            return  # مغطاة بالتاريخ المجلوب
+        if series.partial is not None and series.partial[0] != start:
+            # بدون تاريخ (ينتظر seed) لا نبني تاريخاً قصيراً من الشموع الأساسية وحدها
+            if series.bars and series.complete:
+                series.bars.append(series.partial)
+            elif series.bars:
+                # شمعة بدأت قبل أول شمعة أساسية لدينا - ناقصة، لا نبني عليها
+                series.bars.clear()
+            series.partial = None
+        if series.partial is None:
+            series.partial = [start] + list(candle[1:6])
+            series.complete = candle[0] == start
+        else:
+            _merge(series.partial, candle)
+
+    def bars(self, symbol: str, timeframe: str, limit: int = 100) -> Optional[List[List]]:
+        """آخر limit شمعة للإطار (الأخيرة قيد التكوين) أو None إذا يلزم الجلب من REST"""
+        with self._lock:
+            state = self._symbols.get(symbol)
+            if state is None:
+                return None
+            series = state['series'][timeframe]
+            if not series.bars or (series.partial is not None and not series.complete):
+                return None
+
+            closed = list(series.bars)
+            current = list(series.partial) if series.partial is not None else None
+            forming = state['forming']
+            if forming is not None and forming[0] > (state['last_ts'] or 0):
+                start = bucket_start(forming[0], timeframe)
+                if current is not None and current[0] == start:
+                    _merge(current, forming)
+                elif start > (current or closed[-1])[0]:
+                    if forming[0] != start:
+                        return None
+                    if current is not None:
+                        closed.append(current)
+                    current = [start] + list(forming[1:6])
+            if current is not None:
+                closed.append(current)
+            return closed[-limit:]
+
+    def frame(self, symbol: str, timeframe: str, limit: int = 100) -> Optional[pd.DataFrame]:
+        """نفس شكل DataFrame الشموع المجلوبة (timestamp كـ index)"""
+        bars = self.bars(symbol, timeframe, limit)
+        if bars is None:
+            return None
+        df = pd.DataFrame(bars, columns=OHLCV_COLUMNS)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df.set_index('timestamp')
+
+    def drop(self, symbol: str):
+        with self._lock:
+            self._symbols.pop(symbol, None)
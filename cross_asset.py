@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🔗 Cross Asset
+الارتباط والـ Beta لكل العملات مقابل BTC/ETH بعملية مصفوفة واحدة + فلتر حالة السوق
+
+- الإغلاقات تُحاذى على شبكة توقيت الـ benchmark (آخر window شمعة) → مصفوفة (T × N)
+- عوائد لوغاريتمية، ثم التباين المشترك مع أعمدة BTC/ETH بضرب مصفوفات واحد
+  (corr = cov / (σ_i σ_b)، beta = cov / σ_b²)
+- حالة السوق: تغير BTC في آخر lookback شمعة، التراجع من أعلى قمة في النافذة،
+  والـ breadth (نسبة العملات فوق متوسط آخر 20 شمعة)
+- risk_off عند هبوط BTC تحت العتبة: العملات المرتبطة بـ BTC تُستبعد قبل التحليل المكلف
+- عملة بدون بيانات كافية للمحاذاة ليس لها ارتباط، وتُستبعد في risk_off (احتياطاً)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+BREADTH_CANDLES = 20
+
+
+def _closes(df: pd.DataFrame) -> pd.Series:
+    """الإغلاقات مفهرسة بالتوقيت (عمود timestamp أو الـ index)"""
+    if 'timestamp' in df.columns:
+        return pd.Series(df['close'].values, index=df['timestamp'].values)
+    return pd.Series(df['close'].values, index=df.index.values)
+
+
+@dataclass
+class CrossAssetSnapshot:
+    """نتيجة دورة واحدة: ارتباط/Beta لكل عملة + حالة السوق"""
+    correlation: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    beta: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    btc_change_pct: Optional[float] = None
+    btc_drawdown_pct: Optional[float] = None
+    breadth: Optional[float] = None
+    risk_off: bool = False
+    veto_correlation: float = 0.6
+    benchmark: str = 'BTC/USDT'
+
+    def vetoed(self, symbol: str) -> bool:
+        """هل تُستبعد العملة قبل التحليل؟ (هبوط BTC + ارتباط عالٍ أو غير معروف)"""
+        if not self.risk_off:
+            return False
+        corr = self.correlation.get(symbol, {}).get(self.benchmark)
+        return corr is None or np.isnan(corr) or corr >= self.veto_correlation
+
+    @property
+    def regime(self) -> Dict:
+        return {
+            'risk_off': self.risk_off,
+            'btc_change_pct': self.btc_change_pct,
+            'btc_drawdown_pct': self.btc_drawdown_pct,
+            'breadth': self.breadth
+        }
+
+
+def compute_cross_asset(frames: Dict[str, Optional[pd.DataFrame]],
+                        benchmarks: Sequence[str] = ('BTC/USDT', 'ETH/USDT'),
+                        window: int = 48,
+                        drop_lookback: int = 4,
+                        drop_threshold: float = -2.0,
+                        veto_correlation: float = 0.6) -> CrossAssetSnapshot:
+    """
+    frames: الشموع لكل عملة (نفس الإطار)، benchmarks[0] هو مرجع حالة السوق
+    drop_threshold بالنسبة المئوية على آخر drop_lookback شمعة
+    """
+    anchor = benchmarks[0]
+    snapshot = CrossAssetSnapshot(veto_correlation=veto_correlation, benchmark=anchor)
+    anchor_df = frames.get(anchor)
+    if anchor_df is None or len(anchor_df) < 2:
+        return snapshot
+
+    # حالة السوق من BTC وحده
+    anchor_close = anchor_df['close'].values.astype(float)
+    last = anchor_close[-1]
+    if len(anchor_close) > drop_lookback:
+        snapshot.btc_change_pct = float((last / anchor_close[-1 - drop_lookback] - 1) * 100)
+        snapshot.risk_off = snapshot.btc_change_pct <= drop_threshold
+    snapshot.btc_drawdown_pct = float((last / np.nanmax(anchor_close[-window:]) - 1) * 100)
+
+    # المحاذاة على شبكة توقيت المرجع
+    grid = _closes(anchor_df).index[-(window + 1):]
+    symbols, columns = [], []
+    for symbol, df in frames.items():
+        if df is None or len(df) == 0:
+            continue
+        closes = _closes(df)
+        closes = closes[~closes.index.duplicated(keep='last')].reindex(grid).values.astype(float)
+        if len(closes) < 3 or np.isnan(closes).any() or (closes <= 0).any():
+            continue
+        symbols.append(symbol)
+        columns.append(closes)
+    if not symbols:
+        return snapshot
+
+    prices = np.column_stack(columns)                  # (T, N)
+    others = [i for i, s in enumerate(symbols) if s not in benchmarks]
+    if others and len(prices) >= BREADTH_CANDLES:
+        above = prices[-1, others] > prices[-BREADTH_CANDLES:, others].mean(axis=0)
+        snapshot.breadth = float(above.mean())
+
+    bench_idx = [symbols.index(b) for b in benchmarks if b in symbols]
+    if not bench_idx:
+        return snapshot
+
+    returns = np.diff(np.log(prices), axis=0)          # (T-1, N)
+    centered = returns - returns.mean(axis=0)
+    cov = centered.T @ centered[:, bench_idx] / (len(returns) - 1)   # (N, B)
+    std = centered.std(axis=0, ddof=1)
+    bench_std = std[bench_idx]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.outer(std, bench_std)
+        beta = cov / bench_std ** 2
+
+    bench_names = [symbols[i] for i in bench_idx]
+    for row, symbol in enumerate(symbols):
+        snapshot.correlation[symbol] = dict(zip(bench_names, corr[row].tolist()))
+        snapshot.beta[symbol] = dict(zip(bench_names, beta[row].tolist()))
+    return snapshot
@@ -20,10 +20,16 @@ import time
 import logging
 import json
 import sys
-from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
-import requests
+
+from state_store import StateStore
+from signal_journal import SignalJournal, ccxt_candle_fetcher
+from trade_monitor import TradeMonitor, EVENT_TITLES, ccxt_price_fetcher, journal_outcome
+from batch_indicators import BatchIndicators, IndicatorView
+from http_clients import get_session
+from signal_gate import SignalGate
+from tail_windows import TailWindows
 
 # ============================================================================
 # LOGGING SETUP
@@ -112,6 +118,14 @@ class AdaptiveConfig:
     MIN_SCORE_UPTREND = 180      # من 400
     MIN_SCORE_DOWNTREND = 160    # أقل لأن الفرص نادرة
     MIN_SCORE_RANGE = 200        # أعلى للدقة
+    
+    # State Snapshot (استرجاع الـ Cooldown بعد إعادة التشغيل)
+    STATE_FILE = 'adaptive_bot_state.pkl'
+    STATE_CHECKPOINT_INTERVAL = 60
+    
+    # Signal Journal (تتبع نتيجة كل تنبيه)
+    JOURNAL_DB = 'signal_journal.db'
+    MONITOR_POLL_SECONDS = 15    # متابعة الصفقات المفتوحة (T1/T2/SL/Trailing/Time)
 
 # ============================================================================
 # 1️⃣ MARKET MODE DETECTOR (الفلتر الهجين)
@@ -133,12 +147,16 @@ class MarketModeDetector:
         self.ema_long = AdaptiveConfig.EMA_LONG
         self.ema_short = AdaptiveConfig.EMA_SHORT
     
-    def detect_mode(self, df: pd.DataFrame) -> Dict:
+    def detect_mode(self, df: pd.DataFrame, indicators: Optional[IndicatorView] = None) -> Dict:
         """تحليل وضع السوق"""
         
-        # حساب EMAs
-        df['ema200'] = df['close'].ewm(span=self.ema_long, adjust=False).mean()
-        df['ema50'] = df['close'].ewm(span=self.ema_short, adjust=False).mean()
+        # حساب EMAs (من الدفعة المحسوبة مسبقاً إن وجدت)
+        if indicators is not None:
+            df['ema200'] = indicators.ema(self.ema_long)
+            df['ema50'] = indicators.ema(self.ema_short)
+        else:
+            df['ema200'] = df['close'].ewm(span=self.ema_long, adjust=False).mean()
+            df['ema50'] = df['close'].ewm(span=self.ema_short, adjust=False).mean()
         
         current_price = df['close'].iloc[-1]
         ema200_now = df['ema200'].iloc[-1]
@@ -516,7 +534,9 @@ class UptrendStrategy:
             'target2_pct': AdaptiveConfig.UPTREND_TARGET2,
             'stop_loss': entry * (1 - AdaptiveConfig.UPTREND_STOPLOSS / 100),
             'stop_loss_pct': AdaptiveConfig.UPTREND_STOPLOSS,
-            'max_hours': AdaptiveConfig.UPTREND_MAX_HOURS
+            'max_hours': AdaptiveConfig.UPTREND_MAX_HOURS,
+            'trailing_trigger': AdaptiveConfig.UPTREND_TRAILING_TRIGGER,
+            'trailing_distance': AdaptiveConfig.UPTREND_TRAILING_DISTANCE
         }
     
     def _generate_reason(self, breakdown: Dict, mode_data: Dict) -> str:
@@ -826,26 +846,24 @@ class RangeStrategy:
         max_candles = AdaptiveConfig.CONSOLIDATION_MAX_CANDLES
         max_range = AdaptiveConfig.CONSOLIDATION_MAX_RANGE_PCT / 100
         
-        for lookback in range(max_candles, min_candles - 1, -1):
-            window = df.iloc[-lookback:]
-            high = window['high'].max()
-            low = window['low'].min()
-            range_pct = (high - low) / low
+        # أطول نافذة ضيقة (من 32 نزولاً إلى 16) في تمريرة واحدة على الذيل
+        tight = TailWindows(df, max_candles).longest_tight(min_candles, max_candles, max_range)
+        
+        if tight is not None:
+            high, low, range_pct = tight['high'], tight['low'], tight['range_pct']
+            current_price = df['close'].iloc[-1]
+            position_in_range = (current_price - low) / (high - low) if high > low else 0.5
             
-            if range_pct <= max_range:
-                current_price = df['close'].iloc[-1]
-                position_in_range = (current_price - low) / (high - low) if high > low else 0.5
-                
-                return {
-                    'found': True,
-                    'score': 100,
-                    'duration_candles': lookback,
-                    'range_pct': range_pct * 100,
-                    'high': high,
-                    'low': low,
-                    'position': position_in_range * 100,
-                    'in_discount': position_in_range < 0.4
-                }
+            return {
+                'found': True,
+                'score': 100,
+                'duration_candles': tight['length'],
+                'range_pct': range_pct * 100,
+                'high': high,
+                'low': low,
+                'position': position_in_range * 100,
+                'in_discount': position_in_range < 0.4
+            }
         
         return {'found': False, 'score': 0}
     
@@ -919,6 +937,9 @@ class TelegramNotifier:
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        self.session = get_session()  # اتصال مشترك (keep-alive)
+        self.journal = None  # SignalJournal اختياري
+        self.monitor = None  # TradeMonitor اختياري
     
     def send_adaptive_alert(self, signal_data: Dict):
         """إرسال تنبيه متكيف حسب وضع السوق"""
@@ -945,7 +966,7 @@ class TelegramNotifier:
         
         # إرسال
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/sendMessage",
                 json={
                     'chat_id': self.chat_id,
@@ -957,12 +978,47 @@ class TelegramNotifier:
             
             if response.status_code == 200:
                 logger.info(f"✅ Alert sent for {symbol}")
+                targets = signal_data['targets']
+                signal_id = None
+                if self.journal:
+                    signal_id = self.journal.record(
+                        symbol, 'BUY', signal_data['entry'], targets['target1'],
+                        targets['target2'], targets['stop_loss'],
+                        strategy=mode, score=signal_data['score'],
+                        max_hours=targets.get('max_hours')
+                    )
+                if self.monitor:
+                    self.monitor.add(
+                        symbol, 'BUY', signal_data['entry'], targets['target1'],
+                        targets['target2'], targets['stop_loss'], signal_id=signal_id,
+                        max_hours=targets.get('max_hours'),
+                        trailing_trigger_pct=targets.get('trailing_trigger'),
+                        trailing_pct=targets.get('trailing_distance'),
+                        meta={'mode': mode}
+                    )
             else:
                 logger.error(f"❌ Telegram error: {response.text}")
         
         except Exception as e:
             logger.error(f"❌ Failed to send alert: {e}")
     
+    def send_trade_update(self, event: Dict):
+        """تنبيه متابعة للصفقة (T1/T2/SL/Trailing/Time)"""
+        clean_symbol = event['symbol'].replace('/USDT', '').replace('/', '')
+        message = (
+            f"{EVENT_TITLES[event['event']]} | <b>#{clean_symbol}</b>\n"
+            f"💵 ${event['price']:.6f} ({event['pnl_pct']:+.2f}%)\n"
+            f"📍 الدخول: ${event['entry']:.6f}"
+        )
+        try:
+            self.session.post(
+                f"{self.base_url}/sendMessage",
+                json={'chat_id': self.chat_id, 'text': message, 'parse_mode': 'HTML'},
+                timeout=10
+            )
+        except Exception as e:
+            logger.error(f"❌ Failed to send trade update: {e}")
+    
     def _build_message(self, data: Dict, emoji: str, title: str, color: str) -> str:
         """بناء رسالة جذابة"""
         
@@ -1081,14 +1137,33 @@ class CryptoAdaptiveBot:
         self.notifier = TelegramNotifier(telegram_token, telegram_chat_id)
         
         # 🔥 نظام Cooldown: لمنع تكرار الإشارات
-        self.signal_history = {}  # {symbol: {'last_signal_time': datetime, 'last_price': float}}
         self.cooldown_hours = 2    # لا يرسل نفس العملة إلا بعد ساعتين
+        self.signal_gate = SignalGate(self.cooldown_hours)  # آخر سعر في meta
+        
+        # 💾 استرجاع آخر لقطة حالة
+        self.state_store = StateStore(AdaptiveConfig.STATE_FILE, AdaptiveConfig.STATE_CHECKPOINT_INTERVAL)
+        state = self.state_store.load()
+        self.signal_gate.restore_state(state.get('signal_gate', {}))
+        
+        # 📒 سجل الإشارات
+        self.notifier.journal = SignalJournal(
+            AdaptiveConfig.JOURNAL_DB, 'adaptive',
+            candle_fetcher=ccxt_candle_fetcher(self.exchange)
+        )
+        
+        # 📡 متابعة الصفقات المفتوحة (Trailing + المدة القصوى لكل وضع)
+        self.monitor = TradeMonitor(self._on_trade_event, AdaptiveConfig.MONITOR_POLL_SECONDS)
+        self.monitor.restore_state(state.get('open_trades', {}))
+        self.notifier.monitor = self.monitor
         
         logger.info("🚀 Crypto Adaptive Bot v3.0 initialized!")
     
     def run(self):
         """تشغيل البوت"""
         logger.info("🔥 Starting adaptive market scanning...")
+        self.state_store.start(self._snapshot_state)
+        self.notifier.journal.start()
+        self.monitor.start(ccxt_price_fetcher(self.exchange))
         
         while True:
             try:
@@ -1099,9 +1174,16 @@ class CryptoAdaptiveBot:
                 symbols = self._get_top_symbols()
                 logger.info(f"✅ Found {len(symbols)} symbols")
                 
+                # جلب متوازي ثم حساب المؤشرات لكل العملات دفعة واحدة
+                with ThreadPoolExecutor(max_workers=AdaptiveConfig.MAX_WORKERS) as executor:
+                    frames = dict(zip(symbols, executor.map(self._fetch_frame, symbols)))
+                batch = BatchIndicators(frames)
+                
                 # تحليل متوازي
                 with ThreadPoolExecutor(max_workers=AdaptiveConfig.MAX_WORKERS) as executor:
-                    executor.map(self._analyze_symbol, symbols)
+                    for symbol, df in frames.items():
+                        if df is not None:
+                            executor.submit(self._analyze_symbol, symbol, df, batch.view(symbol))
                 
                 logger.info(f"⏳ Waiting {AdaptiveConfig.SCAN_INTERVAL_SECONDS}s...")
                 time.sleep(AdaptiveConfig.SCAN_INTERVAL_SECONDS)
@@ -1112,6 +1194,21 @@ class CryptoAdaptiveBot:
             except Exception as e:
                 logger.error(f"❌ Main loop error: {e}", exc_info=True)
                 time.sleep(60)
+        
+        self.monitor.stop()
+        self.state_store.stop()
+        self.notifier.journal.stop()
+    
+    def _on_trade_event(self, event: Dict):
+        """حدث من مراقب الصفقات: تنبيه متابعة + تحديث السجل"""
+        logger.info(f"📡 {event['symbol']}: {event['event']} @ {event['price']:.6f} ({event['pnl_pct']:+.2f}%)")
+        self.notifier.send_trade_update(event)
+        if event['closed']:
+            self.notifier.journal.close_signal(event['signal_id'], journal_outcome(event), event['price'])
+    
+    def _snapshot_state(self) -> Dict:
+        """لقطة الحالة للحفظ الدوري"""
+        return {'signal_gate': self.signal_gate.to_state(), 'open_trades': self.monitor.to_state()}
     
     def _get_top_symbols(self) -> List[str]:
         """جلب أفضل 30 عملة حسب الحجم"""
@@ -1133,10 +1230,9 @@ class CryptoAdaptiveBot:
             logger.error(f"Failed to fetch symbols: {e}")
             return []
     
-    def _analyze_symbol(self, symbol: str):
-        """تحليل عملة واحدة"""
+    def _fetch_frame(self, symbol: str) -> Optional[pd.DataFrame]:
+        """جلب شموع عملة واحدة"""
         try:
-            # جلب البيانات
             ohlcv = self.exchange.fetch_ohlcv(
                 symbol,
                 AdaptiveConfig.TIMEFRAME,
@@ -1146,9 +1242,23 @@ class CryptoAdaptiveBot:
             df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
             df.set_index('timestamp', inplace=True)
+            return df
+        except Exception as e:
+            logger.warning(f"⚠️ {symbol} fetch failed: {e}")
+            return None
+    
+    def _analyze_symbol(self, symbol: str, df: Optional[pd.DataFrame] = None,
+                        indicators: Optional[IndicatorView] = None):
+        """تحليل عملة واحدة"""
+        try:
+            # جلب البيانات
+            if df is None:
+                df = self._fetch_frame(symbol)
+                if df is None:
+                    return
             
             # كشف وضع السوق
-            mode_data = self.mode_detector.detect_mode(df)
+            mode_data = self.mode_detector.detect_mode(df, indicators)
             mode = mode_data['mode']
             
             # اختيار الاستراتيجية المناسبة
@@ -1181,19 +1291,14 @@ class CryptoAdaptiveBot:
     def _should_send_signal(self, symbol: str, current_price: float) -> bool:
         """فحص: هل يجب إرسال الإشارة؟"""
         
-        # إذا لم يتم إرسال إشارة من قبل لهذه العملة
-        if symbol not in self.signal_history:
-            return True
-        
-        last_signal = self.signal_history[symbol]
-        time_since_last = datetime.now() - last_signal['last_signal_time']
-        
-        # إذا مر أكثر من cooldown_hours
-        if time_since_last.total_seconds() / 3600 >= self.cooldown_hours:
+        # لا إشارة سابقة أو مر أكثر من cooldown_hours (المنتهي يُحذف من SignalGate)
+        last_signal = self.signal_gate.last_signal(symbol)
+        if last_signal is None:
             return True
         
         # إذا السعر تغير كثير (>2%)
-        price_change = abs(current_price - last_signal['last_price']) / last_signal['last_price']
+        last_price = last_signal[1]['last_price']
+        price_change = abs(current_price - last_price) / last_price
         if price_change > 0.02:  # 2%
             return True
         
@@ -1201,10 +1306,7 @@ class CryptoAdaptiveBot:
     
     def _record_signal(self, symbol: str, price: float):
         """تسجيل الإشارة في السجل"""
-        self.signal_history[symbol] = {
-            'last_signal_time': datetime.now(),
-            'last_price': price
-        }
+        self.signal_gate.record(symbol, last_price=price)
 
 # ============================================================================
 # 8️⃣ ENTRY POINT
@@ -21,7 +21,16 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import ccxt
 import pandas as pd
 import numpy as np
-import requests
+
+from state_store import StateStore
+from signal_journal import SignalJournal, ccxt_candle_fetcher
+from trade_monitor import TradeMonitor, EVENT_TITLES, ccxt_price_fetcher, journal_outcome
+from universe_prefilter import UniversePrefilter
+from batch_indicators import BatchIndicators, IndicatorView
+from http_clients import get_session
+from zone_registry import ZoneBook, ZoneRegistry
+from tail_windows import TailWindows
+from scan_scheduler import ScanScheduler
 
 # ============================================================================
 # LOGGING SETUP
@@ -120,7 +129,20 @@ class KillerConfig:
     TIMEFRAME = '15m'            # الإطار الزمني - محسّن لـ ICT
     MIN_VOLUME_USDT = 5_000_000  # 5 مليون حد أدنى
     MAX_CONCURRENT = 10          # تحليل متوازي
-    SCAN_INTERVAL = 300          # 5 دقائق بين المسحات
+    SCAN_INTERVAL = 300          # 5 دقائق بين تحديثات قائمة العملات
+    
+    # Adaptive Scan Cadence (موعد فحص كل عملة حسب نشاطها)
+    SCAN_MIN_INTERVAL = 60       # عملة قريبة من الإشارة / تذبذب أو حجم عالٍ
+    SCAN_MAX_INTERVAL = 3600     # عملة هادئة
+    SCAN_REQUESTS_PER_MINUTE = 30    # ميزانية جلب الشموع في الدقيقة
+    NEAR_MISS_SCORE = 200        # نقاط "قريب" (من 400) → أقصر فترة
+    SCAN_HOT_VOLUME_SPIKE = 3.0  # حجم 3x المتوسط → أقصر فترة
+    
+    # Universe Expansion (كل أزواج USDT عبر فلتر مسبق بدل أفضل 30)
+    UNIVERSE_EXPANSION_MODE = False
+    UNIVERSE_MIN_VOLUME_USDT = 1_000_000
+    UNIVERSE_MAX_SURVIVORS = 40
+    UNIVERSE_CORE_TOP = 10
     
     # Higher Lows (NEW!)
     HIGHER_LOWS_MIN = 3          # 3 قيعان صاعدة على الأقل
@@ -130,6 +152,14 @@ class KillerConfig:
     
     # Alerts
     AVOID_DUPLICATE_HOURS = 2    # لا تكرار خلال ساعتين
+    
+    # State Snapshot (استرجاع سجل التنبيهات بعد إعادة التشغيل)
+    STATE_FILE = 'crypto_killer_state.pkl'
+    STATE_CHECKPOINT_INTERVAL = 60
+    
+    # Signal Journal (تتبع نتيجة كل تنبيه)
+    JOURNAL_DB = 'signal_journal.db'
+    MONITOR_POLL_SECONDS = 15    # متابعة الصفقات المفتوحة (T1/T2/SL/Trailing/Time)
 
 # ============================================================================
 # MARKET STRUCTURE ANALYZER
@@ -244,55 +274,101 @@ class SmartOrderBlockDetector:
     - Fresh فقط (0-1 اختبار)
     """
     
-    def find_institutional_order_blocks(self, df: pd.DataFrame) -> List[Dict]:
-        """البحث عن OB المؤسساتية"""
-        order_blocks = []
-        avg_volume = df['volume'].rolling(50).mean()
+    # متوسط الحجم: rolling(50) → أول شمعة صالحة في النافذة هي 49 (والكشف يبدأ من 20)
+    VOLUME_WINDOW = 50
+    FIRST_INDEX = max(20, VOLUME_WINDOW - 1)
+    
+    def __init__(self):
+        # OB لكل عملة: الاختبارات تُعدّ مع كل شمعة مغلقة بدل إعادة المسح
+        self.registry = ZoneRegistry()
+    
+    def find_institutional_order_blocks(self, df: pd.DataFrame,
+                                        symbol: Optional[str] = None) -> List[Dict]:
+        """
+        البحث عن OB المؤسساتية
+        الشموع المغلقة تُعالج مرة واحدة في سجل العملة؛ الشمعة الأخيرة (قيد التكوين)
+        تُحسب مؤقتاً ولا تُحفظ
+        """
+        if len(df) < 6:
+            return []
         
-        for i in range(20, len(df) - 5):
-            candle = df.iloc[i]
-            
-            # 1. شمعة هابطة قوية
-            body = abs(candle['close'] - candle['open'])
-            full_range = candle['high'] - candle['low']
-            
-            if full_range == 0:
-                continue
-            
-            is_bearish = candle['close'] < candle['open']
-            strong_body = body / full_range > KillerConfig.OB_BODY_THRESHOLD
-            high_volume = candle['volume'] > avg_volume.iloc[i] * KillerConfig.OB_VOLUME_MULTIPLIER
+        book = self.registry.book(symbol) if symbol else ZoneBook()
+        open_, high, low, close, volume = (df[col].to_numpy() for col in ('open', 'high', 'low', 'close', 'volume'))
+        avg_volume = df['volume'].rolling(self.VOLUME_WINDOW).mean().to_numpy()
+        last = len(df) - 1
+        
+        for j in range(book.pending(df.index), last):
+            # اختبار جديد للـ OB التي لمستها الشمعة
+            for zone in book.overlapping(low[j], high[j]):
+                zone.touches += 1
+                if zone.touches > KillerConfig.OB_MAX_TOUCHES:
+                    book.retire(zone)
             
-            if is_bearish and strong_body and high_volume:
-                # 2. بعدها صعود قوي
-                next_3 = df.iloc[i+1:i+4]
-                all_bullish = all(next_3['close'] > next_3['open'])
-                
-                if all_bullish:
-                    rally_size = (df['close'].iloc[i+3] - df['close'].iloc[i]) / df['close'].iloc[i]
-                    
-                    if rally_size > KillerConfig.OB_RALLY_MIN:
-                        # 3. حساب عدد الاختبارات
-                        ob_high = candle['high']
-                        ob_low = candle['low']
-                        touches = 0
-                        
-                        for j in range(i+4, len(df)):
-                            if df['low'].iloc[j] <= ob_high and df['high'].iloc[j] >= ob_low:
-                                touches += 1
-                        
-                        if touches <= KillerConfig.OB_MAX_TOUCHES:
-                            order_blocks.append({
-                                'high': ob_high,
-                                'low': ob_low,
-                                'mid': (ob_high + ob_low) / 2,
-                                'volume': candle['volume'],
-                                'strength': rally_size * 100,
-                                'touches': touches,
-                                'index': i
-                            })
+            # OB تكتمل عند الشمعة i+5 (3 شموع صعود + اختبارات من i+4)
+            block = self._order_block_at(j - 5, open_, high, low, close, volume, avg_volume)
+            if block is not None:
+                zone = book.add('BULLISH', block['low'], block['high'], book.seq + 1 - 5, block)
+                zone.touches = block['touches']
+            book.advance(df.index[j])
+        
+        book.retire_before(book.seq - (last - 1) + self.FIRST_INDEX)
+        
+        order_blocks = []
+        forming = {zone.id for zone in book.overlapping(low[last], high[last])}
+        for zone in book.zones.values():
+            touches = zone.touches + (zone.id in forming)
+            if touches <= KillerConfig.OB_MAX_TOUCHES:
+                order_blocks.append({**zone.data, 'touches': touches,
+                                     'index': book.position(zone, last - 1)})
+        block = self._order_block_at(last - 5, open_, high, low, close, volume, avg_volume)
+        if block is not None:
+            order_blocks.append({**block, 'index': last - 5})
         
         return sorted(order_blocks, key=lambda x: x['strength'], reverse=True)
+    
+    def _order_block_at(self, i: int, open_, high, low, close, volume, avg_volume) -> Optional[Dict]:
+        """OB عند الشمعة i مع اختباراتها في الشمعتين i+4 و i+5 (None إذا لم تتحقق الشروط)"""
+        if i < self.FIRST_INDEX:
+            return None
+        
+        # 1. شمعة هابطة قوية
+        body = abs(close[i] - open_[i])
+        full_range = high[i] - low[i]
+        
+        if full_range == 0:
+            return None
+        
+        is_bearish = close[i] < open_[i]
+        strong_body = body / full_range > KillerConfig.OB_BODY_THRESHOLD
+        high_volume = volume[i] > avg_volume[i] * KillerConfig.OB_VOLUME_MULTIPLIER
+        
+        if not (is_bearish and strong_body and high_volume):
+            return None
+        
+        # 2. بعدها صعود قوي
+        if not (close[i+1:i+4] > open_[i+1:i+4]).all():
+            return None
+        
+        rally_size = (close[i+3] - close[i]) / close[i]
+        if rally_size <= KillerConfig.OB_RALLY_MIN:
+            return None
+        
+        # 3. حساب عدد الاختبارات
+        ob_high = high[i]
+        ob_low = low[i]
+        touches = sum(1 for j in (i + 4, i + 5) if low[j] <= ob_high and high[j] >= ob_low)
+        
+        if touches > KillerConfig.OB_MAX_TOUCHES:
+            return None
+        
+        return {
+            'high': ob_high,
+            'low': ob_low,
+            'mid': (ob_high + ob_low) / 2,
+            'volume': volume[i],
+            'strength': rally_size * 100,
+            'touches': touches
+        }
 
 # ============================================================================
 # VOLATILITY ANALYZER
@@ -361,43 +437,82 @@ class FVGHunter:
     - خلال London/NY Session (أفضلية)
     """
     
-    def detect_premium_fvg(self, df: pd.DataFrame) -> List[Dict]:
-        """كشف FVG عالية الجودة"""
-        fvg_zones = []
+    def __init__(self):
+        # FVG لكل عملة: نسبة الملء تُحدّث مع كل شمعة مغلقة والمملوءة تُحذف
+        self.registry = ZoneRegistry()
+    
+    def detect_premium_fvg(self, df: pd.DataFrame, symbol: Optional[str] = None) -> List[Dict]:
+        """
+        كشف FVG عالية الجودة
+        الشموع المغلقة تُعالج مرة واحدة في سجل العملة؛ الشمعة الأخيرة (قيد التكوين)
+        تُحسب مؤقتاً ولا تُحفظ
+        """
+        if len(df) < 3:
+            return []
+        
+        book = self.registry.book(symbol) if symbol else ZoneBook()
+        high, low, close = (df[col].to_numpy() for col in ('high', 'low', 'close'))
+        last = len(df) - 1
         
-        for i in range(1, len(df) - 1):
-            # Bullish FVG: gap بين candle[i-1].high و candle[i+1].low
-            gap_size = df['low'].iloc[i+1] - df['high'].iloc[i-1]
+        for j in range(book.pending(df.index), last):
+            # الملء: نزول السعر داخل الفجوة من حدها العلوي
+            for zone in book.overlapping(low[j], float('inf')):
+                zone.fill = max(zone.fill, self._filled(zone, low[j]))
+                if zone.fill >= KillerConfig.FVG_MAX_FILLED:
+                    book.retire(zone)
             
-            if gap_size > 0:
-                gap_percent = gap_size / df['close'].iloc[i] * 100
-                
-                if gap_percent > KillerConfig.FVG_MIN_SIZE * 100:
-                    # Volatility Score (بدلاً من Session)
-                    # سيتم حسابه لاحقاً في CryptoKillerStrategy
-                    volatility_score = 0  # placeholder
-                    
-                    # حساب نسبة الملء
-                    filled_percent = 0
-                    for j in range(i+2, len(df)):
-                        if df['low'].iloc[j] <= df['high'].iloc[i-1]:
-                            penetration = (df['high'].iloc[i-1] - df['low'].iloc[j]) / gap_size
-                            filled_percent = max(filled_percent, penetration * 100)
-                    
-                    if filled_percent < KillerConfig.FVG_MAX_FILLED:
-                        fvg_zones.append({
-                            'type': 'BULLISH',
-                            'top': df['low'].iloc[i+1],
-                            'bottom': df['high'].iloc[i-1],
-                            'mid': (df['low'].iloc[i+1] + df['high'].iloc[i-1]) / 2,
-                            'size_percent': gap_percent,
-                            'filled_percent': filled_percent,
-                            'volatility_score': volatility_score,  # سيتم حسابه لاحقاً
-                            'total_score': (gap_percent * 20) - filled_percent,  # base score
-                            'index': i
-                        })
+            # فجوة جديدة اكتملت بالشمعة j
+            gap = self._gap_at(j - 1, high, low, close)
+            if gap is not None:
+                book.add('BULLISH', gap['bottom'], gap['top'], book.seq, gap)
+            book.advance(df.index[j])
+        
+        book.retire_before(book.seq - (last - 1) + 1)
+        
+        fvg_zones = []
+        forming = {zone.id: self._filled(zone, low[last]) for zone in book.overlapping(low[last], float('inf'))}
+        for zone in book.zones.values():
+            filled_percent = max(zone.fill, forming.get(zone.id, 0))
+            if filled_percent < KillerConfig.FVG_MAX_FILLED:
+                fvg_zones.append(self._zone_dict(zone.data, filled_percent, book.position(zone, last - 1)))
+        gap = self._gap_at(last - 1, high, low, close)
+        if gap is not None:
+            fvg_zones.append(self._zone_dict(gap, 0, last - 1))
         
         return sorted(fvg_zones, key=lambda x: x['total_score'], reverse=True)
+    
+    @staticmethod
+    def _gap_at(i: int, high, low, close) -> Optional[Dict]:
+        """Bullish FVG عند الشمعة i: فجوة بين candle[i-1].high و candle[i+1].low"""
+        if i < 1:
+            return None
+        gap_size = low[i+1] - high[i-1]
+        if gap_size <= 0:
+            return None
+        gap_percent = gap_size / close[i] * 100
+        if gap_percent <= KillerConfig.FVG_MIN_SIZE * 100:
+            return None
+        return {'top': low[i+1], 'bottom': high[i-1], 'size_percent': gap_percent}
+    
+    @staticmethod
+    def _filled(zone, candle_low: float) -> float:
+        """نسبة ملء الفجوة بعد نزول الشمعة إلى candle_low (0-100)"""
+        return min(100.0, (zone.high - candle_low) / (zone.high - zone.low) * 100)
+    
+    @staticmethod
+    def _zone_dict(gap: Dict, filled_percent: float, index: int) -> Dict:
+        return {
+            'type': 'BULLISH',
+            'top': gap['top'],
+            'bottom': gap['bottom'],
+            'mid': (gap['top'] + gap['bottom']) / 2,
+            'size_percent': gap['size_percent'],
+            'filled_percent': filled_percent,
+            # Volatility Score (بدلاً من Session) - يُحسب لاحقاً في CryptoKillerStrategy
+            'volatility_score': 0,
+            'total_score': (gap['size_percent'] * 20) - filled_percent,  # base score
+            'index': index
+        }
 
 # ============================================================================
 # LIQUIDITY HUNTER
@@ -580,14 +695,14 @@ class RangeDetector:
         try:
             # آخر N شمعة للتحليل
             lookback = int(KillerConfig.RANGE_MAX_DURATION)
-            recent = df.tail(lookback)
+            windows = TailWindows(df, lookback)
             
-            if len(recent) < KillerConfig.RANGE_MIN_DURATION:
+            if windows.length < KillerConfig.RANGE_MIN_DURATION:
                 return {'in_range': False, 'reason': 'بيانات غير كافية'}
             
             # حساب Range
-            high = recent['high'].max()
-            low = recent['low'].min()
+            high = windows.high_of(lookback)
+            low = windows.low_of(lookback)
             range_pct = ((high - low) / low) * 100
             
             # التحقق من Range الضيق
@@ -600,12 +715,10 @@ class RangeDetector:
             
             # التحقق من المدة
             # نعد الشموع التي في نطاق ضيق
-            candles_in_range = 0
-            for i in range(len(recent)):
-                candle_high = recent.iloc[i]['high']
-                candle_low = recent.iloc[i]['low']
-                if candle_low >= low * 0.995 and candle_high <= high * 1.005:
-                    candles_in_range += 1
+            recent = df.tail(lookback)
+            candles_in_range = int(np.count_nonzero(
+                (recent['low'].to_numpy() >= low * 0.995) & (recent['high'].to_numpy() <= high * 1.005)
+            ))
             
             if candles_in_range < KillerConfig.RANGE_MIN_DURATION:
                 return {
@@ -644,17 +757,22 @@ class EMAAnalyzer:
     - Momentum confirmation
     """
     
-    def analyze_ema_setup(self, df: pd.DataFrame) -> Dict:
+    def analyze_ema_setup(self, df: pd.DataFrame, indicators: Optional[IndicatorView] = None) -> Dict:
         """تحليل EMA وكشف التقاطع المبكر"""
         try:
-            # حساب EMAs
-            ema5 = df['close'].ewm(span=KillerConfig.EMA_FAST, adjust=False).mean()
-            ema8 = df['close'].ewm(span=KillerConfig.EMA_MID, adjust=False).mean()
-            ema13 = df['close'].ewm(span=KillerConfig.EMA_SLOW, adjust=False).mean()
+            # حساب EMAs (من الدفعة المحسوبة مسبقاً إن وجدت)
+            if indicators is not None:
+                ema5 = indicators.ema(KillerConfig.EMA_FAST)
+                ema8 = indicators.ema(KillerConfig.EMA_MID)
+                ema13 = indicators.ema(KillerConfig.EMA_SLOW)
+            else:
+                ema5 = df['close'].ewm(span=KillerConfig.EMA_FAST, adjust=False).mean().values
+                ema8 = df['close'].ewm(span=KillerConfig.EMA_MID, adjust=False).mean().values
+                ema13 = df['close'].ewm(span=KillerConfig.EMA_SLOW, adjust=False).mean().values
             
-            current_ema5 = ema5.iloc[-1]
-            current_ema8 = ema8.iloc[-1]
-            current_ema13 = ema13.iloc[-1]
+            current_ema5 = ema5[-1]
+            current_ema8 = ema8[-1]
+            current_ema13 = ema13[-1]
             
             # التقاطع الكامل (Full Crossover)
             full_bullish = (current_ema5 > current_ema8) and (current_ema8 > current_ema13)
@@ -664,8 +782,8 @@ class EMAAnalyzer:
             ema8_near_13 = abs(current_ema8 - current_ema13) / current_ema13 < KillerConfig.EMA_PROXIMITY
             
             # Momentum: EMA 5 يصعد
-            ema5_rising = ema5.iloc[-1] > ema5.iloc[-3]
-            ema5_slope = (ema5.iloc[-1] - ema5.iloc[-3]) / ema5.iloc[-3]
+            ema5_rising = ema5[-1] > ema5[-3]
+            ema5_slope = (ema5[-1] - ema5[-3]) / ema5[-3]
             
             # Pre-crossover مع momentum
             early_signal = (
@@ -731,11 +849,11 @@ class VolumeAnalyzer:
     - Breakout volume confirmation
     """
     
-    def analyze_volume_pattern(self, df: pd.DataFrame) -> Dict:
+    def analyze_volume_pattern(self, df: pd.DataFrame, indicators: Optional[IndicatorView] = None) -> Dict:
         """تحليل نمط Volume"""
         try:
             volume = df['volume']
-            avg_volume = volume.rolling(20).mean().iloc[-1]
+            avg_volume = self._average_volume(df, indicators)
             
             # آخر N شموع
             recent_volume = volume.tail(KillerConfig.VOLUME_DECLINING_CANDLES)
@@ -775,16 +893,22 @@ class VolumeAnalyzer:
             logging.warning(f"Volume analysis failed: {e}")
             return {'score': 0, 'reason': str(e)}
     
-    def check_breakout_volume(self, df: pd.DataFrame) -> bool:
+    def check_breakout_volume(self, df: pd.DataFrame, indicators: Optional[IndicatorView] = None) -> bool:
         """تحقق من Volume الكسر"""
         try:
-            volume = df['volume']
-            avg_volume = volume.rolling(20).mean().iloc[-1]
-            current_volume = volume.iloc[-1]
+            avg_volume = self._average_volume(df, indicators)
+            current_volume = df['volume'].iloc[-1]
             
             return current_volume >= avg_volume * KillerConfig.BREAKOUT_VOLUME_MIN
         except:
             return False
+    
+    @staticmethod
+    def _average_volume(df: pd.DataFrame, indicators: Optional[IndicatorView]) -> float:
+        """متوسط Volume لآخر 20 شمعة"""
+        if indicators is not None:
+            return indicators.volume_mean(20)[-1]
+        return df['volume'].rolling(20).mean().iloc[-1]
 
 # ============================================================================
 # PATTERN DETECTOR (NEW!)
@@ -916,7 +1040,8 @@ class CryptoKillerStrategy:
         self.volume_analyzer = VolumeAnalyzer()
         self.pattern_detector = PatternDetector()
     
-    def generate_signal(self, symbol: str, df: pd.DataFrame) -> Dict:
+    def generate_signal(self, symbol: str, df: pd.DataFrame,
+                        indicators: Optional[IndicatorView] = None) -> Dict:
         """توليد إشارة تداول مع نظام النقاط المحسّن"""
         
         total_score = 0
@@ -940,7 +1065,7 @@ class CryptoKillerStrategy:
         total_score += range_data['score']
         
         # 2. EMA Setup (إلزامي!)
-        ema_data = self.ema_analyzer.analyze_ema_setup(df)
+        ema_data = self.ema_analyzer.analyze_ema_setup(df, indicators)
         if ema_data['score'] < 40:  # على الأقل Preparing
             return {
                 'signal': 'WAIT',
@@ -952,7 +1077,7 @@ class CryptoKillerStrategy:
         total_score += ema_data['score']
         
         # 3. Volume Pattern (اختياري لكن مهم)
-        volume_data = self.volume_analyzer.analyze_volume_pattern(df)
+        volume_data = self.volume_analyzer.analyze_volume_pattern(df, indicators)
         breakdown['volume'] = volume_data
         total_score += volume_data['score']
         
@@ -969,7 +1094,7 @@ class CryptoKillerStrategy:
             total_score += lower_wicks['score']
         
         # 6. Breakout Volume Confirmation
-        has_breakout_volume = self.volume_analyzer.check_breakout_volume(df)
+        has_breakout_volume = self.volume_analyzer.check_breakout_volume(df, indicators)
         if not has_breakout_volume:
             # لا نرفض الإشارة، لكن نخفض النقاط
             total_score = int(total_score * 0.9)
@@ -1003,7 +1128,7 @@ class CryptoKillerStrategy:
         # ═══════════════════════════════════════
         # 2️⃣ ORDER BLOCK (80 max)
         # ═══════════════════════════════════════
-        order_blocks = self.ob_detector.find_institutional_order_blocks(df)
+        order_blocks = self.ob_detector.find_institutional_order_blocks(df, symbol)
         ob_score = 0
         
         for ob in order_blocks[:3]:
@@ -1030,7 +1155,7 @@ class CryptoKillerStrategy:
         # ═══════════════════════════════════════
         # 3️⃣ FAIR VALUE GAP (70 max)
         # ═══════════════════════════════════════
-        fvg_zones = self.fvg_hunter.detect_premium_fvg(df)
+        fvg_zones = self.fvg_hunter.detect_premium_fvg(df, symbol)
         volatility_data = self.volatility_analyzer.get_volatility_score(df)
         fvg_score = 0
         
@@ -1183,8 +1308,10 @@ class TelegramNotifier:
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.api_url = f"https://api.telegram.org/bot{bot_token}"
-        self.session = requests.Session()
+        self.session = get_session()  # اتصال مشترك (keep-alive)
         self.history = defaultdict(deque)
+        self.journal = None  # SignalJournal اختياري
+        self.monitor = None  # TradeMonitor اختياري
     
     def send_killer_alert(self, signal: Dict) -> bool:
         """إرسال تنبيه سفّاح الكريبتو"""
@@ -1208,6 +1335,22 @@ class TelegramNotifier:
             
             if response.status_code == 200:
                 self._record_alert(signal['symbol'])
+                signal_id = None
+                if self.journal:
+                    signal_id = self.journal.record(
+                        signal['symbol'], 'BUY', signal['entry'], signal['target1'],
+                        signal['target2'], signal['stop_loss'],
+                        strategy=signal['structure_type'], score=signal['score'],
+                        max_hours=KillerConfig.MAX_TRADE_HOURS
+                    )
+                if self.monitor:
+                    self.monitor.add(
+                        signal['symbol'], 'BUY', signal['entry'], signal['target1'],
+                        signal['target2'], signal['stop_loss'], signal_id=signal_id,
+                        max_hours=KillerConfig.MAX_TRADE_HOURS,
+                        trailing_trigger_pct=KillerConfig.TRAILING_STOP_TRIGGER,
+                        trailing_pct=KillerConfig.TRAILING_STOP_PCT
+                    )
                 return True
             
         except Exception as e:
@@ -1250,6 +1393,24 @@ class TelegramNotifier:
         
         return message
     
+    def send_trade_update(self, event: Dict) -> bool:
+        """تنبيه متابعة للصفقة (T1/T2/SL/Trailing/Time)"""
+        symbol_tag = event['symbol'].replace('/', '')
+        message = (
+            f"{EVENT_TITLES[event['event']]} | <b>#{symbol_tag}</b>\n"
+            f"💵 {event['price']:.4f} ({event['pnl_pct']:+.2f}%) | Entry {event['entry']:.4f}"
+        )
+        try:
+            response = self.session.post(
+                f"{self.api_url}/sendMessage",
+                json={"chat_id": self.chat_id, "text": message, "parse_mode": "HTML"},
+                timeout=10
+            )
+            return response.status_code == 200
+        except Exception as e:
+            logging.error(f"Failed to send trade update: {e}")
+            return False
+    
     def _is_duplicate(self, symbol: str) -> bool:
         """تحقق من التكرار"""
         cutoff = datetime.now() - timedelta(hours=KillerConfig.AVOID_DUPLICATE_HOURS)
@@ -1284,6 +1445,43 @@ class CryptoKillerBot:
         self.strategy = CryptoKillerStrategy()
         self.running = True
         
+        # 🌐 فلتر مسبق لوضع توسيع النطاق
+        self.prefilter = UniversePrefilter(
+            self.exchange.fetch_ohlcv,
+            timeframe=KillerConfig.TIMEFRAME,
+            min_volume_usdt=KillerConfig.UNIVERSE_MIN_VOLUME_USDT,
+            max_survivors=KillerConfig.UNIVERSE_MAX_SURVIVORS,
+            core_top=KillerConfig.UNIVERSE_CORE_TOP,
+            max_workers=KillerConfig.MAX_CONCURRENT
+        )
+        
+        # ⏱️ جدولة الفحص حسب نشاط كل عملة تحت ميزانية طلبات ثابتة
+        self.scheduler = ScanScheduler(
+            min_interval=KillerConfig.SCAN_MIN_INTERVAL,
+            max_interval=KillerConfig.SCAN_MAX_INTERVAL,
+            requests_per_minute=KillerConfig.SCAN_REQUESTS_PER_MINUTE,
+            near_miss_score=KillerConfig.NEAR_MISS_SCORE,
+            hot_atr_ratio=KillerConfig.HIGH_VOLATILITY_THRESHOLD,
+            hot_volume_spike=KillerConfig.SCAN_HOT_VOLUME_SPIKE
+        )
+        
+        # 💾 استرجاع سجل التنبيهات (منع إعادة الإرسال بعد إعادة التشغيل)
+        self.state_store = StateStore(KillerConfig.STATE_FILE, KillerConfig.STATE_CHECKPOINT_INTERVAL)
+        state = self.state_store.load()
+        for symbol, times in state.get('alert_history', {}).items():
+            self.notifier.history[symbol].extend(times)
+        
+        # 📒 سجل الإشارات
+        self.notifier.journal = SignalJournal(
+            KillerConfig.JOURNAL_DB, 'killer',
+            candle_fetcher=ccxt_candle_fetcher(self.exchange)
+        )
+        
+        # 📡 متابعة الصفقات المفتوحة (Trailing + خروج زمني)
+        self.monitor = TradeMonitor(self._on_trade_event, KillerConfig.MONITOR_POLL_SECONDS)
+        self.monitor.restore_state(state.get('open_trades', {}))
+        self.notifier.monitor = self.monitor
+        
         logging.info("💀 Crypto Killer Bot initialized!")
     
     def run(self):
@@ -1299,29 +1497,32 @@ class CryptoKillerBot:
         )
         
         logging.info("🚀 Starting main loop...")
+        self.state_store.start(self._snapshot_state)
+        self.notifier.journal.start()
+        self.monitor.start(ccxt_price_fetcher(self.exchange))
         
+        universe_at = None
         while self.running:
             try:
-                logging.info("=" * 60)
-                logging.info("📊 Scanning market...")
+                # تحديث قائمة العملات كل SCAN_INTERVAL (الجديدة تُفحص فوراً)
+                if universe_at is None or time.monotonic() - universe_at >= KillerConfig.SCAN_INTERVAL:
+                    logging.info("=" * 60)
+                    logging.info("📊 Refreshing symbols...")
+                    symbols = self._get_top_symbols()
+                    if symbols:
+                        new = self.scheduler.sync(symbols)
+                        logging.info(f"✅ Found {len(symbols)} symbols ({new} new)")
+                    universe_at = time.monotonic()
                 
-                # جلب العملات
-                symbols = self._get_top_symbols()
-                logging.info(f"✅ Found {len(symbols)} symbols")
+                # العملات المستحقة فقط، بحد ميزانية الطلبات
+                due = self.scheduler.due()
+                if due:
+                    logging.info(f"🔎 Scanning {len(due)} due symbols")
+                    self._scan_symbols(due)
                 
-                # تحليل متوازي
-                with ThreadPoolExecutor(max_workers=KillerConfig.MAX_CONCURRENT) as executor:
-                    futures = {executor.submit(self._analyze_symbol, sym): sym 
-                              for sym in symbols}
-                    
-                    for future in as_completed(futures):
-                        try:
-                            future.result()
-                        except Exception as e:
-                            logging.error(f"Analysis error: {e}")
-                
-                logging.info(f"⏳ Waiting {KillerConfig.SCAN_INTERVAL}s...")
-                time.sleep(KillerConfig.SCAN_INTERVAL)
+                wait = self.scheduler.next_due_in()
+                until_refresh = KillerConfig.SCAN_INTERVAL - (time.monotonic() - universe_at)
+                time.sleep(max(1.0, min(until_refresh, wait if wait is not None else until_refresh)))
                 
             except KeyboardInterrupt:
                 logging.info("⛔ Stopping bot...")
@@ -1329,12 +1530,69 @@ class CryptoKillerBot:
             except Exception as e:
                 logging.error(f"Main loop error: {e}")
                 time.sleep(60)
+        
+        self.monitor.stop()
+        self.state_store.stop()
+        self.notifier.journal.stop()
+    
+    def _scan_symbols(self, symbols: List[str]):
+        """جلب متوازي ثم حساب المؤشرات دفعة واحدة ثم تحليل متوازي"""
+        try:
+            with ThreadPoolExecutor(max_workers=KillerConfig.MAX_CONCURRENT) as executor:
+                frames = dict(zip(symbols, executor.map(self._fetch_frame, symbols)))
+            batch = BatchIndicators(frames)
+            
+            for symbol in [s for s in symbols if frames[s] is None]:
+                self.scheduler.schedule(symbol, KillerConfig.SCAN_INTERVAL)  # إعادة محاولة لاحقاً
+            
+            with ThreadPoolExecutor(max_workers=KillerConfig.MAX_CONCURRENT) as executor:
+                futures = {executor.submit(self._analyze_symbol, sym, frames[sym], batch.view(sym)): sym 
+                          for sym in symbols if frames[sym] is not None}
+                
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logging.error(f"Analysis error: {e}")
+        finally:
+            # استثناء قبل record/schedule لا يُسقط العملات من الجدولة
+            stranded = self.scheduler.requeue(symbols, KillerConfig.SCAN_INTERVAL)
+            if stranded:
+                logging.warning(f"⚠️ {stranded} symbols rescheduled after an interrupted scan")
+    
+    def _activity(self, df: pd.DataFrame) -> Tuple[float, float]:
+        """(نسبة ATR، قفزة الحجم) للشمعة الأخيرة - تحدد موعد الفحص التالي"""
+        atr_ratio = self.strategy.volatility_analyzer.get_volatility_score(df).get('ratio', 1.0)
+        avg_volume = df['volume'].iloc[-21:-1].mean()
+        volume_spike = float(df['volume'].iloc[-1] / avg_volume) if avg_volume > 0 else 1.0
+        return float(atr_ratio), volume_spike
+    
+    def _on_trade_event(self, event: Dict):
+        """حدث من مراقب الصفقات: تنبيه متابعة + تحديث السجل"""
+        logging.info(f"📡 {event['symbol']}: {event['event']} @ {event['price']:.4f} ({event['pnl_pct']:+.2f}%)")
+        self.notifier.send_trade_update(event)
+        if event['closed']:
+            self.notifier.journal.close_signal(event['signal_id'], journal_outcome(event), event['price'])
+    
+    def _snapshot_state(self) -> Dict:
+        """لقطة الحالة للحفظ الدوري"""
+        return {
+            'alert_history': {
+                symbol: list(times.copy())
+                for symbol, times in list(self.notifier.history.items())
+            },
+            'open_trades': self.monitor.to_state()
+        }
     
     def _get_top_symbols(self) -> List[str]:
         """جلب أفضل العملات للتحليل"""
         try:
             markets = self.exchange.fetch_tickers()
             
+            if KillerConfig.UNIVERSE_EXPANSION_MODE:
+                # كل الأزواج → فلتر مسبق رخيص → الناجون فقط للاستراتيجية
+                return self.prefilter.select(markets, [s for s in markets if s.endswith('/USDT')])
+            
             usdt_pairs = []
             for symbol, ticker in markets.items():
                 if '/USDT' in symbol and ticker.get('quoteVolume', 0) > KillerConfig.MIN_VOLUME_USDT:
@@ -1352,10 +1610,9 @@ class CryptoKillerBot:
             logging.error(f"Failed to fetch symbols: {e}")
             return []
     
-    def _analyze_symbol(self, symbol: str):
-        """تحليل عملة واحدة"""
+    def _fetch_frame(self, symbol: str) -> Optional[pd.DataFrame]:
+        """جلب شموع عملة واحدة"""
         try:
-            # جلب البيانات
             ohlcv = self.exchange.fetch_ohlcv(
                 symbol, 
                 KillerConfig.TIMEFRAME, 
@@ -1365,18 +1622,39 @@ class CryptoKillerBot:
             df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
             df.set_index('timestamp', inplace=True)
+            return df
+        except Exception as e:
+            logging.warning(f"⚠️ {symbol} fetch failed: {e}")
+            return None
+    
+    def _analyze_symbol(self, symbol: str, df: Optional[pd.DataFrame] = None,
+                        indicators: Optional[IndicatorView] = None):
+        """تحليل عملة واحدة"""
+        try:
+            # جلب البيانات
+            if df is None:
+                df = self._fetch_frame(symbol)
+                if df is None:
+                    self.scheduler.schedule(symbol, KillerConfig.SCAN_INTERVAL)
+                    return
             
             # توليد الإشارة
-            signal = self.strategy.generate_signal(symbol, df)
+            signal = self.strategy.generate_signal(symbol, df, indicators)
+            
+            # الموعد التالي: القريبة كل دقيقة، الهادئة كل ساعة
+            atr_ratio, volume_spike = self._activity(df)
+            delay = self.scheduler.record(symbol, atr_ratio, volume_spike, signal['score'])
             
             if signal['signal'] == 'BUY':
                 logging.info(f"💀 {symbol}: BUY signal! Score: {signal['score']}/400 ({signal['percentage']:.1f}%)")
                 self.notifier.send_killer_alert(signal)
-            elif signal['score'] > 200:
-                logging.info(f"📊 {symbol}: {signal['score']}/400 ({signal['percentage']:.1f}%) - قريب")
+            elif signal['score'] > KillerConfig.NEAR_MISS_SCORE:
+                logging.info(f"📊 {symbol}: {signal['score']}/400 ({signal['percentage']:.1f}%) - قريب "
+                             f"(فحص بعد {delay:.0f}s)")
             
         except Exception as e:
             logging.warning(f"⚠️ {symbol} analysis failed: {e}")
+            self.scheduler.schedule(symbol, KillerConfig.SCAN_INTERVAL)
 
 # ============================================================================
 # ENTRY POINT
@@ -30,7 +30,14 @@ import ta
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
-import requests
+
+from state_store import StateStore
+from signal_journal import SignalJournal, ccxt_candle_fetcher
+from batch_indicators import BatchIndicators, IndicatorView
+from http_clients import get_session
+from signal_gate import SignalGate
+from kline_cache import KlineCache
+from cross_asset import CrossAssetSnapshot, compute_cross_asset
 
 # ============================================================================
 # LOGGING SETUP
@@ -91,7 +98,10 @@ class Config:
     EMA_FAST = 20
     EMA_SLOW = 50
     BTC_CORRELATION_ENABLED = True
-    BTC_DROP_THRESHOLD = -2.0
+    BTC_DROP_THRESHOLD = -2.0     # % تغير BTC على آخر BTC_DROP_LOOKBACK شمعة → risk-off
+    BTC_DROP_LOOKBACK = 4
+    CORRELATION_WINDOW = 48       # شموع 1h للارتباط والـ Beta
+    CORRELATION_VETO = 0.6        # في risk-off: العملات بارتباط أعلى لا تُحلل
     
     # ========== Entry Configuration (CHANGED!) ==========
     ENTRY_LADDER_DISABLED = True  # 단일 진입만
@@ -136,6 +146,88 @@ class Config:
     # ========== Scan ==========
     SCAN_INTERVAL = 300  # 5 minutes
     MAX_WORKERS = 6
+    
+    # ========== Kline Cache ==========
+    KLINE_CACHE_TTL = 120          # أقل من SCAN_INTERVAL: كل دورة تجلب شموعاً جديدة
+    KLINE_CACHE_MAX_ENTRIES = 256
+    KLINE_FETCH_LIMIT = 100        # كل الطلبات لنفس الإطار تشترك في جلب واحد بهذا الحد
+    
+    # ========== State Snapshot ==========
+    STATE_FILE = 'crypto_killer_v7_state.pkl'
+    STATE_CHECKPOINT_INTERVAL = 60
+    
+    # ========== Signal Journal ==========
+    JOURNAL_DB = 'signal_journal.db'
+    JOURNAL_MAX_HOURS = 24
+
+# ============================================================================
+# MARKET CONTEXT (per-cycle snapshot)
+# ============================================================================
+
+def ema_trend(df: Optional[pd.DataFrame]) -> Optional[bool]:
+    """EMA20 فوق EMA50 على شموع الساعة؟ (None إذا البيانات غير كافية)"""
+    if df is None or len(df) < 20:
+        return None
+    ema_fast = ta.trend.ema_indicator(df['close'], 20)
+    ema_slow = ta.trend.ema_indicator(df['close'], 50)
+    return float(ema_fast.iloc[-1]) > float(ema_slow.iloc[-1])
+
+
+class MarketContext:
+    """
+    لقطة السوق لدورة واحدة: شموع 1h لكل عملات القائمة + BTC/ETH تُجلب بالتوازي مرة واحدة
+    المقيّم وتقرير السوق والعملات الصاعدة يقرؤون منها بدل الجلب كل على حدة
+    """
+    
+    TREND_CANDLES = 50  # اتجاه BTC/ETH والعملات الصاعدة على آخر 50 شمعة
+    
+    def __init__(self, frames: Dict[str, Optional[pd.DataFrame]]):
+        self.frames = frames
+        self.created_at = datetime.now()
+        self._trends: Dict[str, Optional[bool]] = {}
+        self._cross: Optional[CrossAssetSnapshot] = None
+    
+    @classmethod
+    def fetch(cls, exchange, symbols: List[str], max_workers: int = Config.MAX_WORKERS) -> 'MarketContext':
+        """جلب متزامن: زمن الدورة = أبطأ طلب لا مجموع الطلبات"""
+        symbols = list(dict.fromkeys(symbols))
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as executor:
+            frames = executor.map(
+                lambda s: exchange.get_ohlcv(s, Config.TIMEFRAME_1H, Config.CANDLES_1H), symbols
+            )
+            return cls(dict(zip(symbols, frames)))
+    
+    def frame(self, symbol: str, limit: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """شموع العملة (آخر limit شمعة بنفس شكل الجلب المباشر)"""
+        df = self.frames.get(symbol)
+        if df is None or limit is None or len(df) <= limit:
+            return df
+        return df.tail(limit).reset_index(drop=True)
+    
+    def trend(self, coin: str) -> Optional[bool]:
+        """اتجاه العملة (BTC/ETH) - يُحسب مرة واحدة في الدورة"""
+        if coin not in self._trends:
+            self._trends[coin] = ema_trend(self.frame(f"{coin}/USDT", self.TREND_CANDLES))
+        return self._trends[coin]
+    
+    def cross_asset(self) -> CrossAssetSnapshot:
+        """الارتباط/Beta مقابل BTC/ETH وحالة السوق - مرة واحدة في الدورة"""
+        if self._cross is None:
+            self._cross = compute_cross_asset(
+                self.frames,
+                window=Config.CORRELATION_WINDOW,
+                drop_lookback=Config.BTC_DROP_LOOKBACK,
+                drop_threshold=Config.BTC_DROP_THRESHOLD,
+                veto_correlation=Config.CORRELATION_VETO
+            )
+        return self._cross
+    
+    def scan_pairs(self, pairs: List[str]) -> List[str]:
+        """العملات التي تستحق التحليل (فلتر هبوط BTC قبل المؤشرات)"""
+        if not Config.BTC_CORRELATION_ENABLED:
+            return pairs
+        cross = self.cross_asset()
+        return [p for p in pairs if not cross.vetoed(p)]
 
 # ============================================================================
 # SIGNAL STRENGTH EVALUATOR (Dynamic Scoring)
@@ -147,10 +239,23 @@ class SignalEvaluator:
     def __init__(self, exchange):
         self.exchange = exchange
     
-    def calculate_signal_strength(self, symbol: str) -> Dict:
+    def evaluate_batch(self, symbols: List[str], context: Optional[MarketContext] = None) -> Dict[str, Dict]:
+        """تقييم عدة عملات: الشموع من لقطة الدورة (أو جلب متوازي) ثم المؤشرات للكل دفعة واحدة"""
+        if context is None:
+            context = MarketContext.fetch(self.exchange, symbols)
+        frames = {s: context.frame(s) for s in symbols}
+        batch = BatchIndicators(frames)
+        return {
+            s: self.calculate_signal_strength(s, df_1h=frames[s], indicators=batch.view(s))
+            for s in symbols
+        }
+    
+    def calculate_signal_strength(self, symbol: str, df_1h: Optional[pd.DataFrame] = None,
+                                  indicators: Optional[IndicatorView] = None) -> Dict:
         """حساب قوة الإشارة بناءً على مؤشرات متعددة"""
         try:
-            df_1h = self.exchange.get_ohlcv(symbol, Config.TIMEFRAME_1H, Config.CANDLES_1H)
+            if df_1h is None:
+                df_1h = self.exchange.get_ohlcv(symbol, Config.TIMEFRAME_1H, Config.CANDLES_1H)
             if df_1h is None or len(df_1h) < 20:
                 return None
             
@@ -159,8 +264,10 @@ class SignalEvaluator:
             
             # 1. RSI (20 نقطة)
             try:
-                rsi = ta.momentum.rsi(df_1h['close'], window=14)
-                rsi_val = float(rsi.iloc[-1])
+                if indicators is not None:
+                    rsi_val = float(indicators.rsi(14)[-1])
+                else:
+                    rsi_val = float(ta.momentum.rsi(df_1h['close'], window=14).iloc[-1])
                 if pd.isna(rsi_val):
                     rsi_val = 50
                 
@@ -193,7 +300,10 @@ class SignalEvaluator:
             
             # 3. Volume Analysis (20 نقطة)
             try:
-                vol_avg = df_1h['volume'].tail(20).mean()
+                if indicators is not None:
+                    vol_avg = float(indicators.volume_mean(20)[-1])
+                else:
+                    vol_avg = df_1h['volume'].tail(20).mean()
                 if vol_avg > 0 and last_candle['volume'] > vol_avg * 1.5:
                     score += 20
                     reasons.append(f"High volume (spike: {last_candle['volume']/vol_avg:.2f}x)")
@@ -205,9 +315,13 @@ class SignalEvaluator:
             
             # 4. Trend Analysis (20 نقطة)
             try:
-                ema_fast = ta.trend.ema_indicator(df_1h['close'], Config.EMA_FAST)
-                ema_slow = ta.trend.ema_indicator(df_1h['close'], Config.EMA_SLOW)
-                if float(ema_fast.iloc[-1]) > float(ema_slow.iloc[-1]):
+                if indicators is not None:
+                    ema_fast = indicators.ema_indicator(Config.EMA_FAST)[-1]
+                    ema_slow = indicators.ema_indicator(Config.EMA_SLOW)[-1]
+                else:
+                    ema_fast = ta.trend.ema_indicator(df_1h['close'], Config.EMA_FAST).iloc[-1]
+                    ema_slow = ta.trend.ema_indicator(df_1h['close'], Config.EMA_SLOW).iloc[-1]
+                if float(ema_fast) > float(ema_slow):
                     score += 20
                     reasons.append("Strong uptrend (EMA cross)")
             except Exception as e:
@@ -301,36 +415,23 @@ class MarketMetricsAnalyzer:
     def __init__(self, exchange):
         self.exchange = exchange
     
-    def get_market_metrics(self) -> Dict:
-        """جلب مؤشرات السوق الرئيسية مع التقييم"""
+    def get_market_metrics(self, context: Optional[MarketContext] = None) -> Dict:
+        """مؤشرات السوق الرئيسية مع التقييم (اتجاه BTC/ETH من لقطة الدورة)"""
         try:
             metrics = {}
+            if context is None:
+                context = MarketContext.fetch(self.exchange, ['BTC/USDT', 'ETH/USDT'])
             
-            # 1. BTC Trend
-            try:
-                btc_1h = self.exchange.get_ohlcv('BTC/USDT', '1h', 50)
-                if btc_1h is not None and len(btc_1h) >= 20:
-                    btc_ema_fast = ta.trend.ema_indicator(btc_1h['close'], 20)
-                    btc_ema_slow = ta.trend.ema_indicator(btc_1h['close'], 50)
-                    btc_trend_strong = float(btc_ema_fast.iloc[-1]) > float(btc_ema_slow.iloc[-1])
-                    metrics['BTC_trend'] = ('✅ صعود قوي' if btc_trend_strong else '⚠️ هبوط') 
-                    metrics['BTC_signal'] = '🟢 إيجابي' if btc_trend_strong else '🔴 سلبي'
-            except Exception as e:
-                logger.debug(f"BTC metrics error: {e}")
-                metrics['BTC_signal'] = '⚠️ بدون بيانات'
-            
-            # 2. ETH Trend  
-            try:
-                eth_1h = self.exchange.get_ohlcv('ETH/USDT', '1h', 50)
-                if eth_1h is not None and len(eth_1h) >= 20:
-                    eth_ema_fast = ta.trend.ema_indicator(eth_1h['close'], 20)
-                    eth_ema_slow = ta.trend.ema_indicator(eth_1h['close'], 50)
-                    eth_trend_strong = float(eth_ema_fast.iloc[-1]) > float(eth_ema_slow.iloc[-1])
-                    metrics['ETH_trend'] = ('✅ صعود قوي' if eth_trend_strong else '⚠️ هبوط')
-                    metrics['ETH_signal'] = '🟢 إيجابي' if eth_trend_strong else '🔴 سلبي'
-            except Exception as e:
-                logger.debug(f"ETH metrics error: {e}")
-                metrics['ETH_signal'] = '⚠️ بدون بيانات'
+            # 1-2. BTC / ETH Trend
+            for coin in ('BTC', 'ETH'):
+                try:
+                    trend_strong = context.trend(coin)
+                    if trend_strong is not None:
+                        metrics[f'{coin}_trend'] = ('✅ صعود قوي' if trend_strong else '⚠️ هبوط')
+                        metrics[f'{coin}_signal'] = '🟢 إيجابي' if trend_strong else '🔴 سلبي'
+                except Exception as e:
+                    logger.debug(f"{coin} metrics error: {e}")
+                    metrics[f'{coin}_signal'] = '⚠️ بدون بيانات'
             
             # 3. Overall market sentiment
             positive_count = sum(1 for v in metrics.values() if 'إيجابي' in str(v))
@@ -352,14 +453,16 @@ class TrendingCoinsDetector:
     def __init__(self, exchange):
         self.exchange = exchange
     
-    def find_trending(self) -> List[Dict]:
-        """البحث عن أفضل 5 عملات صاعدة"""
+    def find_trending(self, context: Optional[MarketContext] = None) -> List[Dict]:
+        """البحث عن أفضل 5 عملات صاعدة (الشموع من لقطة الدورة)"""
         try:
             trending = []
+            if context is None:
+                context = MarketContext.fetch(self.exchange, [f"{s}/USDT" for s in Config.FIXED_WATCHLIST])
             
             for symbol in Config.FIXED_WATCHLIST:
                 try:
-                    df = self.exchange.get_ohlcv(f"{symbol}/USDT", '1h', 50)
+                    df = context.frame(f"{symbol}/USDT", MarketContext.TREND_CANDLES)
                     if df is None or len(df) < 24:  # تأكد من وجود 24 شمعة على الأقل
                         continue
                     
@@ -425,16 +528,20 @@ class TelegramNotifier:
         self.token = Config.TELEGRAM_BOT_TOKEN
         self.chat_id = Config.TELEGRAM_CHAT_ID
         self.api_url = f"https://api.telegram.org/bot{self.token}"
+        self.session = get_session()  # اتصال مشترك (keep-alive + مهلة افتراضية)
+        self.journal = None  # SignalJournal اختياري
     
-    def send_message(self, text: str):
+    def send_message(self, text: str) -> bool:
         """إرسال رسالة نصية"""
         try:
-            requests.post(
+            response = self.session.post(
                 f"{self.api_url}/sendMessage",
                 json={"chat_id": self.chat_id, "text": text, "parse_mode": "HTML"}
             )
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"❌ Telegram error: {e}")
+            return False
     
     def send_signal_alert(self, symbol: str, score: int, current_price: float, 
                          entry_price: float, tp1: float, tp2: float, tp3: float, sl: float):
@@ -477,7 +584,12 @@ class TelegramNotifier:
 ✅ استراتيجية: V6 Enhanced
 ⏰ الوقت: {datetime.now().strftime('%H:%M:%S UTC')}
 """
-        self.send_message(message)
+        if self.send_message(message) and self.journal:
+            self.journal.record(
+                symbol, 'BUY', entry_price, tp1, tp2, sl,
+                strategy=strength_text, score=score,
+                instrument=f"{symbol}/USDT", meta={'tp3': tp3}
+            )
     
     def send_market_report(self, metrics: Dict, trending: List[Dict]):
         """إرسال تقرير السوق كل 4 ساعات"""
@@ -539,13 +651,25 @@ class CryptoKillerV7:
         self.metrics_analyzer = MarketMetricsAnalyzer(self.exchange)
         self.trending_detector = TrendingCoinsDetector(self.exchange)
         
-        # Tracking
-        self.last_signal_time = {}
-        self.signal_count_today = {}
-        self.signal_total_today = 0
-        self.daily_reset_time = None
+        # Tracking: cooldown + daily limits (per symbol and total)
+        self.signal_gate = SignalGate(
+            Config.COOLDOWN_HOURS,
+            max_per_day=Config.MAX_SIGNALS_TOTAL_DAY,
+            max_per_key_per_day=Config.MAX_SIGNALS_PER_DAY
+        )
         self.last_report_time = None
         
+        # 💾 استرجاع الـ Cooldown ووقت آخر تقرير (لا إعادة إرسال بعد إعادة التشغيل)
+        self.state_store = StateStore(Config.STATE_FILE, Config.STATE_CHECKPOINT_INTERVAL)
+        self._restore_state(self.state_store.load())
+        
+        # 📒 سجل الإشارات وتتبع نتائجها
+        self.telegram.journal = SignalJournal(
+            Config.JOURNAL_DB, 'v7',
+            candle_fetcher=ccxt_candle_fetcher(self.exchange_instance),
+            default_max_hours=Config.JOURNAL_MAX_HOURS
+        )
+        
         logger.info("✅ Bot initialized successfully")
     
     def _wrap_exchange(self, ex):
@@ -553,8 +677,20 @@ class CryptoKillerV7:
         class ExchangeWrapper:
             def __init__(self, exchange):
                 self.ex = exchange
+                # المقيّم وتقرير السوق والعملات الصاعدة يطلبون نفس الشموع في نفس الدورة
+                self.klines = KlineCache(Config.KLINE_CACHE_TTL, Config.KLINE_CACHE_MAX_ENTRIES)
             
             def get_ohlcv(self, symbol: str, timeframe: str, limit: int):
+                fetch_limit = max(limit, Config.KLINE_FETCH_LIMIT)
+                df = self.klines.get_or_fetch(
+                    (symbol, timeframe, fetch_limit),
+                    lambda: self._fetch_ohlcv(symbol, timeframe, fetch_limit)
+                )
+                if df is None:
+                    return None
+                return df.tail(limit).reset_index(drop=True)
+            
+            def _fetch_ohlcv(self, symbol: str, timeframe: str, limit: int):
                 try:
                     data = self.ex.fetch_ohlcv(symbol, timeframe, limit=limit)
                     if data is None or len(data) == 0:
@@ -575,33 +711,78 @@ class CryptoKillerV7:
     def run(self):
         """حلقة البوت الرئيسية"""
         logger.info("🔄 Bot started. Scanning for signals...")
+        self.state_store.start(self._snapshot_state)
+        self.telegram.journal.start()
         
-        while True:
-            try:
-                # تقرير السوق كل 4 ساعات
-                if self._should_send_report():
-                    metrics = self.metrics_analyzer.get_market_metrics()
-                    trending = self.trending_detector.find_trending()
-                    self.telegram.send_market_report(metrics, trending)
-                    self.last_report_time = datetime.now()
-                
-                # مسح الإشارات
-                for symbol in Config.FIXED_WATCHLIST:
-                    try:
-                        signal_data = self.evaluator.calculate_signal_strength(f"{symbol}/USDT")
-                        if signal_data and signal_data['score'] >= 60:
-                            self._process_signal(symbol, signal_data)
-                    except Exception as e:
-                        logger.debug(f"Error scanning {symbol}: {e}")
+        try:
+            while True:
+                try:
+                    # لقطة الدورة: كل الشموع بالتوازي مرة واحدة
+                    pairs = [f"{s}/USDT" for s in Config.FIXED_WATCHLIST]
+                    context = self._build_context(pairs)
+                    
+                    # تقرير السوق كل 4 ساعات
+                    if self._should_send_report():
+                        metrics = self.metrics_analyzer.get_market_metrics(context)
+                        trending = self.trending_detector.find_trending(context)
+                        self.telegram.send_market_report(metrics, trending)
+                        self.last_report_time = datetime.now()
+                    
+                    # فلتر حالة السوق: هبوط BTC يستبعد العملات المرتبطة به قبل التحليل
+                    scan = context.scan_pairs(pairs)
+                    if len(scan) < len(pairs):
+                        logger.info(f"🛑 BTC risk-off ({context.cross_asset().btc_change_pct:+.1f}%): "
+                                    f"{len(pairs) - len(scan)}/{len(pairs)} pairs skipped")
+                    
+                    # مسح الإشارات (المؤشرات لكل القائمة دفعة واحدة)
+                    results = self.evaluator.evaluate_batch(scan, context)
+                    for symbol in Config.FIXED_WATCHLIST:
+                        try:
+                            signal_data = results.get(f"{symbol}/USDT")
+                            if signal_data and signal_data['score'] >= 60:
+                                self._process_signal(symbol, signal_data)
+                        except Exception as e:
+                            logger.debug(f"Error scanning {symbol}: {e}")
+                    
+                    time.sleep(Config.SCAN_INTERVAL)
                 
-                time.sleep(Config.SCAN_INTERVAL)
-            
-            except Exception as e:
-                logger.error(f"❌ Bot loop error: {e}")
-                time.sleep(60)
+                except Exception as e:
+                    logger.error(f"❌ Bot loop error: {e}")
+                    time.sleep(60)
+        finally:
+            self.state_store.stop()
+            self.telegram.journal.stop()
+    
+    def _build_context(self, pairs: List[str]) -> MarketContext:
+        """جلب شموع القائمة + BTC/ETH بالتوازي (MAX_WORKERS)"""
+        started = time.monotonic()
+        context = MarketContext.fetch(self.exchange, pairs + ['BTC/USDT', 'ETH/USDT'], Config.MAX_WORKERS)
+        missing = [s for s, df in context.frames.items() if df is None]
+        logger.debug(f"📦 Market context: {len(context.frames)} symbols in {time.monotonic() - started:.1f}s"
+                     + (f" (missing: {', '.join(missing)})" if missing else ""))
+        return context
+    
+    def _snapshot_state(self) -> Dict:
+        """لقطة الحالة للحفظ الدوري"""
+        return {
+            'signal_gate': self.signal_gate.to_state(),
+            'last_report_time': self.last_report_time
+        }
+    
+    def _restore_state(self, state: Dict):
+        """استرجاع الحالة من آخر لقطة"""
+        if not state:
+            return
+        self.signal_gate.restore_state(state.get('signal_gate', {}))
+        self.last_report_time = state.get('last_report_time')
     
     def _process_signal(self, symbol: str, signal_data: Dict):
         """معالجة الإشارة"""
+        reason = self.signal_gate.blocked_reason(symbol)
+        if reason:
+            logger.debug(f"⏭️ {symbol}: Skipped ({reason})")
+            return
+        
         score = signal_data['score']
         current_price = signal_data['current_price']
         
@@ -630,7 +811,8 @@ class CryptoKillerV7:
             symbol, score, current_price, entry_price, tp1, tp2, tp3, sl
         )
         
-        logger.info(f"✅ Signal sent for {symbol} (Score: {score})")
+        self.signal_gate.record(symbol)
+        logger.info(f"✅ Signal sent for {symbol} (Score: {score}, today: {self.signal_gate.today_count})")
     
     def _should_send_report(self) -> bool:
         """هل حان وقت تقرير السوق؟"""
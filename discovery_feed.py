@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📡 Discovery Feed
+تغذية مستمرة للأزواج الجديدة بدل البحث بالكلمات كل دقيقة
+
+- مصادر اكتشاف (PollingSource): أي دالة async تعيد قائمة أزواج، لكل منها فترة استطلاع
+- مرشح Bloom دوّار لإسقاط الأزواج المكررة بتكلفة ثابتة من الذاكرة
+- طابور async محدود الحجم تستهلكه عمال التحليل
+"""
+
+import math
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+# ============================================================================
+# مرشح Bloom
+# ============================================================================
+
+class BloomFilter:
+    """مرشح Bloom بسيط (bytearray + double hashing)"""
+
+    def __init__(self, capacity: int = 50_000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """إضافة عنصر - يعيد True إذا كان جديداً"""
+        new = False
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not self.bits[p >> 3] & mask:
+                self.bits[p >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+
+class RotatingBloomFilter:
+    """جيلان من Bloom: العنصر يُعتبر مكرراً خلال نافذة زمنية ثم يمكن رؤيته مجدداً"""
+
+    def __init__(self, window_seconds: float = 900, capacity: int = 50_000, error_rate: float = 0.001):
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous: Optional[BloomFilter] = None
+        self._rotated_at = time.monotonic()
+
+    def _maybe_rotate(self):
+        if (time.monotonic() - self._rotated_at >= self.window_seconds
+                or self._current.count >= self.capacity):
+            self._previous = self._current
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._rotated_at = time.monotonic()
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._current or (self._previous is not None and item in self._previous)
+
+    def add(self, item: str) -> bool:
+        """إضافة عنصر - يعيد True إذا لم يُرَ خلال النافذة"""
+        self._maybe_rotate()
+        if self._previous is not None and item in self._previous:
+            self._current.add(item)
+            return False
+        return self._current.add(item)
+
+
+# ============================================================================
+# المصادر والتغذية
+# ============================================================================
+
+class PollingSource:
+    """مصدر اكتشاف يُستطلع كل interval ثانية"""
+
+    def __init__(self, name: str, fetch: Callable[[], Awaitable[List[Dict]]], interval: float):
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+
+
+class DiscoveryFeed:
+    """يدفع الأزواج الجديدة (غير المكررة) إلى طابور محدود"""
+
+    def __init__(self, sources: List[PollingSource], queue_size: int = 500,
+                 seen_window_seconds: float = 900, key: str = 'pairAddress'):
+        self.sources = sources
+        self.key = key
+        self.queue: 'asyncio.Queue[Dict]' = asyncio.Queue(maxsize=queue_size)
+        self.seen = RotatingBloomFilter(seen_window_seconds)
+        self.stats: Dict[str, int] = {'polled': 0, 'queued': 0, 'duplicates': 0, 'dropped': 0}
+
+    def push(self, items: List[Dict]) -> int:
+        """إضافة أزواج للطابور - يعيد عدد الجديد منها"""
+        queued = 0
+        for item in items:
+            self.stats['polled'] += 1
+            key = item.get(self.key)
+            if not key or key in self.seen:
+                if key:
+                    self.seen.add(key)   # مكرر من الجيل السابق يبقى ضمن النافذة
+                self.stats['duplicates'] += 1
+                continue
+            try:
+                self.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # الطابور ممتلئ: العمال متأخرون - نسقط بدل إيقاف الاستطلاع (بدون تعليمه كمرئي)
+                self.stats['dropped'] += 1
+                continue
+            self.seen.add(key)
+            queued += 1
+        self.stats['queued'] += queued
+        return queued
+
+    async def _poll_source(self, source: PollingSource):
+        while True:
+            started = time.monotonic()
+            try:
+                queued = self.push(await source.fetch() or [])
+                if queued:
+                    logging.info(f"📡 {source.name}: {queued} new pairs queued")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"⚠️ Discovery source '{source.name}' failed: {e}")
+            await asyncio.sleep(max(0.0, source.interval - (time.monotonic() - started)))
+
+    async def run(self):
+        """استطلاع كل المصادر بالتوازي (حتى الإلغاء)"""
+        await asyncio.gather(*(self._poll_source(source) for source in self.sources))
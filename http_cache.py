@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🗄️ HTTP Response Cache
+كاش لاستجابات JSON فوق aiohttp
+
+- خلال TTL: الاستجابة من الذاكرة بدون أي طلب
+- بعد TTL: طلب شرطي (If-None-Match / If-Modified-Since) - 304 يعيد نفس البيانات
+- LRU بحد أقصى للمدخلات
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+
+@dataclass
+class _Entry:
+    data: Any
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ResponseCache:
+    """كاش استجابات GET (JSON) مع TTL وطلبات شرطية"""
+
+    def __init__(self, ttl: float = 30, max_entries: int = 512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple, _Entry]' = OrderedDict()
+        self.stats: Dict[str, int] = {'hits': 0, 'revalidated': 0, 'fetched': 0}
+
+    @staticmethod
+    def _key(url: str, params: Optional[Dict]) -> Tuple:
+        return url, tuple(sorted((params or {}).items()))
+
+    async def get_json(self, session: aiohttp.ClientSession, url: str,
+                       params: Optional[Dict] = None, ttl: Optional[float] = None) -> Optional[Any]:
+        """GET مع الكاش - يعيد JSON أو None عند فشل الطلب"""
+        ttl = self.ttl if ttl is None else ttl
+        key = self._key(url, params)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now - entry.fetched_at < ttl:
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry.data
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        async with session.get(url, params=params, headers=headers) as response:
+            if response.status == 304 and entry is not None:
+                entry.fetched_at = now
+                self._entries.move_to_end(key)
+                self.stats['revalidated'] += 1
+                return entry.data
+            if response.status != 200:
+                logging.debug(f"HTTP {response.status} for {url}")
+                return None
+            data = await response.json(content_type=None)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+
+        self._entries[key] = _Entry(data, now, etag, last_modified)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.stats['fetched'] += 1
+        return data
+
+    def invalidate(self, url: str, params: Optional[Dict] = None):
+        self._entries.pop(self._key(url, params), None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
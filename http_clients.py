@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🔌 Shared HTTP Clients
+مصنع اتصالات HTTP مشترك لكل البوتات
+
+- requests: جلسة واحدة للعملية مع مجمع اتصالات لكل مضيف (keep-alive)
+  بدل requests.post المباشر الذي يفتح اتصال TLS جديد كل مرة
+- aiohttp: ClientSession بحدود لكل مضيف و keep-alive
+- المهلة الافتراضية و verify_ssl من SecurityConfig
+- مقاييس تشبع المجمع لكل مضيف (pool_stats)
+"""
+
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from trading_config_advanced import SecurityConfig
+
+_SECURITY = SecurityConfig()
+
+# أحجام المجمعات (تكفي لأعلى تزامن مستخدم: MAX_CONCURRENT / MAX_WORKERS = 10)
+POOL_HOSTS = 16          # عدد المضيفين المحتفظ بمجمعاتهم
+POOL_MAXSIZE = 16        # اتصالات محفوظة لكل مضيف
+KEEPALIVE_SECONDS = 30   # aiohttp: إبقاء الاتصال الخامل مفتوحاً
+
+
+# ============================================================================
+# مقاييس المجمع
+# ============================================================================
+
+class PoolMetrics:
+    """عدادات لكل مضيف: الطلبات، الجارية، الذروة، مرات التشبع، الاتصالات الجديدة"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, int]] = {}
+
+    def _host(self, host: str) -> Dict[str, int]:
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = self._hosts[host] = {
+                'requests': 0, 'in_flight': 0, 'peak': 0,
+                'saturated': 0, 'new_connections': 0, 'reused': 0
+            }
+        return stats
+
+    def request_started(self, host: str, capacity: int):
+        with self._lock:
+            stats = self._host(host)
+            stats['requests'] += 1
+            if stats['in_flight'] >= capacity:
+                stats['saturated'] += 1
+            stats['in_flight'] += 1
+            stats['peak'] = max(stats['peak'], stats['in_flight'])
+
+    def request_finished(self, host: str):
+        with self._lock:
+            self._host(host)['in_flight'] -= 1
+
+    def count(self, host: str, key: str, value: int = 1):
+        with self._lock:
+            self._host(host)[key] += value
+
+    def set(self, host: str, key: str, value: int):
+        with self._lock:
+            self._host(host)[key] = value
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {host: dict(stats) for host, stats in self._hosts.items()}
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+metrics = PoolMetrics()
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """لقطة مقاييس كل المضيفين (requests + aiohttp)"""
+    return metrics.snapshot()
+
+
+# ============================================================================
+# requests (متزامن)
+# ============================================================================
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter يسجل الطلبات الجارية لكل مضيف مقابل حجم المجمع"""
+
+    def __init__(self, pool_connections: int = POOL_HOSTS, pool_maxsize: int = POOL_MAXSIZE, **kwargs):
+        self._maxsize = pool_maxsize
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, **kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        metrics.request_started(parts.netloc, self._maxsize)
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            metrics.request_finished(parts.netloc)
+            metrics.set(parts.netloc, 'new_connections', self._connections_opened(parts))
+
+    def _connections_opened(self, parts) -> int:
+        """عدد الاتصالات التي فتحها urllib3 لهذا المضيف (كل اتصال = TCP/TLS handshake)"""
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        pools = self.poolmanager.pools
+        total = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None and pool.host == parts.hostname and pool.port == port:
+                total += pool.num_connections
+        return total
+
+
+class _DefaultTimeoutSession(requests.Session):
+    """Session بمهلة افتراضية (requests لا تملك مهلة افتراضية)"""
+
+    def __init__(self, timeout: float):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_maxsize: int = POOL_MAXSIZE,
+                   timeout: Optional[float] = None) -> requests.Session:
+    """Session جديدة بمجمع اتصالات لكل مضيف و keep-alive"""
+    session = _DefaultTimeoutSession(timeout or _SECURITY.timeout_seconds)
+    session.verify = _SECURITY.verify_ssl
+    adapter = PooledAdapter(pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """الجلسة المشتركة للعملية (آمنة للاستخدام من عدة threads)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+# ============================================================================
+# aiohttp (غير متزامن)
+# ============================================================================
+
+def create_async_session(limit_per_host: int = 10, limit: int = 100,
+                         timeout: Optional[float] = None, headers: Optional[Dict] = None):
+    """aiohttp ClientSession بحدود لكل مضيف و keep-alive ومقاييس تشبع"""
+    import aiohttp
+
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        ctx.host = params.url.host
+        metrics.request_started(ctx.host, limit_per_host)
+
+    async def on_request_end(session, ctx, params):
+        metrics.request_finished(ctx.host)
+
+    async def on_connection_create_end(session, ctx, params):
+        metrics.count(ctx.host, 'new_connections')
+
+    async def on_connection_reuseconn(session, ctx, params):
+        metrics.count(ctx.host, 'reused')
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_end)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_reuseconn.append(on_connection_reuseconn)
+
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=KEEPALIVE_SECONDS,
+        ttl_dns_cache=300,
+        **({} if _SECURITY.verify_ssl else {'ssl': False})
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=headers,
+        timeout=aiohttp.ClientTimeout(total=timeout or _SECURITY.timeout_seconds),
+        trace_configs=[trace]
+    )
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧊 Kline Cache
+كاش الشموع (LRU + TTL) مع دمج الطلبات المتزامنة (single-flight)
+
+- SingleFlight: عدة threads تطلب نفس المفتاح في نفس اللحظة → طلب شبكة واحد،
+  والباقي ينتظرون نتيجته (أو استثناءه)
+- KlineCache: قاموس مرتب محمي بقفل، بحد أقصى للمدخلات (الأقدم استخداماً يُحذف أولاً)
+  وصلاحية TTL لكل مدخل؛ get_or_fetch يمر عبر SingleFlight عند عدم وجود المفتاح
+- أوقات الانتهاء بتوقيت الساعة (time.time) لتبقى صالحة في لقطات StateStore
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """تنفيذ fn مرة واحدة لكل مفتاح قيد التنفيذ"""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'shared': 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+                self.stats['calls'] += 1
+            else:
+                self.stats['shared'] += 1
+
+        if not leader:
+            return flight.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+
+class KlineCache:
+    """كاش LRU + TTL آمن للـ threads"""
+
+    def __init__(self, ttl: float = 300, max_entries: int = 512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'fetches': 0, 'shared': 0, 'evictions': 0}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """القيمة إذا كانت صالحة (None إذا غير موجودة أو منتهية)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() >= entry[0]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def to_state(self) -> Dict:
+        """المدخلات الصالحة للحفظ (StateStore)"""
+        with self._lock:
+            now = time.time()
+            return {key: entry for key, entry in self._entries.items() if entry[0] > now}
+
+    def restore_state(self, state: Dict):
+        now = time.time()
+        for key, (expires_at, value) in (state or {}).items():
+            if expires_at > now:
+                with self._lock:
+                    self._entries[key] = (expires_at, value)
+        with self._lock:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """من الكاش، أو جلب واحد مشترك بين كل الطالبين المتزامنين (None لا يُخزّن)"""
+        value = self.get(key)
+        self._count('hits' if value is not None else 'misses')
+        if value is not None:
+            return value
+
+        def _fetch():
+            # طالب سابق ربما أكمل الجلب بين فحص الكاش وبدء الرحلة
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            self._count('fetches')
+            result = fetch()
+            if result is not None:
+                self.put(key, result, ttl)
+            return result
+
+        result = self._flight.do(key, _fetch)
+        with self._lock:
+            self.stats['shared'] = self._flight.stats['shared']
+        return result
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
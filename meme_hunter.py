@@ -18,12 +18,23 @@ import asyncio
 import json
 import logging
 import time
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-import requests
+import aiohttp
 from dataclasses import dataclass, field
 import re
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict, fields
+import numpy as np
+
+from state_store import StateStore
+from signal_journal import SignalJournal
+from http_cache import ResponseCache
+from http_clients import create_async_session, pool_stats
+from discovery_feed import DiscoveryFeed, PollingSource, RotatingBloomFilter
+from onchain_providers import ProviderRegistry, create_rpc_registry
+from signal_gate import SignalGate
+from trading_config_advanced import SecurityConfig
 
 # ==================== CONFIGURATION ====================
 
@@ -73,17 +84,59 @@ class MemeHunterConfig:
     # Timing
     MAX_HOLD_HOURS: int = 12  # Maximum 12 hours hold
     SCAN_INTERVAL_SECONDS: int = 60  # Scan every 60 seconds
+    
+    # Discovery Feed (new pairs pushed to a queue, analyzed by workers)
+    DISCOVERY_POLL_SECONDS: int = 5  # Latest profiles / boosts poll
+    DISCOVERY_QUEUE_SIZE: int = 500
+    DISCOVERY_SEEN_WINDOW_MINUTES: int = 15  # A pair is re-queued after this window
+    
+    # Multi-chain lanes (TARGET_CHAIN + BACKUP_CHAINS, each with its own queue / workers / limit)
+    CHAIN_QUEUE_SIZE: int = 200
+    CHAIN_WORKERS: int = 3  # Analysis workers per chain
+    CHAIN_MAX_CONCURRENT: int = 5  # Analyses in flight per chain (a slow chain can't starve others)
     COOLDOWN_HOURS: int = 4  # 4h cooldown per token
     MAX_SIGNALS_PER_DAY: int = 5  # Max 5 signals per day
     
+    # Async HTTP (shared aiohttp session)
+    HTTP_TIMEOUT_SECONDS: int = SecurityConfig.timeout_seconds
+    MAX_CONCURRENT_ANALYSES: int = 10  # Tokens analyzed at the same time
+    
+    # Caching (HTTP responses + per-pair deep analysis)
+    SEARCH_CACHE_TTL_SECONDS: int = 30  # After TTL: conditional request (ETag)
+    PAIR_DETAILS_CACHE_TTL_SECONDS: int = 15
+    ANALYSIS_CACHE_TTL_SECONDS: int = 900  # Reuse social/liquidity/holder/security checks
+    ANALYSIS_REFRESH_PRICE_PCT: float = 5.0  # Re-analyze if price moved 5%+
+    ANALYSIS_REFRESH_VOLUME_PCT: float = 25.0
+    ANALYSIS_REFRESH_LIQUIDITY_PCT: float = 10.0
+    
+    # On-chain data providers (chain → JSON-RPC URL; chains without one use simulated checks)
+    ONCHAIN_RPC_ENDPOINTS: Dict[str, str] = field(default_factory=dict)
+    ONCHAIN_BATCH_SIZE: int = 100  # Token addresses per RPC call
+    ONCHAIN_BATCH_WINDOW_MS: int = 20  # Wait this long to group concurrent lookups
+    ONCHAIN_TIMEOUT_SECONDS: float = 3.0  # Slow explorer → fallback, never blocks the scan
+    ONCHAIN_CACHE_TTL_SECONDS: int = 300
+    
+    # State Snapshot
+    STATE_FILE: str = "meme_hunter_state.pkl"
+    STATE_CHECKPOINT_INTERVAL: int = 60
+    
+    # Signal Journal (outcome tracking)
+    JOURNAL_DB: str = "signal_journal.db"
+    
     # API Endpoints
     DEXSCREENER_API: str = "https://api.dexscreener.com/latest/dex"
+    DEXSCREENER_PROFILES_API: str = "https://api.dexscreener.com/token-profiles/latest/v1"
+    DEXSCREENER_BOOSTS_API: str = "https://api.dexscreener.com/token-boosts/latest/v1"
     COINGECKO_API: str = "https://api.coingecko.com/api/v3"
     SOLSCAN_API: str = "https://api.solscan.io"
     
     # Blacklist (known scams) - using field with default_factory
     BLACKLIST_TOKENS: List[str] = field(default_factory=list)
     BLACKLIST_CREATORS: List[str] = field(default_factory=list)
+    
+    def scan_chains(self) -> Tuple[str, ...]:
+        """كل الشبكات الممسوحة: المستهدفة أولاً ثم الاحتياطية (بدون تكرار)"""
+        return tuple(dict.fromkeys((self.TARGET_CHAIN,) + tuple(self.BACKUP_CHAINS)))
 
 
 # ==================== LOGGING SETUP ====================
@@ -101,6 +154,17 @@ logger = logging.getLogger('MemeHunter')
 
 # ==================== DATA MODELS ====================
 
+def _slotted(cls):
+    """مثل dataclass(slots=True) في Python 3.10+: إعادة بناء الكلاس بـ __slots__ بدل __dict__"""
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    for key in names + ('__dict__', '__weakref__'):
+        namespace.pop(key, None)
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slotted
 @dataclass
 class TokenData:
     """بيانات العملة الشاملة"""
@@ -153,6 +217,7 @@ class TokenData:
     detected_at: datetime
 
 
+@_slotted
 @dataclass
 class MemeSignal:
     """إشارة دخول لعملة ميم"""
@@ -168,45 +233,60 @@ class MemeSignal:
 
 # ==================== DEX SCANNER ====================
 
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+def create_http_session(config: MemeHunterConfig) -> aiohttp.ClientSession:
+    """جلسة aiohttp واحدة مشتركة بين الماسح والمحللات و Telegram"""
+    return create_async_session(
+        limit_per_host=config.MAX_CONCURRENT_ANALYSES,
+        timeout=config.HTTP_TIMEOUT_SECONDS,
+        headers=HTTP_HEADERS
+    )
+
+
 class DexScreenerScanner:
     """ماسح DexScreener للعملات الرائجة"""
     
+    SEARCH_TERMS = ('pump', 'moon', 'doge', 'pepe', 'shib', 'elon', 'floki')
+    
     def __init__(self, config: MemeHunterConfig):
         self.config = config
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.session: Optional[aiohttp.ClientSession] = None  # Set by MemeHunter.run
+        self.cache = ResponseCache(ttl=config.SEARCH_CACHE_TTL_SECONDS)
+        self.chains = config.scan_chains()
+        # Tokens already resolved to pairs (profiles feed repeats the same tokens)
+        self._seen_tokens = RotatingBloomFilter(config.DISCOVERY_SEEN_WINDOW_MINUTES * 60)
     
-    def search_trending_tokens(self) -> List[Dict]:
-        """البحث عن العملات الرائجة"""
+    async def _search(self, search_term: str) -> List[Dict]:
+        """بحث واحد - أفضل 5 أزواج لكل شبكة ممسوحة (البحث يغطي كل الشبكات بطلب واحد)"""
         try:
-            # Method 1: Search by chain and sort by volume
             url = f"{self.config.DEXSCREENER_API}/search"
+            data = await self.cache.get_json(self.session, url, {'q': search_term})
+            if data is None:
+                return []
+            
+            # Filter by chain - top 5 per search per chain
+            per_chain: Dict[str, int] = {}
+            chain_pairs = []
+            for p in data.get('pairs') or []:
+                chain = p.get('chainId')
+                if chain in self.chains and per_chain.get(chain, 0) < 5:
+                    per_chain[chain] = per_chain.get(chain, 0) + 1
+                    chain_pairs.append(p)
+            return chain_pairs
             
-            all_tokens = []
-            
-            # Search for high volume tokens
-            for search_term in ['pump', 'moon', 'doge', 'pepe', 'shib', 'elon', 'floki']:
-                try:
-                    params = {'q': search_term}
-                    response = self.session.get(url, params=params, timeout=10)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if 'pairs' in data and data['pairs']:
-                            # Filter by chain
-                            chain_pairs = [
-                                p for p in data['pairs']
-                                if p.get('chainId') == self.config.TARGET_CHAIN
-                            ]
-                            all_tokens.extend(chain_pairs[:5])  # Top 5 per search
-                    
-                    time.sleep(0.5)  # Rate limiting
-                    
-                except Exception as e:
-                    logger.warning(f"Search term '{search_term}' failed: {e}")
-                    continue
+        except Exception as e:
+            logger.warning(f"Search term '{search_term}' failed: {e}")
+            return []
+    
+    async def search_trending_tokens(self) -> List[Dict]:
+        """البحث عن العملات الرائجة (كل كلمات البحث بالتوازي)"""
+        try:
+            results = await asyncio.gather(*(self._search(term) for term in self.SEARCH_TERMS))
+            all_tokens = [pair for pairs in results for pair in pairs]
             
             # Remove duplicates by pair address
             unique_tokens = {}
@@ -222,16 +302,78 @@ class DexScreenerScanner:
             logger.error(f"❌ DexScreener trending scan failed: {e}")
             return []
     
-    def get_token_details(self, pair_address: str) -> Optional[Dict]:
-        """الحصول على تفاصيل العملة"""
+    async def discover_new_pairs(self) -> List[Dict]:
+        """أحدث ملفات العملات + المعززة - تحويل العملات الجديدة إلى أزواجها"""
         try:
-            url = f"{self.config.DEXSCREENER_API}/pairs/{self.config.TARGET_CHAIN}/{pair_address}"
-            response = self.session.get(url, timeout=10)
+            feeds = await asyncio.gather(
+                self.cache.get_json(self.session, self.config.DEXSCREENER_PROFILES_API, ttl=0),
+                self.cache.get_json(self.session, self.config.DEXSCREENER_BOOSTS_API, ttl=0),
+                return_exceptions=True
+            )
             
-            if response.status_code == 200:
-                data = response.json()
-                if 'pair' in data:
-                    return data['pair']
+            new_tokens: Dict[str, Dict[str, None]] = {}   # chain -> عناوين بالترتيب بدون تكرار
+            for feed in feeds:
+                if not isinstance(feed, list):
+                    continue
+                for item in feed:
+                    chain = item.get('chainId')
+                    address = item.get('tokenAddress')
+                    # تُعلَّم كمرئية فقط بعد وصول زوجها (فشل الطلب أو زوج لم يُنشأ بعد → المحاولة في الدورة التالية)
+                    if (chain in self.chains and address
+                            and f"{chain}:{address}" not in self._seen_tokens):
+                        new_tokens.setdefault(chain, {})[address] = None
+            
+            if not new_tokens:
+                return []
+            
+            # DexScreener accepts up to 30 token addresses per request
+            batches = []
+            for chain, addresses in new_tokens.items():
+                addresses = list(addresses)
+                batches.extend((chain, addresses[i:i + 30]) for i in range(0, len(addresses), 30))
+            results = await asyncio.gather(*(self._pairs_for_tokens(b, chain) for chain, b in batches),
+                                           return_exceptions=True)
+            
+            new_pairs = []
+            for (chain, batch), pairs in zip(batches, results):
+                if isinstance(pairs, BaseException):
+                    logger.warning(f"⚠️ DexScreener token lookup failed ({chain}, {len(batch)} tokens): {pairs}")
+                    continue
+                for pair in pairs:
+                    self._seen_tokens.add(f"{chain}:{pair['baseToken']['address']}")
+                    new_pairs.append(pair)
+            return new_pairs
+            
+        except Exception as e:
+            logger.error(f"❌ DexScreener discovery failed: {e}")
+            return []
+    
+    async def _pairs_for_tokens(self, addresses: List[str], chain: str) -> List[Dict]:
+        """الزوج الأعلى سيولة لكل عملة على الشبكة المحددة"""
+        url = f"{self.config.DEXSCREENER_API}/tokens/{','.join(addresses)}"
+        async with self.session.get(url) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+        
+        best: Dict[str, Dict] = {}
+        for pair in data.get('pairs') or []:
+            if pair.get('chainId') != chain:
+                continue
+            address = pair.get('baseToken', {}).get('address')
+            liquidity = float((pair.get('liquidity') or {}).get('usd') or 0)
+            current = best.get(address)
+            if current is None or liquidity > float((current.get('liquidity') or {}).get('usd') or 0):
+                best[address] = pair
+        return list(best.values())
+    
+    async def get_token_details(self, pair_address: str, chain: Optional[str] = None) -> Optional[Dict]:
+        """الحصول على تفاصيل العملة (الشبكة الافتراضية: TARGET_CHAIN)"""
+        try:
+            url = f"{self.config.DEXSCREENER_API}/pairs/{chain or self.config.TARGET_CHAIN}/{pair_address}"
+            data = await self.cache.get_json(self.session, url,
+                                             ttl=self.config.PAIR_DETAILS_CACHE_TTL_SECONDS)
+            if data and 'pair' in data:
+                return data['pair']
             
             return None
             
@@ -240,6 +382,131 @@ class DexScreenerScanner:
             return None
 
 
+# ==================== PAIR ANALYSIS CACHE ====================
+
+class PairAnalysisCache:
+    """كاش التحليل العميق لكل زوج (pairAddress) بين دورات المسح"""
+    
+    def __init__(self, config: MemeHunterConfig):
+        self.config = config
+        self.thresholds = {
+            'price': config.ANALYSIS_REFRESH_PRICE_PCT,
+            'volume': config.ANALYSIS_REFRESH_VOLUME_PCT,
+            'liquidity': config.ANALYSIS_REFRESH_LIQUIDITY_PCT
+        }
+        # pair_address -> (analyzed_at, snapshot, analysis)
+        self._entries: Dict[str, Tuple[float, Dict[str, float], Dict]] = {}
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def _moved(self, old: Dict[str, float], new: Dict[str, float]) -> bool:
+        """هل تحرك السعر / الحجم / السيولة أكثر من الحد منذ آخر تحليل؟"""
+        for key, pct in self.thresholds.items():
+            before, now = old.get(key, 0.0), new.get(key, 0.0)
+            if before == 0:
+                if now != 0:
+                    return True
+            elif abs(now - before) / abs(before) * 100 >= pct:
+                return True
+        return False
+    
+    def get(self, pair_address: str, snapshot: Dict[str, float]) -> Optional[Dict]:
+        entry = self._entries.get(pair_address)
+        if (entry is None
+                or time.time() - entry[0] > self.config.ANALYSIS_CACHE_TTL_SECONDS
+                or self._moved(entry[1], snapshot)):
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return entry[2]
+    
+    def put(self, pair_address: str, snapshot: Dict[str, float], analysis: Dict):
+        self._entries[pair_address] = (time.time(), snapshot, analysis)
+    
+    def prune(self):
+        """حذف التحليلات المنتهية"""
+        cutoff = time.time() - self.config.ANALYSIS_CACHE_TTL_SECONDS
+        for pair_address in [p for p, e in self._entries.items() if e[0] < cutoff]:
+            del self._entries[pair_address]
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+# ==================== STAGED FILTER STATS ====================
+
+class FilterStats:
+    """عدادات الفلترة المرحلية: كم مرشح دخل كل مرحلة وسبب كل رفض"""
+    
+    # مرتبة حسب التكلفة
+    STAGES = ('cheap', 'cached', 'network')
+    
+    def __init__(self):
+        self.entered: Dict[str, int] = {stage: 0 for stage in self.STAGES}
+        self.rejected: Dict[str, Dict[str, int]] = {stage: {} for stage in self.STAGES}
+    
+    def enter(self, stage: str):
+        self.entered[stage] += 1
+    
+    def reject(self, stage: str, reason: str):
+        counters = self.rejected[stage]
+        counters[reason] = counters.get(reason, 0) + 1
+    
+    def summary(self) -> str:
+        parts = []
+        for stage in self.STAGES:
+            rejected = sum(self.rejected[stage].values())
+            parts.append(f"{stage} {self.entered[stage]}→{self.entered[stage] - rejected} {self.rejected[stage]}")
+        return " | ".join(parts)
+
+
+# ==================== CHAIN LANES ====================
+
+class ChainLane:
+    """مسار شبكة واحدة: طابور وعمال وحد تزامن مستقل + مقاييس الكمون والعائد"""
+    
+    def __init__(self, chain: str, queue_size: int, max_concurrent: int):
+        self.chain = chain
+        self.queue_size = queue_size
+        self.max_concurrent = max_concurrent
+        # asyncio primitives are created inside the running loop (start)
+        self.queue: Optional[asyncio.Queue] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.stats = {'queued': 0, 'dropped': 0, 'analyzed': 0, 'passed': 0}
+        self._latencies: deque = deque(maxlen=500)  # seconds from queue to result
+    
+    def start(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.queue_size)
+            self.semaphore = asyncio.Semaphore(self.max_concurrent)
+    
+    def push(self, pair_data: Dict) -> bool:
+        """إضافة زوج لطابور الشبكة - الطابور الممتلئ يسقط بدل إبطاء باقي الشبكات"""
+        try:
+            self.queue.put_nowait((time.monotonic(), pair_data))
+        except asyncio.QueueFull:
+            self.stats['dropped'] += 1
+            return False
+        self.stats['queued'] += 1
+        return True
+    
+    def record(self, enqueued_at: List[float], results: List[Optional['TokenData']]):
+        now = time.monotonic()
+        self._latencies.extend(now - t for t in enqueued_at)
+        self.stats['analyzed'] += len(results)
+        self.stats['passed'] += sum(1 for r in results if r is not None)
+    
+    def summary(self) -> Dict:
+        latencies = sorted(self._latencies)
+        analyzed = self.stats['analyzed']
+        return dict(
+            self.stats,
+            backlog=self.queue.qsize() if self.queue else 0,
+            yield_pct=round(self.stats['passed'] / analyzed * 100, 1) if analyzed else 0.0,
+            latency_ms_avg=round(sum(latencies) / len(latencies) * 1000) if latencies else 0,
+            latency_ms_p95=round(latencies[int(0.95 * (len(latencies) - 1))] * 1000) if latencies else 0
+        )
+
+
 # ==================== SOCIAL ANALYZER ====================
 
 class SocialAnalyzer:
@@ -247,9 +514,9 @@ class SocialAnalyzer:
     
     def __init__(self, config: MemeHunterConfig):
         self.config = config
-        self.session = requests.Session()
+        self.session: Optional[aiohttp.ClientSession] = None  # Set by MemeHunter.run
     
-    def analyze_token_social(self, token_address: str, links: Dict) -> Dict:
+    async def analyze_token_social(self, token_address: str, links: Dict) -> Dict:
         """تحليل النشاط الاجتماعي للعملة"""
         social_data = {
             'twitter_followers': 0,
@@ -274,7 +541,7 @@ class SocialAnalyzer:
             
             # Website Check
             if website_url:
-                social_data['website_exists'] = self._check_website_validity(website_url)
+                social_data['website_exists'] = await self._check_website_validity(website_url)
             
             # Calculate Social Score (0-100)
             score = 0
@@ -330,12 +597,13 @@ class SocialAnalyzer:
             pass
         return 0
     
-    def _check_website_validity(self, website_url: str) -> bool:
+    async def _check_website_validity(self, website_url: str) -> bool:
         """فحص صلاحية الموقع"""
         try:
-            response = self.session.head(website_url, timeout=5, allow_redirects=True)
-            return response.status_code == 200
-        except:
+            async with self.session.head(website_url, allow_redirects=True,
+                                         timeout=aiohttp.ClientTimeout(total=5)) as response:
+                return response.status == 200
+        except Exception:
             return False
 
 
@@ -346,9 +614,9 @@ class LiquidityAnalyzer:
     
     def __init__(self, config: MemeHunterConfig):
         self.config = config
-        self.session = requests.Session()
+        self.providers: Optional[ProviderRegistry] = None  # on-chain data (None = simulated)
     
-    def check_liquidity_lock(self, token_address: str, chain: str, liquidity_usd: float) -> Dict:
+    async def check_liquidity_lock(self, token_address: str, chain: str, liquidity_usd: float) -> Dict:
         """فحص قفل السيولة"""
         lock_data = {
             'is_locked': False,
@@ -359,8 +627,11 @@ class LiquidityAnalyzer:
         }
         
         try:
+            raw = await self.providers.fetch('liquidity', chain, token_address) if self.providers else None
+            if raw is not None:
+                lock_data.update(raw)
             # For Solana: Check common lock services
-            if chain == 'solana':
+            elif chain == 'solana':
                 lock_data = self._check_solana_liquidity_lock(token_address, liquidity_usd)
             elif chain == 'bsc':
                 lock_data = self._check_bsc_liquidity_lock(token_address, liquidity_usd)
@@ -459,9 +730,9 @@ class HolderAnalyzer:
     
     def __init__(self, config: MemeHunterConfig):
         self.config = config
-        self.session = requests.Session()
+        self.providers: Optional[ProviderRegistry] = None  # on-chain data (None = simulated)
     
-    def analyze_holders(self, token_address: str, chain: str) -> Dict:
+    async def analyze_holders(self, token_address: str, chain: str) -> Dict:
         """تحليل توزيع الحاملين"""
         holder_data = {
             'total_holders': 0,
@@ -472,7 +743,10 @@ class HolderAnalyzer:
         }
         
         try:
-            if chain == 'solana':
+            raw = await self.providers.fetch('holders', chain, token_address) if self.providers else None
+            if raw is not None:
+                holder_data.update(raw)
+            elif chain == 'solana':
                 holder_data = self._analyze_solana_holders(token_address)
             elif chain == 'bsc':
                 holder_data = self._analyze_bsc_holders(token_address)
@@ -559,11 +833,14 @@ class HolderAnalyzer:
 class SecurityChecker:
     """فحص أمان العملة"""
     
+    SECURITY_FIELDS = ('contract_verified', 'honeypot_risk', 'has_mint_function',
+                       'has_pause_function', 'ownership_renounced')
+    
     def __init__(self, config: MemeHunterConfig):
         self.config = config
-        self.session = requests.Session()
+        self.providers: Optional[ProviderRegistry] = None  # on-chain data (None = simulated)
     
-    def check_token_security(self, token_address: str, chain: str) -> Dict:
+    async def check_token_security(self, token_address: str, chain: str) -> Dict:
         """فحص أمان العملة الشامل"""
         security_data = {
             'contract_verified': False,
@@ -576,16 +853,20 @@ class SecurityChecker:
         }
         
         try:
-            # Check contract verification
-            security_data['contract_verified'] = self._check_contract_verified(token_address, chain)
-            
-            # Check for honeypot (محاكاة - يحتاج API متخصص)
-            security_data['honeypot_risk'] = self._check_honeypot(token_address, chain)
-            
-            # Check dangerous functions (محاكاة)
-            security_data['has_mint_function'] = False  # Would need contract ABI
-            security_data['has_pause_function'] = False
-            security_data['ownership_renounced'] = True  # Assume for demo
+            raw = await self.providers.fetch('security', chain, token_address) if self.providers else None
+            if raw is not None:
+                security_data.update((key, raw[key]) for key in self.SECURITY_FIELDS if key in raw)
+            else:
+                # Check contract verification
+                security_data['contract_verified'] = self._check_contract_verified(token_address, chain)
+                
+                # Check for honeypot (محاكاة - يحتاج API متخصص)
+                security_data['honeypot_risk'] = self._check_honeypot(token_address, chain)
+                
+                # Check dangerous functions (محاكاة)
+                security_data['has_mint_function'] = False  # Would need contract ABI
+                security_data['has_pause_function'] = False
+                security_data['ownership_renounced'] = True  # Assume for demo
             
             # Calculate Security Score (0-100)
             score = 100  # Start with perfect score
@@ -639,7 +920,18 @@ class SecurityChecker:
 # ==================== SCORING ENGINE ====================
 
 class ScoringEngine:
-    """محرك التقييم الشامل"""
+    """محرك التقييم الشامل (عملة واحدة أو دفعة كاملة بـ NumPy)"""
+    
+    # Weighted scoring system
+    WEIGHTS = {
+        'price_action': 0.20,   # 20% - Price momentum
+        'liquidity': 0.25,      # 25% - Liquidity & lock
+        'social': 0.20,         # 20% - Social activity
+        'holders': 0.15,        # 15% - Distribution
+        'security': 0.20        # 20% - Security checks
+    }
+    
+    RISK_LEVELS = np.array(['LOW', 'MEDIUM', 'HIGH', 'EXTREME'])
     
     def __init__(self, config: MemeHunterConfig):
         self.config = config
@@ -654,14 +946,7 @@ class ScoringEngine:
     ) -> Tuple[float, str]:
         """حساب النقاط الإجمالية ومستوى الخطر"""
         
-        # Weighted scoring system
-        weights = {
-            'price_action': 0.20,   # 20% - Price momentum
-            'liquidity': 0.25,      # 25% - Liquidity & lock
-            'social': 0.20,         # 20% - Social activity
-            'holders': 0.15,        # 15% - Distribution
-            'security': 0.20        # 20% - Security checks
-        }
+        weights = self.WEIGHTS
         
         # Price Action Score (0-100)
         price_score = 0
@@ -705,7 +990,7 @@ class ScoringEngine:
             price_action.get('price_change_24h', 0)
         )
         
-        logger.info(f"📊 SCORES - Price:{price_score} Liq:{liquidity_score} Social:{social_score} Holders:{holder_score} Sec:{security_score} | TOTAL:{total_score:.1f} RISK:{risk_level}")
+        logger.debug(f"📊 SCORES - Price:{price_score} Liq:{liquidity_score} Social:{social_score} Holders:{holder_score} Sec:{security_score} | TOTAL:{total_score:.1f} RISK:{risk_level}")
         
         return total_score, risk_level
     
@@ -755,65 +1040,147 @@ class ScoringEngine:
             return 'MEDIUM'
         else:
             return 'LOW'
+    
+    def calculate_total_scores(
+        self,
+        price_change_1h: np.ndarray,
+        price_change_24h: np.ndarray,
+        transactions_24h: np.ndarray,
+        liquidity_score: np.ndarray,
+        liquidity_locked: np.ndarray,
+        social_score: np.ndarray,
+        holder_score: np.ndarray,
+        whale_risk: np.ndarray,
+        security_score: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """نسخة الدفعة من calculate_total_score - نفس النتائج بت ببت (مصفوفات بنفس الطول)"""
+        
+        weights = self.WEIGHTS
+        price_change_1h = np.asarray(price_change_1h, dtype=np.float64)
+        price_change_24h = np.asarray(price_change_24h, dtype=np.float64)
+        transactions_24h = np.asarray(transactions_24h, dtype=np.float64)
+        security_score = np.asarray(security_score, dtype=np.float64)
+        
+        # Price Action Score (0-100)
+        price_score = np.select(
+            [price_change_1h >= 50, price_change_1h >= 30, price_change_1h >= 20, price_change_1h >= 10],
+            [100, 80, 60, 40],
+            default=20
+        )
+        
+        # Transaction activity bonus
+        bonus = np.select([transactions_24h >= 20000, transactions_24h >= 10000], [20, 10], default=0)
+        price_score = np.minimum(100, price_score + bonus)
+        
+        # Calculate weighted total (same operation order as the scalar version)
+        total_score = (
+            price_score * weights['price_action'] +
+            np.asarray(liquidity_score, dtype=np.float64) * weights['liquidity'] +
+            np.asarray(social_score, dtype=np.float64) * weights['social'] +
+            np.asarray(holder_score, dtype=np.float64) * weights['holders'] +
+            security_score * weights['security']
+        )
+        
+        # Risk points: security (<50/<70/<90 → 3/2/1) - NaN falls in the top bin like the scalar version
+        risk_points = 3 - np.digitize(security_score, [50, 70, 90])
+        risk_points += np.where(np.asarray(liquidity_locked, dtype=bool), 0, 2)
+        whale_risk = np.asarray(whale_risk)
+        risk_points += np.select(
+            [whale_risk == 'EXTREME', whale_risk == 'HIGH', whale_risk == 'MEDIUM'], [3, 2, 1], default=0
+        )
+        risk_points += np.select([price_change_24h > 1000, price_change_24h > 500], [2, 1], default=0)
+        
+        # Categorize (<3 LOW, <5 MEDIUM, <7 HIGH, else EXTREME)
+        risk_level = self.RISK_LEVELS[np.digitize(risk_points, [3, 5, 7])]
+        
+        return total_score, risk_level
+    
+    def score_batch(self, candidates: List[Tuple[Dict, Dict, Dict, Dict, Dict]]) -> List[Tuple[float, str]]:
+        """تقييم دفعة (price_action, liquidity, social, holders, security) في استدعاء واحد"""
+        if not candidates:
+            return []
+        
+        def column(index: int, key: str, default):
+            return [candidate[index].get(key, default) for candidate in candidates]
+        
+        total_score, risk_level = self.calculate_total_scores(
+            price_change_1h=column(0, 'price_change_1h', 0),
+            price_change_24h=column(0, 'price_change_24h', 0),
+            transactions_24h=column(0, 'transactions_24h', 0),
+            liquidity_score=column(1, 'liquidity_score', 0),
+            liquidity_locked=column(1, 'is_locked', False),
+            social_score=column(2, 'social_score', 0),
+            holder_score=column(3, 'distribution_score', 0),
+            whale_risk=column(3, 'whale_risk', 'UNKNOWN'),
+            security_score=column(4, 'security_score', 0)
+        )
+        logger.debug(f"📊 Scored {len(candidates)} tokens | mean {total_score.mean():.1f} | "
+                     f"risk {dict(zip(*np.unique(risk_level, return_counts=True)))}")
+        return list(zip(total_score.tolist(), risk_level.tolist()))
 
 
 # ==================== SIGNAL TRACKER ====================
 
 class SignalTracker:
-    """تتبع الإشارات والكولداون"""
+    """تتبع الإشارات والكولداون (العدّ والكولداون عبر SignalGate)"""
     
     def __init__(self, config: MemeHunterConfig):
         self.config = config
         self.signals_today: List[MemeSignal] = []
-        self.signal_history: Dict[str, datetime] = {}  # token_address: last_signal_time
+        self.gate = SignalGate(config.COOLDOWN_HOURS, max_per_day=config.MAX_SIGNALS_PER_DAY)
+    
+    def blocked_reason(self, token_address: str) -> Optional[str]:
+        """سبب منع الإشارة ('daily_limit' / 'cooldown') بدون سجلات - للفلترة المبكرة"""
+        return self.gate.blocked_reason(token_address)
     
     def can_signal(self, token_address: str) -> bool:
         """هل يمكن إرسال إشارة لهذه العملة؟"""
+        reason = self.blocked_reason(token_address)
         
-        # Check daily limit
-        today_count = len([
-            s for s in self.signals_today
-            if s.token.detected_at.date() == datetime.now().date()
-        ])
-        
-        if today_count >= self.config.MAX_SIGNALS_PER_DAY:
+        if reason == 'daily_limit':
             logger.warning(f"⚠️ Daily signal limit reached ({self.config.MAX_SIGNALS_PER_DAY})")
-            return False
-        
-        # Check cooldown for this specific token
-        if token_address in self.signal_history:
-            last_signal = self.signal_history[token_address]
-            time_since = datetime.now() - last_signal
-            cooldown_hours = self.config.COOLDOWN_HOURS
-            
-            if time_since < timedelta(hours=cooldown_hours):
-                remaining = cooldown_hours - (time_since.total_seconds() / 3600)
-                logger.debug(f"⏳ Token in cooldown: {remaining:.1f}h remaining")
-                return False
+        elif reason == 'cooldown':
+            remaining = self.gate.cooldown_remaining(token_address).total_seconds() / 3600
+            logger.debug(f"⏳ Token in cooldown: {remaining:.1f}h remaining")
         
-        return True
+        return reason is None
     
     def add_signal(self, signal: MemeSignal):
         """إضافة إشارة جديدة"""
         self.signals_today.append(signal)
-        self.signal_history[signal.token.address] = signal.token.detected_at
-        logger.info(f"✅ Signal added: {signal.token.symbol} (Total today: {len(self.signals_today)})")
+        self.gate.record(signal.token.address, signal.token.detected_at)
+        logger.info(f"✅ Signal added: {signal.token.symbol} (Total today: {self.gate.today_count})")
     
     def cleanup_old_signals(self):
-        """تنظيف الإشارات القديمة"""
-        # Keep only today's signals
+        """تنظيف الإشارات القديمة (الكولداون المنتهي يُحذف تلقائياً داخل SignalGate)"""
+        # Keep only today's signals - the list is in time order, so only a new day needs a rebuild
         today = datetime.now().date()
-        self.signals_today = [
-            s for s in self.signals_today
-            if s.token.detected_at.date() == today
-        ]
-        
-        # Remove old cooldowns (older than 24h)
-        cutoff = datetime.now() - timedelta(hours=24)
-        self.signal_history = {
-            k: v for k, v in self.signal_history.items()
-            if v > cutoff
+        if self.signals_today and self.signals_today[0].token.detected_at.date() != today:
+            self.signals_today = [
+                s for s in self.signals_today
+                if s.token.detected_at.date() == today
+            ]
+    
+    def to_state(self) -> Dict:
+        """تحويل الحالة لقواميس بسيطة (بدون مراجع لكلاسات __main__)"""
+        return {
+            'signals_today': [asdict(s) for s in self.signals_today],
+            'signal_history': {
+                address: at for address, (at, _) in self.gate.to_state()['cooldowns'].items()
+            }
         }
+    
+    def restore_state(self, state: Dict):
+        """استرجاع الإشارات والكولداون من آخر لقطة"""
+        for data in state.get('signals_today', []):
+            data = dict(data)
+            data['token'] = TokenData(**data['token'])
+            self.signals_today.append(MemeSignal(**data))
+        self.cleanup_old_signals()
+        for signal in self.signals_today:
+            self.gate.count(signal.token.address, signal.token.detected_at)
+        for address, at in state.get('signal_history', {}).items():
+            self.gate.start_cooldown(address, at)
 
 
 # ==================== TELEGRAM NOTIFIER ====================
@@ -825,8 +1192,15 @@ class TelegramNotifier:
         self.config = config
         self.bot_token = config.TELEGRAM_BOT_TOKEN
         self.chat_id = config.TELEGRAM_CHAT_ID
+        self.journal = None  # Optional SignalJournal
+        self.session: Optional[aiohttp.ClientSession] = None  # Set by MemeHunter.run
     
-    def send_meme_signal(self, signal: MemeSignal):
+    async def _post_message(self, data: Dict) -> Tuple[int, str]:
+        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        async with self.session.post(url, json=data) as response:
+            return response.status, await response.text()
+    
+    async def send_meme_signal(self, signal: MemeSignal):
         """إرسال إشارة عملة ميم"""
         try:
             token = signal.token
@@ -919,38 +1293,45 @@ Contract: `{token.address}`
 """
             
             # Send via Telegram
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
             data = {
                 'chat_id': self.chat_id,
                 'text': message,
                 'parse_mode': 'Markdown'
             }
             
-            response = requests.post(url, json=data, timeout=10)
+            status, text = await self._post_message(data)
             
-            if response.status_code == 200:
+            if status == 200:
                 logger.info(f"✅ Telegram signal sent: {token.symbol}")
+                if self.journal:
+                    self.journal.record(
+                        token.symbol, 'BUY', signal.entry_price, signal.targets[0],
+                        signal.targets[1], signal.stop_loss,
+                        strategy=signal.signal_type, score=token.total_score,
+                        instrument=f"{token.chain}/{token.pair_address}",
+                        max_hours=self.config.MAX_HOLD_HOURS,
+                        meta={'chain': token.chain, 'address': token.address}
+                    )
                 return True
             else:
-                logger.error(f"❌ Telegram failed: {response.status_code} - {response.text}")
+                logger.error(f"❌ Telegram failed: {status} - {text}")
                 return False
                 
         except Exception as e:
             logger.error(f"❌ Failed to send Telegram signal: {e}")
             return False
     
-    def send_status_update(self, message: str):
+    async def send_status_update(self, message: str):
         """إرسال رسالة حالة"""
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
             data = {
                 'chat_id': self.chat_id,
                 'text': f"🤖 **Meme Hunter Status**\n\n{message}",
                 'parse_mode': 'Markdown'
             }
             
-            response = requests.post(url, json=data, timeout=10)
-            return response.status_code == 200
+            status, _ = await self._post_message(data)
+            return status == 200
             
         except Exception as e:
             logger.error(f"❌ Failed to send status update: {e}")
@@ -974,6 +1355,30 @@ class MemeHunter:
         self.scoring_engine = ScoringEngine(config)
         self.signal_tracker = SignalTracker(config)
         self.telegram = TelegramNotifier(config)
+        self.analysis_cache = PairAnalysisCache(config)
+        self.filter_stats = FilterStats()
+        self.lanes: Dict[str, ChainLane] = {
+            chain: ChainLane(chain, config.CHAIN_QUEUE_SIZE, config.CHAIN_MAX_CONCURRENT)
+            for chain in config.scan_chains()
+        }
+        
+        # Shared aiohttp session + event loop (opened in run)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._signal_lock: Optional[asyncio.Lock] = None
+        self.discovery: Optional[DiscoveryFeed] = None
+        self.onchain: Optional[ProviderRegistry] = None
+        
+        # Restore cooldowns & today's signals after restart
+        self.state_store = StateStore(config.STATE_FILE, config.STATE_CHECKPOINT_INTERVAL)
+        self.signal_tracker.restore_state(self.state_store.load())
+        
+        # Journal every sent signal; outcomes resolved from live pair price
+        self.telegram.journal = SignalJournal(
+            config.JOURNAL_DB, 'meme',
+            candle_fetcher=self._pair_price_candles,
+            default_max_hours=config.MAX_HOLD_HOURS
+        )
         
         logger.info("🚀 Meme Hunter Bot initialized!")
     
@@ -983,47 +1388,172 @@ class MemeHunter:
             logger.info("🔍 Starting meme coin scan...")
             
             # 1. Get trending tokens from DexScreener
-            trending_tokens = self.dex_scanner.search_trending_tokens()
+            trending_tokens = await self.dex_scanner.search_trending_tokens()
             
             if not trending_tokens:
                 logger.info("😴 No trending tokens found")
                 return
             
             logger.info(f"📊 Analyzing {len(trending_tokens)} potential tokens...")
+            started = time.time()
             
-            # 2. Analyze each token
+            # 2. Every chain analyzed concurrently in its own lane (scored in one batch per lane)
+            by_chain: Dict[str, List[Dict]] = {}
             for pair_data in trending_tokens:
+                by_chain.setdefault(pair_data.get('chainId'), []).append(pair_data)
+            lanes = [(self.lanes[chain], pairs) for chain, pairs in by_chain.items() if chain in self.lanes]
+            enqueued_at = time.monotonic()
+            lane_results = await asyncio.gather(*(
+                self._analyze_in_lane(lane, [enqueued_at] * len(pairs), pairs) for lane, pairs in lanes
+            ))
+            by_pair = {id(p): r for (_, pairs), res in zip(lanes, lane_results) for p, r in zip(pairs, res)}
+            results = [by_pair.get(id(pair_data)) for pair_data in trending_tokens]
+            logger.info(f"⚡ Analyzed {len(results)} tokens in {time.time() - started:.1f}s")
+            
+            # 3. Signals in scan order (cooldown / daily limit are order-sensitive)
+            for token_data in results:
                 try:
-                    token_data = await self._analyze_token(pair_data)
-                    
-                    if token_data and self._meets_criteria(token_data):
-                        # Generate signal
-                        signal = self._generate_signal(token_data)
-                        
-                        if signal and self.signal_tracker.can_signal(token_data.address):
-                            # Send signal!
-                            logger.info(f"🎯 SIGNAL GENERATED: {token_data.symbol} (Score: {token_data.total_score:.1f})")
-                            
-                            self.telegram.send_meme_signal(signal)
-                            self.signal_tracker.add_signal(signal)
-                    
-                    # Small delay between analyses
-                    await asyncio.sleep(1)
+                    await self._emit_signal(token_data)
                     
                 except Exception as e:
                     logger.error(f"❌ Token analysis failed: {e}")
                     continue
             
-            # Cleanup old signals
-            self.signal_tracker.cleanup_old_signals()
-            
+            self._housekeeping()
             logger.info("✅ Scan cycle completed")
             
         except Exception as e:
             logger.error(f"❌ Scan failed: {e}")
     
+    async def _emit_signal(self, token_data: Optional[TokenData]):
+        """توليد وإرسال الإشارة إذا تحققت المعايير"""
+        if not token_data or not self._meets_criteria(token_data):
+            return
+        
+        # Generate signal
+        signal = self._generate_signal(token_data)
+        if not signal:
+            return
+        
+        if self._signal_lock is None:
+            self._signal_lock = asyncio.Lock()
+        
+        # Workers run concurrently: check + send + record as one step
+        async with self._signal_lock:
+            if self.signal_tracker.can_signal(token_data.address):
+                # Send signal!
+                logger.info(f"🎯 SIGNAL GENERATED: {token_data.symbol} (Score: {token_data.total_score:.1f})")
+                
+                await self.telegram.send_meme_signal(signal)
+                self.signal_tracker.add_signal(signal)
+    
+    def _housekeeping(self):
+        """تنظيف الإشارات القديمة والكاش + إحصائيات"""
+        self.signal_tracker.cleanup_old_signals()
+        self.analysis_cache.prune()
+        logger.info(
+            f"🗄️ Cache: HTTP {self.dex_scanner.cache.stats} | "
+            f"analysis {self.analysis_cache.stats} ({len(self.analysis_cache)} pairs)"
+        )
+        logger.info(f"🧹 Filter: {self.filter_stats.summary()}")
+        for chain, lane in self.lanes.items():
+            logger.info(f"🔗 {chain}: {lane.summary()}")
+        if self.onchain:
+            logger.info(f"⛓️ On-chain: {self.onchain.stats()}")
+        if self.discovery:
+            logger.info(f"📡 Discovery: {self.discovery.stats} (queue {self.discovery.queue.qsize()})")
+        logger.debug(f"🔌 HTTP pools: {pool_stats()}")
+    
+    def _create_discovery_feed(self) -> DiscoveryFeed:
+        """مصادر الاكتشاف: أحدث الملفات/المعززة (سريع) + البحث بالكلمات (احتياطي)"""
+        return DiscoveryFeed(
+            [
+                PollingSource('profiles', self.dex_scanner.discover_new_pairs,
+                              self.config.DISCOVERY_POLL_SECONDS),
+                PollingSource('search', self.dex_scanner.search_trending_tokens,
+                              self.config.SCAN_INTERVAL_SECONDS)
+            ],
+            queue_size=self.config.DISCOVERY_QUEUE_SIZE,
+            seen_window_seconds=self.config.DISCOVERY_SEEN_WINDOW_MINUTES * 60
+        )
+    
+    def _start_pipeline(self) -> List[asyncio.Task]:
+        """التغذية → موزع الشبكات → عمال كل شبكة (مرحلة التقييم والتنبيه مشتركة)"""
+        tasks = [asyncio.create_task(self.discovery.run()),
+                 asyncio.create_task(self._route_discovery())]
+        for lane in self.lanes.values():
+            lane.start()
+            tasks += [asyncio.create_task(self._lane_worker(lane))
+                      for _ in range(self.config.CHAIN_WORKERS)]
+        return tasks
+    
+    async def _route_discovery(self):
+        """توزيع الأزواج المكتشفة على طابور شبكتها"""
+        queue = self.discovery.queue
+        while True:
+            pair_data = await queue.get()
+            lane = self.lanes.get(pair_data.get('chainId'))
+            if lane is not None:
+                lane.push(pair_data)
+            queue.task_done()
+    
+    async def _lane_worker(self, lane: ChainLane):
+        """عامل تحليل لشبكة واحدة: يستهلك الأزواج الجديدة من طابورها"""
+        queue = lane.queue
+        while True:
+            # دفعة: أول زوج + ما تراكم في الطابور (حتى حد تزامن الشبكة)
+            batch = [await queue.get()]
+            while not queue.empty() and len(batch) < lane.max_concurrent:
+                batch.append(queue.get_nowait())
+            try:
+                results = await self._analyze_in_lane(lane, [t for t, _ in batch], [p for _, p in batch])
+                for token_data in results:
+                    await self._emit_signal(token_data)
+            except Exception as e:
+                logger.error(f"❌ Token analysis failed ({lane.chain}): {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _analyze_in_lane(self, lane: ChainLane, enqueued_at: List[float],
+                               pairs: List[Dict]) -> List[Optional[TokenData]]:
+        """تحليل دفعة تحت حد تزامن الشبكة + تسجيل الكمون والعائد"""
+        lane.start()
+        results = await self._analyze_batch(pairs, lane.semaphore)
+        lane.record(enqueued_at, results)
+        return results
+    
     async def _analyze_token(self, pair_data: Dict) -> Optional[TokenData]:
-        """تحليل شامل لعملة واحدة"""
+        """تحليل شامل لعملة واحدة - فلترة مرحلية حسب التكلفة (None = مرفوضة)"""
+        return (await self._analyze_batch([pair_data]))[0]
+    
+    async def _analyze_batch(self, pairs: List[Dict],
+                             semaphore: Optional[asyncio.Semaphore] = None) -> List[Optional[TokenData]]:
+        """تحليل دفعة: المراحل بالتوازي ثم تقييم كل الناجين باستدعاء NumPy واحد"""
+        semaphore = semaphore or asyncio.Semaphore(self.config.MAX_CONCURRENT_ANALYSES)
+        
+        async def prepare(pair_data: Dict) -> Optional[Dict]:
+            async with semaphore:
+                return await self._prepare_token(pair_data)
+        
+        prepared = await asyncio.gather(*(prepare(pair_data) for pair_data in pairs))
+        candidates = [c for c in prepared if c is not None]
+        scores = iter(self.scoring_engine.score_batch([
+            (c['price_action'], c['liquidity'], c['social'], c['holders'], c['security'])
+            for c in candidates
+        ]))
+        
+        results = []
+        for candidate in prepared:
+            if candidate is None:
+                results.append(None)
+            else:
+                total_score, risk_level = next(scores)
+                results.append(self._finalize_token(candidate, total_score, risk_level))
+        return results
+    
+    async def _prepare_token(self, pair_data: Dict) -> Optional[Dict]:
+        """المراحل الثلاث (رخيصة / كاش / شبكة) - يعيد بيانات جاهزة للتقييم أو None"""
         try:
             # Extract basic data
             base_token = pair_data.get('baseToken', {})
@@ -1032,14 +1562,19 @@ class MemeHunter:
             address = base_token.get('address', '')
             chain = pair_data.get('chainId', '')
             
+            # === STAGE 1: cheap gates (pair JSON only, no requests) ===
+            self.filter_stats.enter('cheap')
+            
             # Skip if blacklisted
             if address in self.config.BLACKLIST_TOKENS:
                 logger.debug(f"⛔ Blacklisted token: {symbol}")
+                self.filter_stats.reject('cheap', 'blacklisted')
                 return None
             
             # Price data
-            price_usd = float(pair_data.get('priceUsd', 0))
+            price_usd = float(pair_data.get('priceUsd', 0) or 0)
             if price_usd == 0:
+                self.filter_stats.reject('cheap', 'no_price')
                 return None
             
             price_change = pair_data.get('priceChange', {})
@@ -1061,6 +1596,22 @@ class MemeHunter:
             sells = int(txns.get('sells', 0) or 0)
             transactions_24h = buys + sells
             
+            reason = self._numeric_rejection(
+                liquidity_usd, volume_24h, transactions_24h, price_change_1h, price_change_24h
+            )
+            if reason:
+                self.filter_stats.reject('cheap', reason)
+                return None
+            
+            # === STAGE 2: cached lookups (cooldown state, analysis cache) ===
+            self.filter_stats.enter('cached')
+            stage = 'cached'
+            
+            reason = self.signal_tracker.blocked_reason(address)
+            if reason:
+                self.filter_stats.reject(stage, reason)
+                return None
+            
             # DEX info
             dex_name = pair_data.get('dexId', 'Unknown')
             pair_address = pair_data.get('pairAddress', '')
@@ -1089,122 +1640,167 @@ class MemeHunter:
             
             logger.info(f"🔎 Analyzing: {symbol} | ${price_usd:.8f} | 1h: {price_change_1h:+.1f}% | Vol: ${volume_24h:,.0f}")
             
-            # === DEEP ANALYSIS ===
-            
-            # 1. Social Analysis
-            social_data = self.social_analyzer.analyze_token_social(address, links_dict)
-            
-            # 2. Liquidity Analysis
-            liquidity_data = self.liquidity_analyzer.check_liquidity_lock(address, chain, liquidity_usd)
-            
-            # 3. Holder Analysis
-            holder_data = self.holder_analyzer.analyze_holders(address, chain)
-            
-            # 4. Security Check
-            security_data = self.security_checker.check_token_security(address, chain)
-            
-            # 5. Calculate Total Score
+            # === DEEP ANALYSIS (reused while price/volume/liquidity barely moved) ===
+            snapshot = {'price': price_usd, 'volume': volume_24h, 'liquidity': liquidity_usd}
+            deep = self.analysis_cache.get(pair_address, snapshot)
+            
+            if deep is None:
+                # === STAGE 3: network checks ===
+                stage = 'network'
+                self.filter_stats.enter(stage)
+                # All four checks run concurrently (on-chain lookups are batched per provider)
+                social, liquidity, holders, security = await asyncio.gather(
+                    # 1. Social Analysis
+                    self.social_analyzer.analyze_token_social(address, links_dict),
+                    # 2. Liquidity Analysis
+                    self.liquidity_analyzer.check_liquidity_lock(address, chain, liquidity_usd),
+                    # 3. Holder Analysis
+                    self.holder_analyzer.analyze_holders(address, chain),
+                    # 4. Security Check
+                    self.security_checker.check_token_security(address, chain)
+                )
+                deep = {'social': social, 'liquidity': liquidity, 'holders': holders, 'security': security}
+                self.analysis_cache.put(pair_address, snapshot, deep)
+            
+            # 5. Price action for the (batched) scoring step
             price_action_data = {
                 'price_change_1h': price_change_1h,
                 'price_change_24h': price_change_24h,
                 'transactions_24h': transactions_24h
             }
             
-            total_score, risk_level = self.scoring_engine.calculate_total_score(
-                price_action_data,
-                liquidity_data,
-                social_data,
-                holder_data,
-                security_data
-            )
+            return {
+                'stage': stage,
+                'price_action': price_action_data,
+                'liquidity': deep['liquidity'],
+                'social': deep['social'],
+                'holders': deep['holders'],
+                'security': deep['security'],
+                'token': dict(
+                    symbol=symbol,
+                    name=name,
+                    address=address,
+                    chain=chain,
+                    price_usd=price_usd,
+                    price_change_5m=price_change_5m,
+                    price_change_1h=price_change_1h,
+                    price_change_6h=price_change_6h,
+                    price_change_24h=price_change_24h,
+                    volume_24h=volume_24h,
+                    liquidity_usd=liquidity_usd,
+                    transactions_24h=transactions_24h,
+                    buys_24h=buys,
+                    sells_24h=sells,
+                    website_url=website_url,
+                    telegram_url=links_dict.get('telegram'),
+                    twitter_url=links_dict.get('twitter'),
+                    age_hours=age_hours,
+                    dex_name=dex_name,
+                    pair_address=pair_address
+                )
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ Token analysis error: {e}")
+            return None
+    
+    def _finalize_token(self, candidate: Dict, total_score: float, risk_level: str) -> Optional[TokenData]:
+        """بناء TokenData بعد التقييم + فلتر الجودة النهائي"""
+        try:
+            liquidity_data = candidate['liquidity']
+            social_data = candidate['social']
+            holder_data = candidate['holders']
+            security_data = candidate['security']
+            stage = candidate['stage']
             
             # Build TokenData object
             token_data = TokenData(
-                symbol=symbol,
-                name=name,
-                address=address,
-                chain=chain,
-                price_usd=price_usd,
-                price_change_5m=price_change_5m,
-                price_change_1h=price_change_1h,
-                price_change_6h=price_change_6h,
-                price_change_24h=price_change_24h,
-                volume_24h=volume_24h,
-                liquidity_usd=liquidity_usd,
+                **candidate['token'],
                 liquidity_locked=liquidity_data['is_locked'],
                 liquidity_lock_percent=liquidity_data['lock_percent'],
-                transactions_24h=transactions_24h,
-                buys_24h=buys,
-                sells_24h=sells,
                 holders_count=holder_data['total_holders'],
                 twitter_followers=social_data['twitter_followers'],
                 telegram_members=social_data['telegram_members'],
-                website_url=website_url,
-                telegram_url=links_dict.get('telegram'),
-                twitter_url=links_dict.get('twitter'),
                 contract_verified=security_data['contract_verified'],
                 honeypot_risk=security_data['honeypot_risk'],
                 creator_suspicious=False,
-                age_hours=age_hours,
-                dex_name=dex_name,
-                pair_address=pair_address,
                 total_score=total_score,
                 risk_level=risk_level,
                 detected_at=datetime.now()
             )
             
+            reason = self._quality_rejection(
+                total_score, risk_level, liquidity_data['is_locked'], security_data['honeypot_risk']
+            )
+            if reason:
+                logger.debug(f"❌ {token_data.symbol}: rejected at {stage} stage ({reason}, score {total_score:.1f})")
+                self.filter_stats.reject(stage, reason)
+                return None
+            
             return token_data
             
         except Exception as e:
             logger.error(f"❌ Token analysis error: {e}")
             return None
     
-    def _meets_criteria(self, token: TokenData) -> bool:
-        """هل العملة تلبي معايير الدخول؟"""
-        
-        # Minimum score required
-        if token.total_score < 60:
-            logger.debug(f"❌ {token.symbol}: Score too low ({token.total_score:.1f})")
-            return False
+    def _numeric_rejection(self, liquidity_usd: float, volume_24h: float, transactions_24h: int,
+                           price_change_1h: float, price_change_24h: float) -> Optional[str]:
+        """بوابات رقمية رخيصة (من JSON الزوج) - سبب الرفض أو None"""
         
         # Minimum liquidity
-        if token.liquidity_usd < self.config.MIN_LIQUIDITY_USD:
-            logger.debug(f"❌ {token.symbol}: Liquidity too low (${token.liquidity_usd:,.0f})")
-            return False
+        if liquidity_usd < self.config.MIN_LIQUIDITY_USD:
+            return 'liquidity'
         
         # Minimum volume
-        if token.volume_24h < self.config.MIN_VOLUME_24H_USD:
-            logger.debug(f"❌ {token.symbol}: Volume too low (${token.volume_24h:,.0f})")
-            return False
+        if volume_24h < self.config.MIN_VOLUME_24H_USD:
+            return 'volume'
         
         # Minimum transactions
-        if token.transactions_24h < self.config.MIN_TRANSACTIONS_24H:
-            logger.debug(f"❌ {token.symbol}: Transactions too low ({token.transactions_24h})")
-            return False
+        if transactions_24h < self.config.MIN_TRANSACTIONS_24H:
+            return 'transactions'
         
         # Price change triggers
-        if token.price_change_1h < self.config.MIN_PRICE_CHANGE_1H:
-            logger.debug(f"❌ {token.symbol}: Price change 1h too low ({token.price_change_1h:.1f}%)")
-            return False
+        if price_change_1h < self.config.MIN_PRICE_CHANGE_1H:
+            return 'price_change_1h'
         
         # Not too late (avoid 1000%+ pumps)
-        if token.price_change_24h > self.config.MAX_PRICE_CHANGE_24H:
-            logger.debug(f"❌ {token.symbol}: Already pumped too much ({token.price_change_24h:.1f}%)")
-            return False
+        if price_change_24h > self.config.MAX_PRICE_CHANGE_24H:
+            return 'pumped_24h'
+        
+        return None
+    
+    def _quality_rejection(self, total_score: float, risk_level: str,
+                           liquidity_locked: bool, honeypot_risk: bool) -> Optional[str]:
+        """بوابات بعد التحليل العميق (النقاط / القفل / الأمان) - سبب الرفض أو None"""
+        
+        # Minimum score required
+        if total_score < 60:
+            return 'score'
         
         # Liquidity lock check (if required)
-        if self.config.LIQUIDITY_LOCK_REQUIRED and not token.liquidity_locked:
-            logger.debug(f"❌ {token.symbol}: Liquidity not locked")
-            return False
+        if self.config.LIQUIDITY_LOCK_REQUIRED and not liquidity_locked:
+            return 'liquidity_lock'
         
         # Security check
-        if token.honeypot_risk:
-            logger.debug(f"❌ {token.symbol}: Honeypot risk detected!")
-            return False
+        if honeypot_risk:
+            return 'honeypot'
         
         # Risk level check
-        if token.risk_level == 'EXTREME':
-            logger.debug(f"❌ {token.symbol}: Risk level EXTREME")
+        if risk_level == 'EXTREME':
+            return 'extreme_risk'
+        
+        return None
+    
+    def _meets_criteria(self, token: TokenData) -> bool:
+        """هل العملة تلبي معايير الدخول؟"""
+        reason = (
+            self._quality_rejection(token.total_score, token.risk_level,
+                                    token.liquidity_locked, token.honeypot_risk)
+            or self._numeric_rejection(token.liquidity_usd, token.volume_24h, token.transactions_24h,
+                                       token.price_change_1h, token.price_change_24h)
+        )
+        if reason:
+            logger.debug(f"❌ {token.symbol}: rejected ({reason}, score {token.total_score:.1f})")
             return False
         
         logger.info(f"✅ {token.symbol}: Meets all criteria! Score: {token.total_score:.1f}")
@@ -1268,37 +1864,96 @@ class MemeHunter:
             logger.error(f"❌ Signal generation failed: {e}")
             return None
     
+    def _attach_session(self, session: Optional[aiohttp.ClientSession]):
+        """مشاركة جلسة HTTP واحدة بين كل المكونات"""
+        self.session = session
+        self.dex_scanner.session = session
+        self.social_analyzer.session = session
+        self.telegram.session = session
+        
+        # On-chain providers share the same session (only chains with a configured endpoint)
+        self.onchain = None
+        if session is not None and self.config.ONCHAIN_RPC_ENDPOINTS:
+            self.onchain = create_rpc_registry(
+                session, self.config.ONCHAIN_RPC_ENDPOINTS,
+                max_batch=self.config.ONCHAIN_BATCH_SIZE,
+                batch_window=self.config.ONCHAIN_BATCH_WINDOW_MS / 1000,
+                timeout=self.config.ONCHAIN_TIMEOUT_SECONDS,
+                cache_ttl=self.config.ONCHAIN_CACHE_TTL_SECONDS
+            )
+        for analyzer in (self.liquidity_analyzer, self.holder_analyzer, self.security_checker):
+            analyzer.providers = self.onchain
+    
     async def run(self):
         """تشغيل البوت"""
         logger.info("🚀🚀🚀 MEME HUNTER BOT STARTED! 🚀🚀🚀")
         
+        self._loop = asyncio.get_running_loop()
+        self._attach_session(create_http_session(self.config))
+        
         # Send startup notification
-        self.telegram.send_status_update(
+        await self.telegram.send_status_update(
             f"🚀 Meme Hunter Bot Started!\n\n"
-            f"🎯 Target: {self.config.TARGET_CHAIN.upper()} DEX\n"
+            f"🎯 Chains: {', '.join(c.upper() for c in self.config.scan_chains())}\n"
             f"⏰ Scan Interval: {self.config.SCAN_INTERVAL_SECONDS}s\n"
+            f"📡 New Pairs Poll: {self.config.DISCOVERY_POLL_SECONDS}s\n"
             f"📊 Max Signals/Day: {self.config.MAX_SIGNALS_PER_DAY}\n"
             f"💰 Position Size: {self.config.MAX_POSITION_SIZE_PCT*100}%\n"
             f"🛑 Stop Loss: {self.config.STOP_LOSS_PCT}%\n"
             f"🎯 Targets: +{self.config.TARGET_1_PCT}%, +{self.config.TARGET_2_PCT}%, +{self.config.TARGET_3_PCT}%"
         )
         
-        while True:
-            try:
-                # Run scan
-                await self.scan_and_analyze()
-                
-                # Wait for next scan
-                logger.info(f"😴 Sleeping for {self.config.SCAN_INTERVAL_SECONDS}s...")
-                await asyncio.sleep(self.config.SCAN_INTERVAL_SECONDS)
-                
-            except KeyboardInterrupt:
-                logger.info("⛔ Stopping Meme Hunter...")
-                self.telegram.send_status_update("⛔ Meme Hunter Bot Stopped")
-                break
-            except Exception as e:
-                logger.error(f"❌ Runtime error: {e}")
-                await asyncio.sleep(60)  # Wait 1 minute on error
+        self.state_store.start(self.signal_tracker.to_state)
+        self.telegram.journal.start()
+        
+        # Discovery feed + analysis workers
+        self._signal_lock = asyncio.Lock()
+        self.discovery = self._create_discovery_feed()
+        tasks = self._start_pipeline()
+        
+        try:
+            while True:
+                try:
+                    # Periodic housekeeping (feed + workers run in the background)
+                    await asyncio.sleep(self.config.SCAN_INTERVAL_SECONDS)
+                    self._housekeeping()
+                    
+                except KeyboardInterrupt:
+                    logger.info("⛔ Stopping Meme Hunter...")
+                    await self.telegram.send_status_update("⛔ Meme Hunter Bot Stopped")
+                    break
+                except Exception as e:
+                    logger.error(f"❌ Runtime error: {e}")
+                    await asyncio.sleep(60)  # Wait 1 minute on error
+        finally:
+            await self._shutdown(tasks)
+    
+    async def _shutdown(self, tasks: List[asyncio.Task]):
+        """إيقاف العمال ثم السجل ثم الجلسة"""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.state_store.stop()
+        # join خيط السجل خارج الـ loop: المُقيِّم قد ينتظر طلب سعر على نفس الـ loop
+        await asyncio.to_thread(self.telegram.journal.stop)
+        await self.session.close()
+        self._attach_session(None)
+    
+    def _pair_price_candles(self, instrument: str, since_ms: int) -> List[List[float]]:
+        """DexScreener has no candles API - current price as a single pseudo-candle"""
+        # Called from the journal thread: run the request on the bot's event loop
+        if self.session is None or self._loop is None:
+            return []
+        # "chain/pair" (older journal rows: pair address only → TARGET_CHAIN)
+        chain, _, pair_address = instrument.rpartition('/')
+        future = asyncio.run_coroutine_threadsafe(
+            self.dex_scanner.get_token_details(pair_address, chain or None), self._loop
+        )
+        pair = future.result(timeout=self.config.HTTP_TIMEOUT_SECONDS + 5)
+        if not pair or not pair.get('priceUsd'):
+            return []
+        price = float(pair['priceUsd'])
+        return [[int(time.time() * 1000), price, price, price, price, 0.0]]
 
 
 # ==================== MAIN ENTRY POINT ====================
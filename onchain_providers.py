@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+⛓️ On-Chain Data Providers
+مزودو بيانات السلسلة (قفل السيولة، الحاملون، الأمان) لـ Meme Hunter
+
+- استعلامات async مجمّعة: الطلبات المتزامنة لعناوين مختلفة تُجمع في استدعاء RPC واحد
+- كاش نتائج لكل مزود مع TTL
+- قاطع دائرة (circuit breaker) لكل مزود: مستكشف بطيء/معطل لا يوقف الحلقة الرئيسية
+  (مهلة + إرجاع None فوراً والمحلل يستخدم القيم الاحتياطية)
+- خادم JSON-RPC محلي بديل لقياس الإنتاجية بدون إنترنت
+"""
+
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+import aiohttp
+from aiohttp import web
+
+# نوع البيانات → طريقة JSON-RPC (كل طريقة تأخذ قائمة عناوين وتعيد قائمة نتائج بنفس الترتيب)
+KIND_METHODS = {
+    'liquidity': 'getLiquidityLocks',
+    'holders': 'getHolderStats',
+    'security': 'getTokenSecurity'
+}
+
+
+# ============================================================================
+# قاطع الدائرة
+# ============================================================================
+
+class CircuitBreaker:
+    """closed → open بعد N إخفاقات متتالية → half_open بعد reset_seconds (طلب تجريبي واحد)"""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """هل يُسمح بطلب الآن؟"""
+        state = self.state
+        if state == 'half_open':
+            # طلب تجريبي واحد لكل فترة: نعيد التسليح حتى تصل النتيجة
+            self.opened_at = time.monotonic()
+            return True
+        return state == 'closed'
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+
+# ============================================================================
+# المزودون
+# ============================================================================
+
+class OnChainProvider:
+    """أساس المزودين: تجميع الطلبات + كاش TTL + مهلة + قاطع دائرة
+
+    الأصناف الفرعية تنفذ _fetch_batch(addresses) → {address: data}
+    """
+
+    def __init__(self, name: str, max_batch: int = 100, batch_window: float = 0.02,
+                 timeout: float = 3.0, cache_ttl: float = 300,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.breaker = breaker or CircuitBreaker()
+        self._cache: Dict[str, Tuple[float, Optional[Dict]]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, int] = {
+            'lookups': 0, 'cache_hits': 0, 'batches': 0,
+            'failures': 0, 'short_circuited': 0
+        }
+
+    async def _fetch_batch(self, addresses: List[str]) -> Dict[str, Dict]:
+        raise NotImplementedError
+
+    async def get(self, address: str) -> Optional[Dict]:
+        """نتيجة عنوان واحد (None = غير متاح، استخدم الاحتياطي)"""
+        self.stats['lookups'] += 1
+        cached = self._cache.get(address)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            self.stats['cache_hits'] += 1
+            return cached[1]
+
+        future = self._pending.get(address)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[address] = loop.create_future()
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        # shield: إلغاء أحد المنتظرين لا يلغي النتيجة المشتركة
+        return await asyncio.shield(future)
+
+    async def get_many(self, addresses: List[str]) -> Dict[str, Optional[Dict]]:
+        results = await asyncio.gather(*(self.get(address) for address in addresses))
+        return dict(zip(addresses, results))
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            task = asyncio.ensure_future(self._run_batch(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, pending: Dict[str, asyncio.Future]):
+        results: Dict[str, Dict] = {}
+        if not self.breaker.allow():
+            self.stats['short_circuited'] += 1
+        else:
+            self.stats['batches'] += 1
+            try:
+                results = await asyncio.wait_for(self._fetch_batch(list(pending)), self.timeout)
+                self.breaker.record_success()
+                now = time.monotonic()
+                for address in pending:
+                    self._cache[address] = (now, results.get(address))
+                self._prune()
+            except Exception as e:
+                self.stats['failures'] += 1
+                self.breaker.record_failure()
+                logging.warning(f"⚠️ Provider '{self.name}' batch of {len(pending)} failed "
+                                f"({type(e).__name__}: {e}) - breaker {self.breaker.state}")
+        for address, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(address))
+
+    def _prune(self):
+        if len(self._cache) > self.max_batch * 100:
+            now = time.monotonic()
+            self._cache = {k: v for k, v in self._cache.items() if now - v[0] < self.cache_ttl}
+
+
+class JsonRpcProvider(OnChainProvider):
+    """مزود JSON-RPC: طريقة واحدة تأخذ قائمة عناوين (مثل getMultipleAccounts في Solana)"""
+
+    def __init__(self, name: str, session: aiohttp.ClientSession, url: str, method: str, **kwargs):
+        super().__init__(name, **kwargs)
+        self.session = session
+        self.url = url
+        self.method = method
+        self._next_id = 0
+
+    async def _fetch_batch(self, addresses: List[str]) -> Dict[str, Dict]:
+        self._next_id += 1
+        payload = {'jsonrpc': '2.0', 'id': self._next_id, 'method': self.method, 'params': [addresses]}
+        async with self.session.post(self.url, json=payload) as response:
+            response.raise_for_status()
+            body = await response.json(content_type=None)
+        if body.get('error'):
+            raise RuntimeError(body['error'].get('message', body['error']))
+        return {address: item for address, item in zip(addresses, body.get('result') or []) if item}
+
+
+class ProviderRegistry:
+    """(نوع البيانات، السلسلة) → مزود"""
+
+    def __init__(self):
+        self._providers: Dict[Tuple[str, str], OnChainProvider] = {}
+
+    def register(self, kind: str, chain: str, provider: OnChainProvider):
+        self._providers[(kind, chain)] = provider
+
+    def get_provider(self, kind: str, chain: str) -> Optional[OnChainProvider]:
+        return self._providers.get((kind, chain))
+
+    async def fetch(self, kind: str, chain: str, address: str) -> Optional[Dict]:
+        """None إذا لا يوجد مزود أو فشل/انقطع - المحلل يستخدم الاحتياطي"""
+        provider = self._providers.get((kind, chain))
+        if provider is None:
+            return None
+        return await provider.get(address)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            provider.name: dict(provider.stats, breaker=provider.breaker.state)
+            for provider in self._providers.values()
+        }
+
+    def __len__(self):
+        return len(self._providers)
+
+
+def create_rpc_registry(session: aiohttp.ClientSession, endpoints: Dict[str, str],
+                        **provider_kwargs) -> ProviderRegistry:
+    """مزود JSON-RPC لكل (نوع، سلسلة) من خريطة chain → URL"""
+    registry = ProviderRegistry()
+    for chain, url in endpoints.items():
+        for kind, method in KIND_METHODS.items():
+            registry.register(kind, chain, JsonRpcProvider(
+                f"{chain}:{kind}", session, url, method, **provider_kwargs
+            ))
+    return registry
+
+
+# ============================================================================
+# خادم JSON-RPC محلي (بديل للمستكشفات الحقيقية - للاختبار وقياس الأداء)
+# ============================================================================
+
+def _seed(address: str) -> int:
+    return int.from_bytes(hashlib.blake2b(address.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _liquidity_lock(address: str) -> Dict:
+    seed = _seed(address)
+    locked = seed % 3 != 0
+    return {
+        'is_locked': locked,
+        'lock_percent': float(50 + seed % 50) if locked else 0.0,
+        'lock_duration_days': (30, 90, 180, 365)[seed % 4] if locked else 0,
+        'lock_service': 'LocalLock' if locked else None
+    }
+
+
+def _holder_stats(address: str) -> Dict:
+    seed = _seed(address)
+    return {
+        'total_holders': 100 + seed % 9900,
+        'top_10_percent': float(10 + seed % 70),
+        'creator_percent': float(seed % 25)
+    }
+
+
+def _token_security(address: str) -> Dict:
+    seed = _seed(address)
+    return {
+        'contract_verified': seed % 5 != 0,
+        'honeypot_risk': seed % 17 == 0,
+        'has_mint_function': seed % 7 == 0,
+        'has_pause_function': seed % 11 == 0,
+        'ownership_renounced': seed % 2 == 0
+    }
+
+
+class LocalRpcServer:
+    """خادم aiohttp محلي ينفذ طرق KIND_METHODS ببيانات حتمية من العنوان
+
+    latency: تأخير مصطنع لكل استدعاء RPC (وليس لكل عنوان) - يحاكي مستكشفاً بعيداً
+    """
+
+    HANDLERS = {
+        KIND_METHODS['liquidity']: _liquidity_lock,
+        KIND_METHODS['holders']: _holder_stats,
+        KIND_METHODS['security']: _token_security
+    }
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+        self.addresses = 0
+        self.url: Optional[str] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle(self, request):
+        body = await request.json()
+        batch = isinstance(body, list)
+        replies = [await self._call(item) for item in (body if batch else [body])]
+        return web.json_response(replies if batch else replies[0])
+
+    async def _call(self, item: Dict) -> Dict:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        handler = self.HANDLERS.get(item.get('method'))
+        if handler is None:
+            return {'jsonrpc': '2.0', 'id': item.get('id'),
+                    'error': {'code': -32601, 'message': 'Method not found'}}
+        addresses = (item.get('params') or [[]])[0]
+        self.addresses += len(addresses)
+        return {'jsonrpc': '2.0', 'id': item.get('id'), 'result': [handler(a) for a in addresses]}
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post('/', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def benchmark(tokens: int = 1000, latency: float = 0.05, max_batch: int = 100) -> Dict:
+    """قياس الإنتاجية: كل الأنواع لـ N عنوان عبر الخادم المحلي"""
+    server = LocalRpcServer(latency=latency)
+    url = await server.start()
+    session = aiohttp.ClientSession()
+    try:
+        registry = create_rpc_registry(session, {'solana': url}, max_batch=max_batch, timeout=120)
+        addresses = [f"token{i}" for i in range(tokens)]
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            registry.fetch(kind, 'solana', address) for address in addresses for kind in KIND_METHODS
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        await session.close()
+        await server.stop()
+    return {
+        'lookups': tokens * len(KIND_METHODS),
+        'rpc_calls': server.calls,
+        'seconds': round(elapsed, 3),
+        'lookups_per_second': round(tokens * len(KIND_METHODS) / elapsed)
+    }
+
+
+if __name__ == "__main__":
+    for batch_size in (1, 10, 100):
+        result = asyncio.run(benchmark(max_batch=batch_size))
+        print(f"max_batch={batch_size:>3}: {result}")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+⏱️ Scan Scheduler
+توقيت فحص متكيف لكل عملة + ميزانية طلبات عامة في الدقيقة
+
+- موعد الفحص التالي يتحدد من: نسبة ATR، قفزة الحجم، وآخر نقاط للعملة
+  الاستعجال = أكبر الثلاثة بعد تطبيعها إلى [0, 1]
+  الفترة = max_interval × (min_interval / max_interval) ^ الاستعجال
+  → عملة "قريبة" من الإشارة كل دقيقة، وعملة هادئة كل ساعة
+- heap مرتب بالموعد (حذف كسول للمدخلات القديمة بدل البحث داخل الـ heap)
+- due() لا يعيد أكثر مما تسمح به الميزانية المتبقية في آخر 60 ثانية؛
+  عند التزاحم الأعلى استعجالاً أولاً، والمتأخرون يعودون للـ heap للدورة التالية
+- العملة المُعادة من due() تبقى "قيد الفحص" حتى record/schedule؛ requeue يعيد
+  ما لم يُسجل منها (استثناء أثناء الدورة) حتى لا تختفي من الجدولة
+"""
+
+import heapq
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+BUDGET_WINDOW = 60.0  # ثانية
+
+
+class ScanScheduler:
+    """جدولة فحص العملات حسب النشاط تحت ميزانية طلبات ثابتة"""
+
+    def __init__(self, min_interval: float = 60, max_interval: float = 3600,
+                 requests_per_minute: int = 30, near_miss_score: float = 200,
+                 hot_atr_ratio: float = 1.3, hot_volume_spike: float = 3.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.requests_per_minute = requests_per_minute
+        self.near_miss_score = near_miss_score
+        self.hot_atr_ratio = hot_atr_ratio
+        self.hot_volume_spike = hot_volume_spike
+        self.clock = clock
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, int] = {}      # symbol → seq الصالح في الـ heap
+        self._urgency: Dict[str, float] = {}    # آخر استعجال (ترتيب المستحقين عند التزاحم)
+        self._universe: set = set()
+        self._inflight: set = set()             # أُعيدت من due() ولم تُجدول بعد
+        self._spent: Deque[float] = deque()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {'scans': 0, 'deferred': 0}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # الأولوية
+    # ------------------------------------------------------------------
+
+    def urgency(self, atr_ratio: float = 1.0, volume_spike: float = 1.0, score: float = 0) -> float:
+        """الاستعجال في [0, 1]: 0 هادئة، 1 قريبة من الإشارة أو نشطة جداً"""
+        def ramp(value, hot):
+            return min(1.0, max(0.0, (value - 1.0) / (hot - 1.0))) if hot > 1.0 else 0.0
+
+        return max(
+            ramp(atr_ratio, self.hot_atr_ratio),
+            ramp(volume_spike, self.hot_volume_spike),
+            min(1.0, max(0.0, score / self.near_miss_score)) if self.near_miss_score > 0 else 0.0
+        )
+
+    def interval(self, atr_ratio: float = 1.0, volume_spike: float = 1.0, score: float = 0) -> float:
+        """الفترة حتى الفحص التالي (ثوانٍ)"""
+        return self._delay(self.urgency(atr_ratio, volume_spike, score))
+
+    def _delay(self, urgency: float) -> float:
+        return self.max_interval * (self.min_interval / self.max_interval) ** urgency
+
+    # ------------------------------------------------------------------
+    # الـ heap
+    # ------------------------------------------------------------------
+
+    def _push(self, symbol: str, at: float):
+        self._seq += 1
+        self._entries[symbol] = self._seq
+        heapq.heappush(self._heap, (at, self._seq, symbol))
+
+    def sync(self, symbols: Iterable[str]) -> int:
+        """مزامنة قائمة العملات: الجديدة تُفحص فوراً والخارجة تُنسى - يعيد عدد الجديدة"""
+        symbols = list(dict.fromkeys(symbols))   # الترتيب (بالحجم) يحدد أولوية الجديدة
+        with self._lock:
+            self._universe = set(symbols)
+            for symbol in [s for s in self._entries if s not in self._universe]:
+                del self._entries[symbol]
+            for symbol in [s for s in self._urgency if s not in self._universe]:
+                del self._urgency[symbol]
+            now = self.clock()
+            self._inflight &= self._universe
+            fresh = [s for s in symbols if s not in self._entries and s not in self._inflight]
+            for symbol in fresh:
+                self._push(symbol, now)
+            # بدون هذا يكبر الـ heap بالمدخلات القديمة إذا تغيرت القائمة كثيراً
+            if len(self._heap) > 4 * max(1, len(self._entries)):
+                self._heap = [e for e in self._heap if self._entries.get(e[2]) == e[1]]
+                heapq.heapify(self._heap)
+            return len(fresh)
+
+    def schedule(self, symbol: str, delay: float, urgency: Optional[float] = None):
+        """موعد ثابت (مثلاً إعادة محاولة بعد فشل الجلب) - الاستعجال السابق يبقى إن لم يُحدد"""
+        with self._lock:
+            self._inflight.discard(symbol)
+            if symbol in self._universe:
+                if urgency is not None:
+                    self._urgency[symbol] = urgency
+                self._push(symbol, self.clock() + delay)
+
+    def requeue(self, symbols: Iterable[str], delay: float) -> int:
+        """إعادة جدولة ما بقي قيد الفحص من هذه العملات - يعيد عددها"""
+        with self._lock:
+            stranded = [s for s in dict.fromkeys(symbols) if s in self._inflight]
+            at = self.clock() + delay
+            for symbol in stranded:
+                self._inflight.discard(symbol)
+                if symbol in self._universe:
+                    self._push(symbol, at)
+            return len(stranded)
+
+    def record(self, symbol: str, atr_ratio: float = 1.0, volume_spike: float = 1.0, score: float = 0) -> float:
+        """نتيجة فحص: الموعد التالي حسب نشاط العملة - يعيد الفترة"""
+        urgency = self.urgency(atr_ratio, volume_spike, score)
+        delay = self._delay(urgency)
+        self.schedule(symbol, delay, urgency)
+        return delay
+
+    # ------------------------------------------------------------------
+    # الميزانية
+    # ------------------------------------------------------------------
+
+    def _budget_left(self, now: float) -> int:
+        while self._spent and now - self._spent[0] >= BUDGET_WINDOW:
+            self._spent.popleft()
+        return self.requests_per_minute - len(self._spent)
+
+    def due(self, limit: Optional[int] = None) -> List[str]:
+        """العملات المستحقة الآن بترتيب موعدها، بحد الميزانية المتبقية (تُخصم فوراً)"""
+        with self._lock:
+            now = self.clock()
+            capacity = self._budget_left(now)
+            if limit is not None:
+                capacity = min(capacity, limit)
+            ready = []
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                if self._entries.get(entry[2]) == entry[1]:   # غير ذلك: مدخل قديم
+                    ready.append(entry)
+            # الأعلى استعجالاً أولاً، ثم الأقدم موعداً (الجديدة بلا تاريخ تتقدم)
+            ready.sort(key=lambda e: (-self._urgency.get(e[2], 1.0), e[0], e[1]))
+            picked = [e[2] for e in ready[:max(0, capacity)]]
+            for entry in ready[len(picked):]:
+                heapq.heappush(self._heap, entry)
+            for symbol in picked:
+                del self._entries[symbol]       # قيد الفحص حتى record/schedule
+                self._inflight.add(symbol)
+                self._spent.append(now)
+            self.stats['scans'] += len(picked)
+            self.stats['deferred'] += len(ready) - len(picked)
+            return picked
+
+    def next_due_in(self) -> Optional[float]:
+        """ثوانٍ حتى يمكن فحص عملة (الموعد أو تجدد الميزانية) - None إذا لا شيء مجدول"""
+        with self._lock:
+            now = self.clock()
+            while self._heap and self._entries.get(self._heap[0][2]) != self._heap[0][1]:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            wait = max(0.0, self._heap[0][0] - now)
+            if self._budget_left(now) <= 0:
+                wait = max(wait, self._spent[0] + BUDGET_WINDOW - now)
+            return wait
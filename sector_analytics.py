@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧭 Sector Analytics
+دوران القطاعات: عائد كل قطاع، القوة النسبية، حصة الحجم والـ breadth لكل دورة مسح
+
+- SectorMap: قاموس القطاعات مُجمّع مرة واحدة إلى أكواد رقمية (رمز → كود قطاع)
+- compute_sector_stats: مصفوفات مقطعية (تغير 24h + حجم) ثم اختزالات مجمّعة
+  بـ np.bincount لكل القطاعات دفعة واحدة بدل حلقة لكل قطاع
+- عائد القطاع مرجّح بالحجم، والقوة النسبية = عائد القطاع - عائد السوق (مرجّح بالحجم)
+- الزخم: LEADING (قوة نسبية موجبة + أغلب العملات صاعدة) / LAGGING / NEUTRAL
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+OTHER_SECTOR = 'Other'
+
+
+class SectorMap:
+    """بحث القطاع المُجمّع: أسماء القطاعات بترتيب الظهور + كود لكل رمز"""
+
+    def __init__(self, sectors: Dict[str, str]):
+        self.names: List[str] = list(dict.fromkeys(list(sectors.values()) + [OTHER_SECTOR]))
+        codes = {name: i for i, name in enumerate(self.names)}
+        self.other = codes[OTHER_SECTOR]
+        self._codes: Dict[str, int] = {base.upper(): codes[name] for base, name in sectors.items()}
+
+    @staticmethod
+    def base(symbol: str) -> str:
+        """BTC/USDT أو BTCUSDT → BTC"""
+        return symbol.replace('/USDT', '').replace('USDT', '').strip().upper()
+
+    def code(self, symbol: str) -> int:
+        return self._codes.get(self.base(symbol), self.other)
+
+    def codes(self, symbols: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.code(s) for s in symbols), dtype=np.int64)
+
+    def sector(self, symbol: str) -> str:
+        return self.names[self.code(symbol)]
+
+
+class SectorSnapshot:
+    """إحصاءات القطاعات لدورة واحدة + ميزات كل عملة"""
+
+    def __init__(self, stats: Dict[str, Dict], membership: Dict[str, str], market_return: float):
+        self.stats = stats
+        self.membership = membership
+        self.market_return = market_return
+
+    def features(self, symbol: str) -> Optional[Dict]:
+        """ميزات قطاع العملة (None إذا لم تكن ضمن المسح)"""
+        sector = self.membership.get(symbol)
+        if sector is None:
+            return None
+        return dict(self.stats[sector], sector=sector)
+
+    def leaders(self, count: int = 3) -> List[str]:
+        """أقوى القطاعات بالقوة النسبية"""
+        ranked = sorted(self.stats, key=lambda s: self.stats[s]['relative_strength'], reverse=True)
+        return ranked[:count]
+
+
+def compute_sector_stats(coins: List[Dict], sector_map: SectorMap,
+                         rs_threshold: float = 1.0, breadth_threshold: float = 0.6) -> SectorSnapshot:
+    """
+    coins: قائمة العملات الممسوحة (symbol, change_24h, volume) كما في _get_top_25_coins
+    rs_threshold: القوة النسبية (نقاط %) اللازمة لاعتبار القطاع قائداً/متأخراً
+    """
+    if not coins:
+        return SectorSnapshot({}, {}, 0.0)
+
+    symbols = [c['symbol'] for c in coins]
+    codes = sector_map.codes(symbols)
+    change = np.array([c.get('change_24h') or 0.0 for c in coins], dtype=float)
+    volume = np.array([c.get('volume') or 0.0 for c in coins], dtype=float)
+    size = len(sector_map.names)
+
+    count = np.bincount(codes, minlength=size)
+    sector_volume = np.bincount(codes, weights=volume, minlength=size)
+    weighted = np.bincount(codes, weights=change * volume, minlength=size)
+    plain = np.bincount(codes, weights=change, minlength=size)
+    advancing = np.bincount(codes, weights=(change > 0).astype(float), minlength=size)
+
+    total_volume = volume.sum()
+    market_return = float((change * volume).sum() / total_volume) if total_volume > 0 else float(change.mean())
+
+    present = np.flatnonzero(count)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.where(sector_volume > 0, weighted / sector_volume, plain / np.maximum(count, 1))
+    relative = returns - market_return
+    breadth = advancing / np.maximum(count, 1)
+    share = sector_volume / total_volume if total_volume > 0 else np.zeros(size)
+    # ترتيب القطاعات الموجودة بالقوة النسبية (1 = الأقوى)
+    rank = np.empty(size, dtype=np.int64)
+    rank[present[np.argsort(-relative[present], kind='stable')]] = np.arange(1, len(present) + 1)
+
+    stats = {}
+    for code in present:
+        rs, br = float(relative[code]), float(breadth[code])
+        if rs >= rs_threshold and br >= breadth_threshold:
+            momentum = 'LEADING'
+        elif rs <= -rs_threshold and br <= 1 - breadth_threshold:
+            momentum = 'LAGGING'
+        else:
+            momentum = 'NEUTRAL'
+        stats[sector_map.names[code]] = {
+            'count': int(count[code]),
+            'return': float(returns[code]),
+            'relative_strength': rs,
+            'volume_share': float(share[code]),
+            'breadth': br,
+            'rank': int(rank[code]),
+            'momentum': momentum
+        }
+
+    membership = {s: sector_map.names[c] for s, c in zip(symbols, codes)}
+    return SectorSnapshot(stats, membership, market_return)
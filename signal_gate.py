@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🚦 Signal Gate
+حد الإشارات اليومي + الكولداون لكل عملة (مشترك بين البوتات)
+
+- عدادات اليوم الحالي (إجمالي + لكل مفتاح): فحص الحد O(1) بدل عدّ قائمة الإشارات
+- الكولداون: قاموس مفتاح → (وقت الإشارة، انتهاء الكولداون، بيانات إضافية) للعضوية O(1)
+  + min-heap لأوقات الانتهاء للحذف الكسول للمنتهي
+- آمن للاستخدام من عدة threads (البوتات تحلل العملات في ThreadPoolExecutor)
+"""
+
+import heapq
+import threading
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+
+class SignalGate:
+    """هل يُسمح بإشارة لهذا المفتاح الآن؟ ('daily_limit' / 'key_daily_limit' / 'cooldown' / None)"""
+
+    def __init__(self, cooldown_hours: float, max_per_day: Optional[int] = None,
+                 max_per_key_per_day: Optional[int] = None):
+        self.cooldown = timedelta(hours=cooldown_hours)
+        self.max_per_day = max_per_day
+        self.max_per_key_per_day = max_per_key_per_day
+
+        # عدادات اليوم الحالي (تُصفّر عند تغير اليوم)
+        self._day: Optional[date] = None
+        self._day_total = 0
+        self._day_keys: Counter = Counter()
+
+        # key -> (signal_time, expires_at, meta)
+        self._cooldowns: Dict[str, Tuple[datetime, datetime, Dict]] = {}
+        self._expiries: List[Tuple[datetime, str]] = []
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # الحالة الداخلية
+    # ------------------------------------------------------------------
+
+    def _roll_day(self, now: datetime):
+        if now.date() != self._day:
+            self._day = now.date()
+            self._day_total = 0
+            self._day_keys.clear()
+
+    def _evict(self, now: datetime):
+        """حذف الكولداون المنتهي من رأس الـ heap (المدخلات القديمة المكررة تُتجاهل)"""
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiries)
+            entry = self._cooldowns.get(key)
+            if entry is not None and entry[1] == expires_at:
+                del self._cooldowns[key]
+
+    # ------------------------------------------------------------------
+    # الواجهة
+    # ------------------------------------------------------------------
+
+    def blocked_reason(self, key: str, now: Optional[datetime] = None) -> Optional[str]:
+        """سبب المنع أو None إذا الإشارة مسموحة"""
+        with self._lock:
+            now = now or datetime.now()
+            self._roll_day(now)
+            if self.max_per_day is not None and self._day_total >= self.max_per_day:
+                return 'daily_limit'
+            if self.max_per_key_per_day is not None and self._day_keys[key] >= self.max_per_key_per_day:
+                return 'key_daily_limit'
+            self._evict(now)
+            if key in self._cooldowns:
+                return 'cooldown'
+            return None
+
+    def allow(self, key: str, now: Optional[datetime] = None) -> bool:
+        return self.blocked_reason(key, now) is None
+
+    def count(self, key: str, at: Optional[datetime] = None):
+        """عدّ إشارة في عدادات يومها (إشارات الأيام السابقة لا تُحسب)"""
+        with self._lock:
+            at = at or datetime.now()
+            self._roll_day(datetime.now())
+            if at.date() == self._day:
+                self._day_total += 1
+                self._day_keys[key] += 1
+
+    def start_cooldown(self, key: str, at: Optional[datetime] = None, **meta):
+        """بدء كولداون المفتاح من وقت الإشارة (meta: بيانات إضافية مثل آخر سعر)"""
+        with self._lock:
+            at = at or datetime.now()
+            expires_at = at + self.cooldown
+            if expires_at <= datetime.now():
+                return
+            self._cooldowns[key] = (at, expires_at, meta)
+            heapq.heappush(self._expiries, (expires_at, key))
+
+    def record(self, key: str, at: Optional[datetime] = None, **meta):
+        """تسجيل إشارة مرسلة: عدّ + كولداون"""
+        with self._lock:
+            at = at or datetime.now()
+            self.count(key, at)
+            self.start_cooldown(key, at, **meta)
+
+    def last_signal(self, key: str) -> Optional[Tuple[datetime, Dict]]:
+        """(وقت آخر إشارة، meta) إذا المفتاح في الكولداون"""
+        with self._lock:
+            self._evict(datetime.now())
+            entry = self._cooldowns.get(key)
+            return (entry[0], entry[2]) if entry is not None else None
+
+    def cooldown_remaining(self, key: str, now: Optional[datetime] = None) -> timedelta:
+        with self._lock:
+            now = now or datetime.now()
+            entry = self._cooldowns.get(key)
+            return max(timedelta(0), entry[1] - now) if entry is not None else timedelta(0)
+
+    @property
+    def today_count(self) -> int:
+        with self._lock:
+            self._roll_day(datetime.now())
+            return self._day_total
+
+    def key_count(self, key: str) -> int:
+        with self._lock:
+            self._roll_day(datetime.now())
+            return self._day_keys[key]
+
+    def __len__(self):
+        """عدد المفاتيح في الكولداون"""
+        with self._lock:
+            self._evict(datetime.now())
+            return len(self._cooldowns)
+
+    # ------------------------------------------------------------------
+    # الحفظ والاسترجاع
+    # ------------------------------------------------------------------
+
+    def to_state(self) -> Dict:
+        """قواميس بسيطة للحفظ (StateStore)"""
+        with self._lock:
+            self._evict(datetime.now())
+            return {
+                'day': self._day,
+                'total': self._day_total,
+                'per_key': dict(self._day_keys),
+                'cooldowns': {key: (at, meta) for key, (at, _, meta) in self._cooldowns.items()}
+            }
+
+    def restore_state(self, state: Dict):
+        with self._lock:
+            if not state:
+                return
+            today = datetime.now().date()
+            if state.get('day') == today:
+                self._roll_day(datetime.now())
+                self._day_total = state.get('total', 0)
+                self._day_keys.update(state.get('per_key', {}))
+            for key, (at, meta) in state.get('cooldowns', {}).items():
+                self.start_cooldown(key, at, **meta)
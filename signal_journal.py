@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📒 Signal Journal
+سجل دائم لكل إشارة يتم إرسالها مع تتبع النتيجة (T1 / T2 / SL / EXPIRED)
+
+- جدول SQLite مفهرس بوضع WAL (يسمح بعدة بوتات على نفس الملف)
+- إدخال دفعي من خيط خلفي (لا يتأخر إرسال التنبيه بسبب القرص)
+- مُقيِّم خلفي يحسم نتيجة الإشارات المفتوحة من الشموع
+- بعد لمس T1 بدون T2 يُسجل الخروج الفعلي: T1_SL (عند الوقف) أو T1_EXPIRED (آخر إغلاق)
+- إحصائيات الأداء لكل بوت / استراتيجية
+"""
+
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+# candle_fetcher(instrument, since_ms) -> [[ts, open, high, low, close, volume], ...]
+CandleFetcher = Callable[[str, int], List[List[float]]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id           TEXT PRIMARY KEY,
+    bot          TEXT NOT NULL,
+    strategy     TEXT,
+    symbol       TEXT NOT NULL,
+    instrument   TEXT NOT NULL,
+    side         TEXT NOT NULL,
+    entry        REAL NOT NULL,
+    target1      REAL NOT NULL,
+    target2      REAL NOT NULL,
+    stop_loss    REAL NOT NULL,
+    score        REAL,
+    created_at   INTEGER NOT NULL,
+    expires_at   INTEGER NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'OPEN',
+    outcome      TEXT,
+    t1_hit_at    INTEGER,
+    closed_at    INTEGER,
+    exit_price   REAL,
+    pnl_pct      REAL,
+    last_checked INTEGER,
+    meta         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_signals_open ON signals (bot, status);
+CREATE INDEX IF NOT EXISTS idx_signals_strategy ON signals (bot, strategy, created_at);
+CREATE INDEX IF NOT EXISTS idx_signals_symbol ON signals (symbol, created_at);
+"""
+
+_INSERT = """
+INSERT OR IGNORE INTO signals (
+    id, bot, strategy, symbol, instrument, side, entry, target1, target2,
+    stop_loss, score, created_at, expires_at, last_checked, meta
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def ccxt_candle_fetcher(exchange, timeframe: str = '5m', limit: int = 300) -> CandleFetcher:
+    """مُحضر شموع من أي منصة ccxt"""
+    def fetch(instrument: str, since_ms: int) -> List[List[float]]:
+        return exchange.fetch_ohlcv(instrument, timeframe, since=since_ms, limit=limit) or []
+    return fetch
+
+
+class SignalJournal:
+    """سجل الإشارات + تقييم النتائج في الخلفية"""
+
+    def __init__(self, db_path: str, bot: str,
+                 candle_fetcher: Optional[CandleFetcher] = None,
+                 default_max_hours: float = 24.0,
+                 batch_size: int = 50,
+                 flush_interval: float = 2.0,
+                 eval_interval: float = 300.0):
+        self.db_path = db_path
+        self.bot = bot
+        self.candle_fetcher = candle_fetcher
+        self.default_max_hours = default_max_hours
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.eval_interval = eval_interval
+
+        self._pending: List[tuple] = []
+        self._pending_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_eval = 0.0
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # التسجيل
+    # ------------------------------------------------------------------
+
+    def record(self, symbol: str, side: str, entry: float, target1: float, target2: float,
+               stop_loss: float, strategy: str = '', score: float = None,
+               instrument: str = None, max_hours: float = None, meta: Dict = None) -> str:
+        """تسجيل إشارة (غير حاجب - تُكتب ضمن الدفعة التالية)"""
+        signal_id = uuid.uuid4().hex
+        now_ms = int(time.time() * 1000)
+        hours = max_hours if max_hours else self.default_max_hours
+        row = (
+            signal_id, self.bot, strategy, symbol, instrument or symbol, side.upper(),
+            float(entry), float(target1), float(target2), float(stop_loss),
+            None if score is None else float(score),
+            now_ms, now_ms + int(hours * 3600 * 1000), now_ms,
+            json.dumps(meta, ensure_ascii=False, default=str) if meta else None
+        )
+
+        with self._pending_lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+        return signal_id
+
+    def flush(self) -> int:
+        """كتابة الإشارات المعلقة دفعة واحدة"""
+        with self._pending_lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+
+        try:
+            with self._db_lock, self._conn:
+                self._conn.executemany(_INSERT, rows)
+        except sqlite3.Error as e:
+            logging.error(f"❌ فشل حفظ {len(rows)} إشارة في السجل: {e}")
+            with self._pending_lock:
+                self._pending[:0] = rows
+            return 0
+        return len(rows)
+
+    def close_signal(self, signal_id: str, outcome: str, exit_price: float, closed_at_ms: int = None):
+        """إغلاق إشارة يدوياً (مثلاً من مراقب الصفقات)"""
+        self.flush()
+        with self._db_lock, self._conn:
+            row = self._conn.execute(
+                "SELECT side, entry FROM signals WHERE id = ? AND status = 'OPEN'", (signal_id,)
+            ).fetchone()
+            if row is None:
+                return
+            self._close(signal_id, outcome, exit_price, row[0], row[1],
+                        closed_at_ms or int(time.time() * 1000))
+
+    # ------------------------------------------------------------------
+    # تقييم النتائج
+    # ------------------------------------------------------------------
+
+    def evaluate_open(self) -> int:
+        """حسم نتيجة الإشارات المفتوحة من الشموع الجديدة فقط"""
+        if self.candle_fetcher is None:
+            return 0
+
+        self.flush()
+        with self._db_lock:
+            open_rows = self._conn.execute(
+                "SELECT id, instrument, side, entry, target1, target2, stop_loss, "
+                "expires_at, t1_hit_at, last_checked FROM signals "
+                "WHERE bot = ? AND status = 'OPEN'", (self.bot,)
+            ).fetchall()
+
+        closed = 0
+        for row in open_rows:
+            try:
+                candles = self.candle_fetcher(row[1], row[9])
+            except Exception as e:
+                logging.debug(f"Journal candle fetch failed for {row[1]}: {e}")
+                continue
+            if self._apply_candles(row, candles):
+                closed += 1
+
+        return closed
+
+    def _apply_candles(self, row: tuple, candles: List[List[float]]) -> bool:
+        """تطبيق الشموع على إشارة واحدة - يعيد True إذا أُغلقت"""
+        (signal_id, _, side, entry, target1, target2, stop_loss,
+         expires_at, t1_hit_at, last_checked) = row
+        is_buy = side == 'BUY'
+        last_close = None
+
+        for candle in candles:
+            ts, high, low, close = int(candle[0]), candle[2], candle[3], candle[4]
+            if ts < last_checked or ts > expires_at:
+                continue
+            last_checked = ts
+            last_close = close
+
+            favorable = high if is_buy else low
+            adverse = low if is_buy else high
+            hit_sl = adverse <= stop_loss if is_buy else adverse >= stop_loss
+            hit_t1 = favorable >= target1 if is_buy else favorable <= target1
+            hit_t2 = favorable >= target2 if is_buy else favorable <= target2
+
+            # نفس الشمعة تلمس الهدف والوقف: نفترض الأسوأ (الوقف أولاً)
+            if t1_hit_at is None:
+                if hit_sl:
+                    return self._close_locked(signal_id, 'SL', stop_loss, side, entry, ts)
+                if hit_t2:
+                    return self._close_locked(signal_id, 'T2', target2, side, entry, ts, t1_hit_at=ts)
+                if hit_t1:
+                    t1_hit_at = ts
+            else:
+                if hit_sl:
+                    return self._close_locked(signal_id, 'T1_SL', stop_loss, side, entry, ts, t1_hit_at)
+                if hit_t2:
+                    return self._close_locked(signal_id, 'T2', target2, side, entry, ts, t1_hit_at)
+
+        now_ms = int(time.time() * 1000)
+        if now_ms >= expires_at:
+            exit_price = last_close if last_close is not None else entry
+            outcome = 'EXPIRED' if t1_hit_at is None else 'T1_EXPIRED'
+            return self._close_locked(signal_id, outcome, exit_price, side, entry, now_ms, t1_hit_at)
+
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "UPDATE signals SET t1_hit_at = ?, last_checked = ? WHERE id = ? AND status = 'OPEN'",
+                (t1_hit_at, last_checked, signal_id)
+            )
+        return False
+
+    def _close_locked(self, signal_id: str, outcome: str, exit_price: float, side: str,
+                      entry: float, closed_at_ms: int, t1_hit_at: int = None) -> bool:
+        with self._db_lock, self._conn:
+            return self._close(signal_id, outcome, exit_price, side, entry, closed_at_ms, t1_hit_at)
+
+    def _close(self, signal_id: str, outcome: str, exit_price: float, side: str,
+               entry: float, closed_at_ms: int, t1_hit_at: int = None) -> bool:
+        """إغلاق إشارة ما زالت مفتوحة فقط - إغلاق سابق (مثلاً من مراقب الصفقات) لا يُستبدل"""
+        direction = 1 if side == 'BUY' else -1
+        pnl_pct = (exit_price - entry) / entry * 100 * direction if entry else 0.0
+        cursor = self._conn.execute(
+            "UPDATE signals SET status = 'CLOSED', outcome = ?, exit_price = ?, pnl_pct = ?, "
+            "closed_at = ?, last_checked = ?, t1_hit_at = COALESCE(t1_hit_at, ?) "
+            "WHERE id = ? AND status = 'OPEN'",
+            (outcome, exit_price, pnl_pct, closed_at_ms, closed_at_ms, t1_hit_at, signal_id)
+        )
+        if cursor.rowcount != 1:
+            return False
+        logging.info(f"📒 Journal: {signal_id[:8]} → {outcome} ({pnl_pct:+.2f}%)")
+        return True
+
+    # ------------------------------------------------------------------
+    # الإحصائيات
+    # ------------------------------------------------------------------
+
+    def get_stats(self, bot: str = None, since_ms: int = None) -> List[Dict]:
+        """
+        إحصائيات الأداء لكل (بوت، استراتيجية)
+        target1 = لمست T1 ولم تصل T2 (T1 / T1_SL / T1_EXPIRED) - الربح حسب سعر الخروج الفعلي
+        """
+        self.flush()
+        query = (
+            "SELECT bot, strategy, COUNT(*), "
+            "SUM(status = 'OPEN'), SUM(IFNULL(outcome = 'T2', 0)), "
+            "SUM(IFNULL(outcome IN ('T1', 'T1_SL', 'T1_EXPIRED'), 0)), SUM(IFNULL(outcome = 'T1_SL', 0)), "
+            "SUM(IFNULL(outcome = 'SL', 0)), SUM(IFNULL(outcome = 'EXPIRED', 0)), "
+            "SUM(IFNULL(outcome IN ('T1', 'T1_SL', 'T1_EXPIRED', 'TRAIL') AND pnl_pct > 0, 0)), "
+            "SUM(IFNULL(outcome = 'TRAIL', 0)), "
+            "AVG(pnl_pct) "
+            "FROM signals WHERE 1 = 1"
+        )
+        params = []
+        if bot:
+            query += " AND bot = ?"
+            params.append(bot)
+        if since_ms:
+            query += " AND created_at >= ?"
+            params.append(since_ms)
+        query += " GROUP BY bot, strategy ORDER BY bot, strategy"
+
+        with self._db_lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        stats = []
+        for (bot_name, strategy, total, open_count, t2, t1, t1_sl, sl, expired,
+             partial_wins, trailing, avg_pnl) in rows:
+            closed = total - open_count
+            wins = t2 + partial_wins
+            stats.append({
+                'bot': bot_name,
+                'strategy': strategy,
+                'total': total,
+                'open': open_count,
+                'closed': closed,
+                'target1': t1,
+                't1_then_stop': t1_sl,
+                'target2': t2,
+                'stop_loss': sl,
+                'expired': expired,
+                'trailing': trailing,
+                'win_rate': (wins / closed * 100) if closed else 0.0,
+                'avg_pnl_pct': avg_pnl or 0.0
+            })
+        return stats
+
+    # ------------------------------------------------------------------
+    # الخيط الخلفي
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """بدء الكتابة الدفعية والتقييم في الخلفية"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """إيقاف الخيط الخلفي وكتابة ما تبقى"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self.flush()
+
+    def close(self):
+        self.stop()
+        with self._db_lock:
+            self._conn.close()
+
+    def _worker_loop(self):
+        while not self._stop_event.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+            if time.time() - self._last_eval >= self.eval_interval:
+                self._last_eval = time.time()
+                try:
+                    self.evaluate_open()
+                except Exception as e:
+                    logging.warning(f"⚠️ Journal evaluation failed: {e}")
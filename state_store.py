@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+💾 State Snapshot Store
+حفظ حالة البوت (الكاش، الـ Cooldown، سجل التنبيهات) واسترجاعها بعد إعادة التشغيل
+
+- صيغة ثنائية مضغوطة (pickle)
+- كتابة ذرية: ملف مؤقت + fsync + os.replace
+- حفظ دوري في خيط خلفي + حفظ نهائي عند الإيقاف
+"""
+
+import os
+import time
+import pickle
+import logging
+import tempfile
+import threading
+from typing import Callable, Dict, Optional
+
+# رقم إصدار الصيغة - يتم تجاهل اللقطات ذات الإصدار المختلف
+STATE_FORMAT_VERSION = 1
+
+
+class StateStore:
+    """لقطات حالة دورية آمنة ضد الأعطال (atomic write-rename)"""
+
+    def __init__(self, path: str, interval: float = 60.0):
+        self.path = path
+        self.interval = interval
+        self.last_saved_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._provider: Optional[Callable[[], Dict]] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self) -> Dict:
+        """تحميل آخر لقطة (قاموس فارغ إذا لم توجد أو كانت تالفة)"""
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, 'rb') as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            logging.warning(f"⚠️ تعذر تحميل لقطة الحالة {self.path}: {e}")
+            return {}
+
+        if not isinstance(payload, dict) or payload.get('version') != STATE_FORMAT_VERSION:
+            logging.warning(f"⚠️ لقطة الحالة {self.path} بإصدار غير مدعوم - تم تجاهلها")
+            return {}
+
+        age = time.time() - payload.get('saved_at', 0)
+        logging.info(f"💾 تم استرجاع الحالة من {self.path} (عمرها {age:.0f}s)")
+        return payload.get('state') or {}
+
+    def save(self, state: Dict) -> bool:
+        """حفظ ذري: الكتابة في ملف مؤقت ثم استبداله بالملف الأصلي"""
+        payload = {
+            'version': STATE_FORMAT_VERSION,
+            'saved_at': time.time(),
+            'state': state
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(prefix='.state-', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+                self._fsync_directory(directory)
+            except Exception as e:
+                logging.warning(f"⚠️ فشل حفظ لقطة الحالة {self.path}: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return False
+
+        self.last_saved_at = payload['saved_at']
+        return True
+
+    def checkpoint(self) -> bool:
+        """أخذ لقطة من المزوّد وحفظها"""
+        if self._provider is None:
+            return False
+        try:
+            state = self._provider()
+        except Exception as e:
+            logging.warning(f"⚠️ فشل تجهيز لقطة الحالة: {e}")
+            return False
+        return self.save(state)
+
+    def start(self, provider: Callable[[], Dict]):
+        """بدء الحفظ الدوري في خيط خلفي"""
+        self._provider = provider
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._checkpoint_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """إيقاف الحفظ الدوري مع حفظ نهائي"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.checkpoint()
+
+    def _checkpoint_loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.checkpoint()
+
+    @staticmethod
+    def _fsync_directory(directory: str):
+        """تثبيت عملية rename على القرص (POSIX فقط)"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
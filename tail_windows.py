@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📏 Tail Windows
+إحصاءات كل نوافذ الذيل (آخر L شمعة لكل L) في تمريرة واحدة O(n)
+
+كشف الـ Range/Consolidation كان يقطع df.iloc[-L:] ويعيد حساب max/min لكل طول نافذة
+(17 مرة في البوت المتكيف). هنا نعكس الذيل ونحسب max/min التراكمي مرة واحدة:
+  high[L-1] = أعلى high في آخر L شمعة، low[L-1] = أدنى low، close_sum[L-1] = مجموع الإغلاقات
+ثم تُقيّم كل أطوال النوافذ من هذه المصفوفات مباشرة.
+مشترك بين البوت المتقدم و Crypto Killer والبوت المتكيف.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class TailWindows:
+    """max/min/mean لآخر L شمعة لكل L ≤ max_len (NaN يُتجاهل مثل pandas)"""
+
+    def __init__(self, df: pd.DataFrame, max_len: int):
+        tail = df.iloc[-max_len:]
+        self.length = len(tail)
+        self.high = np.fmax.accumulate(tail['high'].to_numpy(dtype=float)[::-1])
+        self.low = np.fmin.accumulate(tail['low'].to_numpy(dtype=float)[::-1])
+        self.close_sum = np.cumsum(tail['close'].to_numpy(dtype=float)[::-1])
+
+    def _at(self, length: int) -> int:
+        # نافذة أطول من البيانات = كل البيانات (مثل df.iloc[-L:])
+        return min(length, self.length) - 1
+
+    def high_of(self, length: int) -> float:
+        return self.high[self._at(length)]
+
+    def low_of(self, length: int) -> float:
+        return self.low[self._at(length)]
+
+    def mean_of(self, length: int) -> float:
+        return self.close_sum[self._at(length)] / min(length, self.length)
+
+    def range_pct(self) -> np.ndarray:
+        """(high - low) / low لكل طول نافذة 1..length"""
+        return (self.high - self.low) / self.low
+
+    def longest_tight(self, min_len: int, max_len: int, max_range: float) -> Optional[Dict]:
+        """
+        أطول نافذة بين min_len و max_len مداها ≤ max_range
+        (نفس نتيجة التجربة من max_len نزولاً إلى min_len وإرجاع أول نافذة ضيقة)
+        """
+        if self.length == 0:
+            return None
+        lengths = np.arange(max_len, min_len - 1, -1)
+        at = np.minimum(lengths, self.length) - 1
+        ranges = self.range_pct()[at]
+        tight = np.flatnonzero(ranges <= max_range)
+        if len(tight) == 0:
+            return None
+        first = tight[0]
+        return {
+            'length': int(lengths[first]),
+            'high': self.high[at[first]],
+            'low': self.low[at[first]],
+            'range_pct': ranges[first]
+        }
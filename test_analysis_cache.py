@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Analysis Cache
+اختبار تحليل الاتجاه على الشموع المغلقة مرة واحدة لكل شمعة، والسعر اللحظي من الشمعة قيد التكوين
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analysis_cache import AnalysisCache, closed_candles, config_fingerprint, last_closed_ts
+from advanced_trading_bot import AdvancedTradingBot, TechnicalAnalyzer, TradingConfig
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def _frame(closed=120, forming_close=None, seed=49, freq='4h'):
+    """شموع مغلقة + شمعة قيد التكوين (إغلاقها فقط = forming_close)"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, closed + 1)))
+    index = pd.date_range('2024-01-01', periods=closed + 1, freq=freq, name='timestamp')
+    df = pd.DataFrame({'open': close, 'high': close * 1.01, 'low': close * 0.99,
+                       'close': close, 'volume': rng.uniform(1, 100, closed + 1)}, index=index)
+    if forming_close is not None:
+        df.iloc[-1, df.columns.get_loc('close')] = forming_close
+    return df
+
+
+def _bot():
+    bot = object.__new__(AdvancedTradingBot)
+    bot.analyzer = TechnicalAnalyzer()
+    bot.analysis_cache = AnalysisCache(16)
+    calls = []
+    analyze = bot.analyzer.analyze_candles
+
+    def counted(df, symbol=""):
+        calls.append(symbol)
+        return analyze(df, symbol)
+    bot.analyzer.analyze_candles = counted
+    return bot, calls
+
+
+def _cycle(bot, trend_df, entry_df):
+    """دورة _analyze_all_coins حقيقية لعملة واحدة - يعيد (تحليل الاتجاه، تحليل الدخول) المُمررين للإشارة"""
+    frames = {TradingConfig.TREND_TIMEFRAME: trend_df, TradingConfig.ENTRY_TIMEFRAME: entry_df}
+    seen = []
+    generate = TechnicalAnalyzer.generate_trading_signal.__get__(bot.analyzer)
+
+    def capture(entry_analysis, trend_analysis, sector=None):
+        seen.append((trend_analysis, entry_analysis))
+        return generate(entry_analysis, trend_analysis, sector)
+    bot.analyzer.generate_trading_signal = capture
+    bot.top_coins = [{'symbol': 'BTC/USDT', 'price': float(entry_df['close'].iloc[-1])}]
+    bot._compute_sectors = lambda: None
+    bot._get_cached_klines = lambda symbol, timeframe, limit=100: frames[timeframe]
+    bot._send_trading_alert = lambda *args: None
+    bot._analyze_all_coins()
+    return seen[0]
+
+
+def test_trend_cached_across_cycles():
+    """Test two scan cycles with a moved forming candle reuse the 4h trend analysis"""
+    bot, calls = _bot()
+    first_trend, first_entry = _cycle(bot, _frame(forming_close=80.0),
+                                      _frame(forming_close=80.0, seed=7, freq='15min'))
+    second_trend, second_entry = _cycle(bot, _frame(forming_close=130.0),
+                                        _frame(forming_close=130.0, seed=7, freq='15min'))
+
+    print_test("trend cache hit on the second cycle", bot.analysis_cache.stats['hits'] == 1
+               and bot.analysis_cache.stats['misses'] == 1, str(bot.analysis_cache.stats))
+    print_test("trend computed once, entry every cycle", len(calls) == 3)
+    print_test("trend price is live", first_trend['current_price'] == 80.0 and second_trend['current_price'] == 130.0)
+    print_test("trend indicators from closed candles only",
+               repr(second_trend['ema']) == repr(TechnicalAnalyzer().analyze_candles(
+                   closed_candles(_frame()), 'BTC/USDT')['ema']))
+    print_test("entry follows the forming candle",
+               first_entry['rsi']['value'] < second_entry['rsi']['value']
+               and first_entry['signal_type'] == TechnicalAnalyzer().analyze_candles(
+                   _frame(forming_close=80.0, seed=7, freq='15min'), 'BTC/USDT')['signal_type'],
+               f"RSI {first_entry['rsi']['value']:.0f} → {second_entry['rsi']['value']:.0f}")
+
+    _cycle(bot, _frame(closed=121), _frame(seed=7, freq='15min'))
+    print_test("new closed 4h candle recomputes", bot.analysis_cache.stats['misses'] == 2)
+
+
+def test_config_change_and_identity():
+    """Test a config change invalidates and a miss equals a direct analysis"""
+    bot, calls = _bot()
+    df = _frame()
+    first = bot._analyze_trend('SOL/USDT', df, config_fingerprint(TradingConfig))
+
+    original = TradingConfig.SCALPING_MODE
+    TradingConfig.SCALPING_MODE = not original
+    try:
+        changed = config_fingerprint(TradingConfig)
+    finally:
+        TradingConfig.SCALPING_MODE = original
+    bot._analyze_trend('SOL/USDT', df, changed)
+    print_test("config change recomputes", len(calls) == 2 and changed != config_fingerprint(TradingConfig))
+
+    direct = TechnicalAnalyzer().analyze_candles(closed_candles(df), 'SOL/USDT')
+    direct['current_price'] = float(df['close'].iloc[-1])
+    print_test("same as direct analysis of closed candles", repr(first) == repr(direct))
+
+    enabled = TradingConfig.ANALYSIS_CACHE_ENABLED
+    TradingConfig.ANALYSIS_CACHE_ENABLED = False
+    try:
+        bot._analyze_trend('SOL/USDT', df, changed)
+        print_test("cache disabled", len(calls) == 3)
+    finally:
+        TradingConfig.ANALYSIS_CACHE_ENABLED = enabled
+
+
+def test_cache_bounds():
+    """Test LRU bound, missing timestamps and None results"""
+    cache = AnalysisCache(2)
+    for symbol in 'ABC':
+        cache.get_or_compute(symbol, '4h', 1, 'h', lambda: {'x': 1})
+    print_test("LRU bound", len(cache) == 2 and cache.stats['evictions'] == 1)
+    print_test("no timestamp → not cached", cache.get_or_compute('D', '4h', None, 'h', lambda: 1) == 1
+               and len(cache) == 2)
+    print_test("None not cached", cache.get_or_compute('E', '4h', 1, 'h', lambda: None) is None
+               and ('E', '4h') not in cache._entries)
+    df = _frame(closed=3)
+    print_test("last closed ts", last_closed_ts(df) == df.index[-2] and last_closed_ts(None) is None
+               and last_closed_ts(_frame(closed=3, forming_close=1.0)) == df.index[-2])
+    print_test("closed candles", len(closed_candles(df)) == 3 and closed_candles(df).index[-1] == df.index[-2])
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Analysis Cache - Test Suite")
+    print("=" * 60)
+
+    test_trend_cached_across_cycles()
+    test_config_change_and_identity()
+    test_cache_bounds()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Batch Indicators
+اختبار حساب المؤشرات لكل العملات دفعة واحدة مقابل pandas / ta
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import ta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_indicators import BatchIndicators
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def _make_frames(seed=11):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    # أطوال مختلفة لاختبار الحشو من اليسار
+    for i, length in enumerate((200, 150, 60, 100, 200)):
+        close = 50 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+        close[length // 2] = close[length // 2 - 1]  # شمعة بدون تغيير
+        frames[f"S{i}/USDT"] = pd.DataFrame({
+            'open': close * (1 + rng.normal(0, 0.002, length)),
+            'high': close * (1 + rng.uniform(0, 0.01, length)),
+            'low': close * (1 - rng.uniform(0, 0.01, length)),
+            'close': close,
+            'volume': rng.uniform(100, 1000, length)
+        })
+    return frames
+
+
+def _same(a, b):
+    return np.array_equal(np.asarray(a, dtype=float), np.asarray(b, dtype=float), equal_nan=True)
+
+
+def test_exact_match():
+    """Test EMA / RSI / ATR are bit-identical to pandas and ta"""
+    frames = _make_frames()
+    batch = BatchIndicators(frames)
+
+    for symbol, df in frames.items():
+        view = batch.view(symbol)
+        ok = (
+            _same(view.ema(21), df['close'].ewm(span=21, adjust=False).mean())
+            and _same(view.ema_indicator(9), ta.trend.ema_indicator(df['close'], 9))
+            and _same(view.rsi(14), ta.momentum.rsi(df['close'], window=14))
+            and _same(view.atr(14), ta.volatility.average_true_range(df['high'], df['low'], df['close'], 14))
+        )
+        print_test(f"{symbol} EMA/RSI/ATR exact", ok, f"{len(df)} candles")
+
+
+def test_rolling_match():
+    """Test Bollinger and volume mean match within float tolerance"""
+    frames = _make_frames()
+    batch = BatchIndicators(frames)
+
+    for symbol, df in frames.items():
+        view = batch.view(symbol)
+        bands = view.bollinger(20, 2)
+        reference = ta.volatility.BollingerBands(df['close'], window=20, window_dev=2)
+        ok = (
+            np.allclose(bands['upper'], reference.bollinger_hband(), rtol=1e-12, equal_nan=True)
+            and np.allclose(bands['lower'], reference.bollinger_lband(), rtol=1e-12, equal_nan=True)
+            and np.allclose(view.volume_mean(20), df['volume'].rolling(20).mean(), rtol=1e-12, equal_nan=True)
+        )
+        print_test(f"{symbol} Bollinger/volume mean", ok)
+
+    print_test("missing symbol", batch.view('NOPE/USDT') is None)
+    print_test("empty frame skipped", len(BatchIndicators({'A': None, 'B': pd.DataFrame()})) == 0)
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Batch Indicators - Test Suite")
+    print("=" * 60)
+
+    test_exact_match()
+    test_rolling_match()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Candle Resampler
+اختبار بناء 1h/4h/1d محلياً من شموع 15m مقابل تجميع pandas، محاذاة OKX، وإعادة الـ seed
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from candle_resampler import CandleResampler, bucket_start, TIMEFRAME_MS
+
+BASE_MS = TIMEFRAME_MS['15m']
+RULES = {'1h': ('1h', '0h'), '4h': ('4h', '0h'), '1d': ('24h', '16h')}
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def _base_stream(days=12, seed=44):
+    rng = np.random.default_rng(seed)
+    n = days * 96
+    start = 1_700_000_000_000 // BASE_MS * BASE_MS + 5 * BASE_MS  # لا يبدأ على حد ساعة
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    return [[start + i * BASE_MS, open_[i], max(open_[i], close[i]) + rng.uniform(0, 0.2),
+             min(open_[i], close[i]) - rng.uniform(0, 0.2), close[i], float(rng.integers(1, 1000))]
+            for i in range(n)]
+
+
+def _rest(base, end, timeframe, limit=100):
+    """محاكاة fetch_ohlcv للإطار الأعلى: تجميع pandas حتى الشمعة end (قيد التكوين)"""
+    df = pd.DataFrame(base[:end + 1], columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df.index = pd.to_datetime(df['timestamp'], unit='ms')
+    rule, offset = RULES[timeframe]
+    agg = df.resample(rule, origin='epoch', offset=offset).agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}).dropna()
+    stamps = [int(ts.timestamp() * 1000) for ts in agg.index]
+    return [[ts] + row for ts, row in zip(stamps, agg.values.tolist())][-limit:]
+
+
+def test_okx_alignment():
+    """Test 4h buckets start on UTC hours and daily ones at 16:00 UTC"""
+    ts = int(pd.Timestamp('2024-03-05 15:59', tz='UTC').value // 10**6)
+    day = pd.Timestamp(bucket_start(ts, '1d'), unit='ms')
+    four = pd.Timestamp(bucket_start(ts, '4h'), unit='ms')
+    print_test("daily at 16:00 UTC", day == pd.Timestamp('2024-03-04 16:00'), str(day))
+    print_test("4h at UTC boundary", four == pd.Timestamp('2024-03-05 12:00'), str(four))
+    print_test("16:00 opens a new day",
+               bucket_start(ts + 60_000, '1d') == ts + 60_000)
+
+
+def test_matches_rest():
+    """Test locally built bars equal exchange-style aggregation on every scan"""
+    base = _base_stream()
+    resampler = CandleResampler('15m', ('1h', '4h', '1d'))
+    rest_calls = {'base': 0, 'higher': 0}
+    mismatches, checks = 0, 0
+
+    for end in range(150, len(base), 3):  # مسح كل 45 دقيقة
+        for timeframe in resampler.timeframes:
+            if resampler.needs_seed('ETH', timeframe):
+                resampler.seed('ETH', timeframe, _rest(base, end, timeframe))
+                rest_calls['higher'] += 1
+        resampler.update('ETH', base[max(0, end - 99):end + 1])
+        rest_calls['base'] += 1
+
+        for timeframe in resampler.timeframes:
+            local = resampler.bars('ETH', timeframe, 100)
+            mismatches += local != _rest(base, end, timeframe)
+            checks += 1
+
+    print_test("identical to REST bars", mismatches == 0, f"{checks} comparisons")
+    print_test("higher timeframes fetched once", rest_calls['higher'] == 3, str(rest_calls))
+
+    frame = resampler.frame('ETH', '4h', 20)
+    print_test("frame shape", list(frame.columns) == ['open', 'high', 'low', 'close', 'volume']
+               and len(frame) == 20 and frame.index.name == 'timestamp')
+
+
+def test_gap_and_partial():
+    """Test missing base candles force a reseed and partial history is not trusted"""
+    base = _base_stream(days=3)
+    resampler = CandleResampler('15m', ('4h',))
+
+    # بدون seed وبداية من منتصف الشمعة: لا بيانات موثوقة
+    resampler.update('SOL', base[:10])
+    print_test("no history without seed", resampler.bars('SOL', '4h') is None
+               and resampler.needs_seed('SOL', '4h'))
+
+    resampler.seed('SOL', '4h', _rest(base, 120, '4h'))
+    resampler.update('SOL', base[9:121])
+    print_test("seed after updates", resampler.bars('SOL', '4h') == _rest(base, 120, '4h'))
+
+    resampler.update('SOL', base[200:260])  # فجوة ~5 ساعات
+    print_test("gap resets history", resampler.needs_seed('SOL', '4h') and resampler.stats['resets'] == 1)
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Candle Resampler - Test Suite")
+    print("=" * 60)
+
+    test_okx_alignment()
+    test_matches_rest()
+    test_gap_and_partial()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
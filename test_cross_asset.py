@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Cross Asset
+اختبار الارتباط والـ Beta بعملية مصفوفة واحدة مقابل pandas لكل زوج، وفلتر هبوط BTC في V7
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cross_asset import compute_cross_asset
+from crypto_killer_v7_enhanced import Config, MarketContext, SignalEvaluator
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def _frames(symbols=('BTC', 'ETH', 'SOL', 'XRP', 'DOGE'), n=100, btc_drop=0.0, seed=47):
+    """عملات تتبع BTC بأوزان مختلفة؛ btc_drop = هبوط BTC في آخر 4 شموع"""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, n)
+    market[-4:] += btc_drop / 4
+    start = 1_700_000_000_000
+    frames = {}
+    for k, symbol in enumerate(symbols):
+        weight = 1.0 if symbol == 'BTC' else [0.9, 0.8, 0.1, 0.5][(k - 1) % 4]
+        noise = 0 if symbol == 'BTC' else rng.normal(0, 0.01, n)
+        close = 100 * np.exp(np.cumsum(weight * market + noise))
+        frames[f"{symbol}/USDT"] = pd.DataFrame({
+            'timestamp': start + np.arange(n) * 3_600_000, 'open': close, 'high': close * 1.002,
+            'low': close * 0.998, 'close': close, 'volume': 1.0
+        })
+    return frames
+
+
+def test_matches_pairwise():
+    """Test the matrix correlation and beta equal per-pair pandas computations"""
+    frames = _frames()
+    snapshot = compute_cross_asset(frames, window=48)
+    returns = {s: np.log(df['close'].tail(49)).diff().dropna().reset_index(drop=True)
+               for s, df in frames.items()}
+    errors = []
+    for symbol, r in returns.items():
+        for bench in ('BTC/USDT', 'ETH/USDT'):
+            b = returns[bench]
+            errors.append(abs(snapshot.correlation[symbol][bench] - r.corr(b)))
+            errors.append(abs(snapshot.beta[symbol][bench] - r.cov(b) / b.var()))
+    print_test("same as pairwise pandas", max(errors) < 1e-9, f"max error {max(errors):.1e}")
+    print_test("self correlation", abs(snapshot.correlation['BTC/USDT']['BTC/USDT'] - 1) < 1e-12)
+
+
+def test_alignment_and_regime():
+    """Test misaligned frames are aligned or dropped and the BTC drop flips the regime"""
+    frames = _frames(btc_drop=-0.05)
+    frames['SOL/USDT'] = frames['SOL/USDT'].iloc[::-1].reset_index(drop=True)   # ترتيب مختلف
+    frames['XRP/USDT'] = frames['XRP/USDT'].head(60)                            # متأخرة
+    frames['NEW/USDT'] = None
+    snapshot = compute_cross_asset(frames, window=48)
+
+    sol = frames['SOL/USDT'].sort_values('timestamp').reset_index(drop=True)
+    btc = frames['BTC/USDT']
+    expected = np.corrcoef(np.diff(np.log(sol['close'].values[-49:])), np.diff(np.log(btc['close'].values[-49:])))[0, 1]
+    print_test("aligned by timestamp", abs(snapshot.correlation['SOL/USDT']['BTC/USDT'] - expected) < 1e-9)
+    print_test("stale symbol without correlation", 'XRP/USDT' not in snapshot.correlation)
+    print_test("BTC drop → risk off", snapshot.risk_off and snapshot.btc_change_pct <= -2.0,
+               f"{snapshot.btc_change_pct:+.1f}%")
+    print_test("veto by correlation", snapshot.vetoed('ETH/USDT') and snapshot.vetoed('XRP/USDT')
+               and not snapshot.vetoed('DOGE/USDT'))
+
+    calm = compute_cross_asset(_frames(), window=48)
+    print_test("calm market", not calm.risk_off and not calm.vetoed('ETH/USDT')
+               and 0 <= calm.breadth <= 1)
+    print_test("no benchmark data", not compute_cross_asset({'ETH/USDT': frames['ETH/USDT']}).risk_off)
+
+
+def test_v7_pre_gate():
+    """Test vetoed pairs never reach the V7 evaluator"""
+    frames = _frames(('BTC', 'ETH', 'SOL', 'XRP', 'DOGE'), btc_drop=-0.05)
+    context = MarketContext(frames)
+    pairs = [s for s in frames if s != 'BTC/USDT']
+    scan = context.scan_pairs(pairs)
+    evaluated = []
+
+    class Evaluator(SignalEvaluator):
+        def calculate_signal_strength(self, symbol, **kwargs):
+            evaluated.append(symbol)
+            return {'score': 0}
+
+    Evaluator(None).evaluate_batch(scan, context)
+    print_test("correlated pairs skipped", evaluated == scan and 'ETH/USDT' not in evaluated
+               and 'DOGE/USDT' in evaluated, str(scan))
+    print_test("computed once per cycle", context.cross_asset() is context.cross_asset())
+
+    enabled = Config.BTC_CORRELATION_ENABLED
+    Config.BTC_CORRELATION_ENABLED = False
+    try:
+        print_test("gate disabled", context.scan_pairs(pairs) == pairs)
+    finally:
+        Config.BTC_CORRELATION_ENABLED = enabled
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Cross Asset - Test Suite")
+    print("=" * 60)
+
+    test_matches_pairwise()
+    test_alignment_and_regime()
+    test_v7_pre_gate()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Discovery Feed
+اختبار مرشح Bloom والطابور ووقت اكتشاف زوج جديد (خادم محلي بدل DexScreener)
+"""
+
+import sys
+import os
+import time
+import asyncio
+import tempfile
+
+from aiohttp import web
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from discovery_feed import BloomFilter, RotatingBloomFilter, DiscoveryFeed
+from meme_hunter import MemeHunter, MemeHunterConfig, create_http_session
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def test_bloom_filter():
+    """Test no false negatives and a low false positive rate"""
+    bloom = BloomFilter(capacity=10_000, error_rate=0.001)
+    added = sum(bloom.add(f"pair-{i}") for i in range(10_000))
+    print_test("new items reported new", added >= 9_980, f"{added}/10000")
+    print_test("no false negatives", all(f"pair-{i}" in bloom for i in range(10_000)))
+
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    print_test("false positive rate", false_positives < 50, f"{false_positives}/10000")
+
+    rotating = RotatingBloomFilter(window_seconds=0.05, capacity=100)
+    first = rotating.add('A')
+    repeat = rotating.add('A')
+    time.sleep(0.06)
+    kept = rotating.add('A')  # يبقى مكرراً خلال الجيل السابق
+    time.sleep(0.06)
+    rotating.add('B')
+    time.sleep(0.06)
+    print_test("rotating window", first and not repeat and not kept and rotating.add('A'))
+
+
+def test_queue_dedup():
+    """Test duplicates are dropped and a full queue drops instead of blocking"""
+    async def scenario():
+        feed = DiscoveryFeed([], queue_size=3)
+        queued = feed.push([{'pairAddress': f"p{i % 4}"} for i in range(8)] + [{'x': 1}])
+        size = feed.queue.qsize()
+        feed.queue.get_nowait()
+        retried = feed.push([{'pairAddress': 'p3'}, {'pairAddress': 'p0'}])
+        return queued, size, retried, feed.stats
+
+    queued, size, retried, stats = asyncio.run(scenario())
+    print_test("queue bounded", queued == 3 and size == 3, str(stats))
+    print_test("duplicates counted", stats['duplicates'] == 5 and stats['dropped'] == 2)
+    print_test("dropped pair not marked seen", retried == 1 and stats['queued'] == 4)
+
+
+async def _discovery_latency():
+    profiles = [{'chainId': 'solana', 'tokenAddress': f"old{i}"} for i in range(20)]
+    profiles.append({'chainId': 'bsc', 'tokenAddress': 'bsc-token'})
+    stats = {'tokens_requests': 0}
+
+    async def latest_profiles(request):
+        return web.json_response(profiles)
+
+    async def boosts(request):
+        return web.json_response([])
+
+    async def tokens(request):
+        addresses = request.match_info['addresses'].split(',')
+        stats['tokens_requests'] += 'fresh' in addresses
+        pairs = []
+        for address in addresses:
+            for liquidity in (1000, 5000):
+                pairs.append({
+                    'chainId': 'solana', 'pairAddress': f"{address}-{liquidity}",
+                    'baseToken': {'symbol': address.upper(), 'name': address, 'address': address},
+                    'priceUsd': '0.01', 'liquidity': {'usd': liquidity}
+                })
+        return web.json_response({'pairs': pairs})
+
+    async def search(request):
+        return web.json_response({'pairs': []})
+
+    app = web.Application()
+    app.router.add_get('/profiles', latest_profiles)
+    app.router.add_get('/boosts', boosts)
+    app.router.add_get('/latest/dex/tokens/{addresses}', tokens)
+    app.router.add_get('/latest/dex/search', search)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    tmp = tempfile.mkdtemp()
+    config = MemeHunterConfig(
+        DEXSCREENER_API=f"{base_url}/latest/dex",
+        DEXSCREENER_PROFILES_API=f"{base_url}/profiles",
+        DEXSCREENER_BOOSTS_API=f"{base_url}/boosts",
+        DISCOVERY_POLL_SECONDS=0.1,
+        STATE_FILE=os.path.join(tmp, 'state.pkl'),
+        JOURNAL_DB=os.path.join(tmp, 'journal.db')
+    )
+    hunter = MemeHunter(config)
+    hunter._attach_session(create_http_session(config))
+
+    analyzed = {}
+
+    async def fake_analyze(pair_data):
+        analyzed[pair_data['pairAddress']] = time.time()
+        return None
+    hunter._prepare_token = fake_analyze
+
+    hunter.discovery = hunter._create_discovery_feed()
+    tasks = hunter._start_pipeline()
+    try:
+        await asyncio.sleep(0.5)
+        initial = dict(analyzed)
+        requests_before = stats['tokens_requests']
+
+        launched = time.time()
+        profiles.insert(0, {'chainId': 'solana', 'tokenAddress': 'fresh'})
+        while 'fresh-5000' not in analyzed and time.time() - launched < 5:
+            await asyncio.sleep(0.01)
+        latency = analyzed.get('fresh-5000', float('inf')) - launched
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await hunter.session.close()
+        hunter.telegram.journal.close()
+        await runner.cleanup()
+    return initial, analyzed, latency, stats['tokens_requests'] - requests_before
+
+
+def test_new_pair_latency():
+    """Test a fresh pair reaches a worker within one poll interval"""
+    initial, analyzed, latency, token_requests = asyncio.run(_discovery_latency())
+    print_test("existing tokens analyzed once (best pair)", len(initial) == 20
+               and all(k.endswith('-5000') for k in initial), f"{len(initial)} pairs")
+    print_test("fresh pair detected in seconds", latency < 1.0, f"{latency:.2f}s")
+    # bsc-token بلا زوج على bsc يُعاد طلبه كل دورة - المهم أن fresh طُلب مرة واحدة
+    print_test("only new token resolved", token_requests == 1 and len(analyzed) == 21)
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Discovery Feed - Test Suite")
+    print("=" * 60)
+
+    test_bloom_filter()
+    test_queue_dedup()
+    test_new_pair_latency()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
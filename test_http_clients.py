@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Shared HTTP Clients
+اختبار إعادة استخدام الاتصالات ومقاييس تشبع المجمع
+"""
+
+import sys
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from http_clients import create_session, create_async_session, metrics, pool_stats
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        if self.path.startswith('/slow'):
+            time.sleep(float(self.path.split('=')[1]))
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"127.0.0.1:{server.server_address[1]}"
+
+
+def test_sync_pool():
+    """Test keep-alive reuse, saturation counter and default timeout"""
+    server, host = _start_server()
+    metrics.reset()
+    try:
+        session = create_session(pool_maxsize=4)
+        for _ in range(20):
+            session.get(f"http://{host}/")
+        stats = pool_stats()[host]
+        print_test("one connection for 20 requests", stats['new_connections'] == 1, str(stats))
+
+        with ThreadPoolExecutor(max_workers=12) as executor:
+            list(executor.map(lambda _: session.get(f"http://{host}/slow?s=0.2"), range(12)))
+        stats = pool_stats()[host]
+        print_test("saturation counted", stats['peak'] > 4 and stats['saturated'] > 0, str(stats))
+        print_test("nothing in flight", stats['in_flight'] == 0)
+
+        try:
+            create_session(timeout=0.3).get(f"http://{host}/slow?s=1")
+            timed_out = False
+        except requests.exceptions.Timeout:
+            timed_out = True
+        print_test("default timeout applied", timed_out)
+    finally:
+        server.shutdown()
+
+
+async def _async_requests(host):
+    session = create_async_session(limit_per_host=2)
+    try:
+        for _ in range(10):
+            async with session.get(f"http://{host}/") as response:
+                await response.read()
+
+        async def fetch():
+            async with session.get(f"http://{host}/slow?s=0.1") as response:
+                await response.read()
+        await asyncio.gather(*(fetch() for _ in range(6)))
+    finally:
+        await session.close()
+
+
+def test_async_pool():
+    """Test aiohttp connection reuse and per-host limit metrics"""
+    server, host = _start_server()
+    metrics.reset()
+    try:
+        asyncio.run(_async_requests(host))
+        stats = pool_stats()['127.0.0.1']
+        print_test("async requests counted", stats['requests'] == 16, str(stats))
+        print_test("connections reused", stats['new_connections'] <= 2 and stats['reused'] >= 14)
+        print_test("limit per host saturated", stats['saturated'] > 0)
+    finally:
+        server.shutdown()
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 HTTP Clients - Test Suite")
+    print("=" * 60)
+
+    test_sync_pool()
+    test_async_pool()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Vectorized ICT Analyzer
+مقارنة ICTAnalyzer (NumPy) مع الحلقات الأصلية على بيانات عشوائية - نفس المخرجات حرفياً
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from advanced_trading_bot import ICTAnalyzer
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+# ============================================================================
+# المرجع: الحلقات الأصلية (قبل التحويل لعمليات مصفوفات)
+# ============================================================================
+
+def _legacy_order_blocks(df, lookback=50):
+    recent = df.tail(lookback)
+    close, high, low = recent['close'].values, recent['high'].values, recent['low'].values
+    blocks = {'buy_blocks': [], 'sell_blocks': [], 'nearest_buy': None, 'nearest_sell': None}
+    for i in range(2, len(close) - 1):
+        expanding = (high[i] - low[i]) > (high[i-1] - low[i-1])
+        for key, broke in (('buy_blocks', close[i-2] > close[i-1] and close[i] > close[i-1] and close[i] > close[i-2]),
+                           ('sell_blocks', close[i-2] < close[i-1] and close[i] < close[i-1] and close[i] < close[i-2])):
+            if broke and expanding:
+                blocks[key].append({
+                    'high': float(max(high[i-2], high[i-1])),
+                    'low': float(min(low[i-2], low[i-1])),
+                    'strength': float((high[i] - low[i]) / (high[i-1] - low[i-1])) if (high[i-1] - low[i-1]) > 0 else 1.0,
+                    'bars_ago': len(close) - 1 - i
+                })
+    price = df['close'].iloc[-1]
+    for key, nearest in (('buy_blocks', 'nearest_buy'), ('sell_blocks', 'nearest_sell')):
+        if blocks[key]:
+            block = min(blocks[key], key=lambda x: abs(x['bars_ago']))
+            if block['low'] < price < block['high']:
+                blocks[nearest] = block
+    return blocks
+
+
+def _legacy_fvg(df, lookback=50):
+    recent = df.tail(lookback)
+    high, low = recent['high'].values, recent['low'].values
+    fvgs = {'bullish_fvgs': [], 'bearish_fvgs': [], 'active_fvg': None}
+    for i in range(2, len(high)):
+        if low[i] > high[i-1] and high[i] > high[i-1] and low[i] - high[i-1] > 0:
+            fvgs['bullish_fvgs'].append({'top': float(low[i]), 'bottom': float(high[i-1]),
+                                         'size': float(low[i] - high[i-1]), 'bars_ago': len(high) - 1 - i})
+        if high[i] < low[i-1] and low[i] < low[i-1] and low[i-1] - high[i] > 0:
+            fvgs['bearish_fvgs'].append({'top': float(low[i-1]), 'bottom': float(high[i]),
+                                         'size': float(low[i-1] - high[i]), 'bars_ago': len(high) - 1 - i})
+    price = df['close'].iloc[-1]
+    for kind in ('bullish', 'bearish'):
+        for fvg in fvgs[f'{kind}_fvgs']:
+            if fvg['bottom'] < price < fvg['top']:
+                fvgs['active_fvg'] = {'type': kind, **fvg}
+                break
+        if fvgs['active_fvg']:
+            break
+    return fvgs
+
+
+def _legacy_liquidity_zones(df, lookback=100):
+    recent = df.tail(lookback)
+    close, high, low = recent['close'].values, recent['high'].values, recent['low'].values
+    volume = recent['volume'].values if 'volume' in recent.columns else None
+    zones = {'supply_zones': [], 'demand_zones': [], 'active_zone': None}
+    price_min = low.min()
+    zone_size = (high.max() - price_min) / 10
+    counts = {}
+    for i in range(len(close)):
+        level = int((close[i] - price_min) / zone_size)
+        zone = counts.setdefault(level, {'count': 0, 'high': 0, 'low': close[i], 'volume': 0})
+        zone['count'] += 1
+        zone['high'] = max(zone['high'], high[i])
+        zone['low'] = min(zone['low'], low[i])
+        if volume is not None:
+            zone['volume'] += volume[i]
+    price = df['close'].iloc[-1]
+    for level, data in sorted(counts.items(), key=lambda x: x[1]['count'], reverse=True):
+        if data['count'] >= 5:
+            zone_price = price_min + (level * zone_size)
+            zones['supply_zones' if zone_price > price else 'demand_zones'].append({
+                'level': float(zone_price), 'strength': data['count'],
+                'volume': float(data['volume']) if volume is not None else 0,
+                'high': float(data['high']), 'low': float(data['low'])
+            })
+    if zones['demand_zones']:
+        zones['active_zone'] = {'type': 'demand', **max(zones['demand_zones'], key=lambda x: x['level'])}
+    return zones
+
+
+def _legacy_imbalance(df):
+    recent = df.tail(20)
+    close = recent['close'].values
+    volume = recent['volume'].values if 'volume' in recent.columns else np.ones(len(close))
+    changes = np.diff(close)
+    up = np.sum([volume[i] if changes[i] > 0 else 0 for i in range(len(changes))])
+    down = np.sum([volume[i] if changes[i] < 0 else 0 for i in range(len(changes))])
+    return float(up), float(down)
+
+
+# ============================================================================
+# الاختبارات
+# ============================================================================
+
+def _random_frames(count=300, seed=41):
+    rng = np.random.default_rng(seed)
+    for t in range(count):
+        n = int(rng.integers(50, 300))
+        close = np.cumsum(rng.normal(0, 2, n)) + 100
+        if t % 5 == 0:
+            close = np.round(close)  # تساويات كثيرة
+        df = pd.DataFrame({
+            'open': close,
+            'high': close + np.abs(rng.normal(0, 1, n)),
+            'low': close - np.abs(rng.normal(0, 1, n)),
+            'close': close,
+            'volume': rng.integers(1, 1000, n).astype(float)
+        })
+        if t % 11 == 0:
+            df = df.drop(columns='volume')
+        yield df
+
+
+def test_matches_loops():
+    """Test every detector returns exactly what the original loops returned"""
+    analyzer = ICTAnalyzer()
+    mismatches = {'order_blocks': 0, 'fvg': 0, 'liquidity': 0, 'imbalance': 0}
+    found = {'blocks': 0, 'gaps': 0, 'zones': 0}
+
+    for df in _random_frames():
+        blocks = analyzer._detect_order_blocks(df)
+        gaps = analyzer._detect_fvg(df)
+        zones = analyzer._detect_liquidity_zones(df)
+        supply_demand = analyzer._detect_supply_demand(df)
+
+        mismatches['order_blocks'] += repr(blocks) != repr(_legacy_order_blocks(df))
+        mismatches['fvg'] += repr(gaps) != repr(_legacy_fvg(df))
+        mismatches['liquidity'] += repr(zones) != repr(_legacy_liquidity_zones(df))
+        mismatches['imbalance'] += (supply_demand['volume_buy'], supply_demand['volume_sell']) != _legacy_imbalance(df)
+
+        found['blocks'] += len(blocks['buy_blocks']) + len(blocks['sell_blocks'])
+        found['gaps'] += len(gaps['bullish_fvgs']) + len(gaps['bearish_fvgs'])
+        found['zones'] += len(zones['supply_zones']) + len(zones['demand_zones'])
+
+    print_test("identical output on 300 random frames", not any(mismatches.values()), str(mismatches))
+    print_test("patterns actually exercised", all(found.values()), str(found))
+
+
+def test_flat_prices():
+    """Test a flat series yields no liquidity zones instead of dividing by zero"""
+    df = pd.DataFrame({'open': [1.0] * 60, 'high': [1.0] * 60, 'low': [1.0] * 60,
+                       'close': [1.0] * 60, 'volume': [10.0] * 60})
+    result = ICTAnalyzer().analyze_ict(df, 'FLAT/USDT')
+    print_test("flat series analyzed", result['liquidity_zones']['supply_zones'] == []
+               and result['ict_signal'] in ('BUY', 'SELL', 'NEUTRAL'))
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Vectorized ICT - Test Suite")
+    print("=" * 60)
+
+    test_matches_loops()
+    test_flat_prices()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
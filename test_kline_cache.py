@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Kline Cache
+اختبار دمج الطلبات المتزامنة، LRU + TTL، وعدم تكرار جلب الشموع في البوتات
+"""
+
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from kline_cache import KlineCache, SingleFlight
+from candle_resampler import CandleResampler
+from advanced_trading_bot import AdvancedTradingBot
+from crypto_killer_v7_enhanced import CryptoKillerV7
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def _race(fn, threads=16):
+    """تشغيل fn من عدة threads في نفس اللحظة"""
+    barrier = threading.Barrier(threads)
+
+    def call():
+        barrier.wait()
+        try:
+            return fn()
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(threads) as pool:
+        return [f.result() for f in [pool.submit(call) for _ in range(threads)]]
+
+
+def _candles(count=100):
+    start = 1_700_000_000_000
+    return [[start + i * 900_000, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(count)]
+
+
+def test_single_flight():
+    """Test concurrent callers share one call and its exception"""
+    flight, calls = SingleFlight(), []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return 'candles'
+
+    results = _race(lambda: flight.do('BTC', slow))
+    print_test("one call for 16 callers", len(calls) == 1 and results == ['candles'] * 16,
+               str(flight.stats))
+
+    def broken():
+        time.sleep(0.1)
+        raise ConnectionError('down')
+
+    errors = _race(lambda: flight.do('ETH', broken))
+    print_test("exception shared", all(isinstance(e, ConnectionError) for e in errors)
+               and not flight._flights)
+
+
+def test_lru_ttl():
+    """Test size bound, recency order, expiry and state round trip"""
+    cache = KlineCache(ttl=0.2, max_entries=3)
+    for key in 'abc':
+        cache.put(key, key.upper())
+    cache.get('a')              # a أحدث استخداماً
+    cache.put('d', 'D')         # يحذف b
+    print_test("LRU eviction", cache.get('b') is None and cache.get('a') == 'A'
+               and len(cache) == 3 and cache.stats['evictions'] == 1)
+
+    print_test("None not cached", cache.get_or_fetch('e', lambda: None) is None and cache.get('e') is None)
+
+    restored = KlineCache(ttl=0.2, max_entries=3)
+    restored.restore_state(cache.to_state())
+    print_test("state round trip", restored.get('d') == 'D')
+
+    time.sleep(0.25)
+    print_test("TTL expiry", cache.get('a') is None and len(cache.to_state()) == 0)
+
+
+def test_advanced_bot_race():
+    """Test racing analysis threads fetch each kline frame once"""
+    bot = object.__new__(AdvancedTradingBot)
+    bot.kline_cache = KlineCache(300, 64)
+    bot.resampler = CandleResampler('15m', ('4h',))
+    fetches = []
+
+    def fetch(symbol, timeframe, limit=100):
+        fetches.append((symbol, timeframe))
+        time.sleep(0.1)
+        return _candles(limit)
+    bot._safe_fetch_ohlcv = fetch
+
+    frames = _race(lambda: bot._get_cached_klines('BTC/USDT', '15m'))
+    print_test("one fetch for 16 threads", fetches == [('BTC/USDT', '15m')]
+               and all(df is frames[0] for df in frames), f"{len(fetches)} fetches")
+    bot._get_cached_klines('BTC/USDT', '15m')
+    print_test("cached afterwards", len(fetches) == 1 and bot.kline_cache.stats['hits'] >= 1)
+
+
+def test_v7_shared_fetch():
+    """Test the V7 evaluator, market report and trending scan share one fetch per symbol"""
+    calls = []
+
+    class FakeExchange:
+        def fetch_ohlcv(self, symbol, timeframe, limit):
+            calls.append((symbol, timeframe, limit))
+            return _candles(limit)
+
+    wrapper = CryptoKillerV7._wrap_exchange(None, FakeExchange())
+    short = wrapper.get_ohlcv('BTC/USDT', '1h', 50)    # تقرير السوق
+    full = wrapper.get_ohlcv('BTC/USDT', '1h', 100)    # المقيّم
+    wrapper.get_ohlcv('ETH/USDT', '1h', 50)
+    wrapper.get_ohlcv('ETH/USDT', '1h', 50)
+
+    print_test("one fetch per symbol", calls == [('BTC/USDT', '1h', 100), ('ETH/USDT', '1h', 100)], str(calls))
+    print_test("same frame shape as a direct fetch", len(short) == 50 and list(short.index) == list(range(50))
+               and short['timestamp'].iloc[-1] == full['timestamp'].iloc[-1])
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Kline Cache - Test Suite")
+    print("=" * 60)
+
+    test_single_flight()
+    test_lru_ttl()
+    test_advanced_bot_race()
+    test_v7_shared_fetch()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for V7 Market Context
+اختبار الجلب المتوازي للقطة الدورة، وقراءة التقييم وتقرير السوق والعملات الصاعدة منها
+"""
+
+import sys
+import os
+import time
+import threading
+
+import numpy as np
+import ta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from crypto_killer_v7_enhanced import (
+    CryptoKillerV7, Config, MarketContext, MarketMetricsAnalyzer,
+    TrendingCoinsDetector, SignalEvaluator, ema_trend
+)
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+class FakeExchange:
+    """بورصة وهمية بزمن استجابة ثابت وعدّاد للطلبات"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch_ohlcv(self, symbol, timeframe, limit):
+        with self._lock:
+            self.calls.append(symbol)
+        time.sleep(self.latency)
+        rng = np.random.default_rng(sum(map(ord, symbol)))
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, limit)))
+        start = 1_700_000_000_000
+        return [[start + i * 3_600_000, c, c * 1.003, c * 0.997, c, float(rng.uniform(1, 100))]
+                for i, c in enumerate(close)]
+
+
+def _wrapper(latency=0.0):
+    fake = FakeExchange(latency)
+    return fake, CryptoKillerV7._wrap_exchange(None, fake)
+
+
+def _pairs():
+    return [f"{s}/USDT" for s in Config.FIXED_WATCHLIST]
+
+
+def test_parallel_fetch():
+    """Test the cycle takes about one request, not the sum of all requests"""
+    fake, exchange = _wrapper(latency=0.2)
+    bot = object.__new__(CryptoKillerV7)
+    bot.exchange = exchange
+
+    started = time.monotonic()
+    context = bot._build_context(_pairs())
+    elapsed = time.monotonic() - started
+
+    symbols = len(set(_pairs() + ['BTC/USDT', 'ETH/USDT']))
+    serial = symbols * fake.latency
+    waves = -(-symbols // Config.MAX_WORKERS)
+    print_test("one fetch per symbol", sorted(fake.calls) == sorted(context.frames), f"{len(fake.calls)} fetches")
+    print_test("wall time bounded by workers", elapsed < waves * fake.latency + 0.3 and elapsed < serial,
+               f"{elapsed:.2f}s vs serial {serial:.1f}s")
+
+
+def test_consumers_share_context():
+    """Test metrics, trending and the evaluator read the snapshot without refetching"""
+    fake, exchange = _wrapper()
+    context = MarketContext.fetch(exchange, _pairs() + ['BTC/USDT', 'ETH/USDT'])
+    fetched = len(fake.calls)
+
+    metrics = MarketMetricsAnalyzer(exchange).get_market_metrics(context)
+    trending = TrendingCoinsDetector(exchange).find_trending(context)
+    results = SignalEvaluator(exchange).evaluate_batch(_pairs(), context)
+
+    print_test("no extra fetches", len(fake.calls) == fetched, f"{fetched} fetches")
+    print_test("metrics from context", 'BTC_signal' in metrics and 'ETH_signal' in metrics)
+    print_test("trending and signals from context", isinstance(trending, list) and set(results) == set(_pairs()))
+
+
+def test_trend_matches_direct_fetch():
+    """Test the snapshot trend equals the old per-call 50-candle computation"""
+    fake, exchange = _wrapper()
+    context = MarketContext.fetch(exchange, ['BTC/USDT', 'ETH/USDT'])
+    mismatches = 0
+    for coin in ('BTC', 'ETH'):
+        df = exchange.get_ohlcv(f"{coin}/USDT", '1h', 50)
+        legacy = float(ta.trend.ema_indicator(df['close'], 20).iloc[-1]) > \
+            float(ta.trend.ema_indicator(df['close'], 50).iloc[-1])
+        mismatches += context.trend(coin) != legacy
+        mismatches += not context.frame(f"{coin}/USDT", 50).equals(df)
+    print_test("same trend and frame", mismatches == 0)
+    print_test("missing data", ema_trend(None) is None and context.trend('SOL') is None)
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 V7 Market Context - Test Suite")
+    print("=" * 60)
+
+    test_parallel_fetch()
+    test_consumers_share_context()
+    test_trend_matches_direct_fetch()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Async Meme Hunter Pipeline
+اختبار المسح والتحليل المتوازي عبر aiohttp (خادم محلي بدل DexScreener)
+"""
+
+import sys
+import os
+import time
+import json
+import asyncio
+import hashlib
+import tempfile
+
+from aiohttp import web
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from meme_hunter import MemeHunter, MemeHunterConfig, DexScreenerScanner, create_http_session
+
+DELAY = 0.3  # زمن استجابة مصطنع لكل طلب
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def _pair(term, i, base_url, price=0.001):
+    return {
+        'chainId': 'solana',
+        'pairAddress': f"{term}-{i}",
+        'baseToken': {'symbol': f"{term.upper()}{i}", 'name': term, 'address': f"addr-{term}-{i}"},
+        'priceUsd': str(price),
+        'priceChange': {'m5': 1, 'h1': 5, 'h6': 10, 'h24': 20},
+        'volume': {'h24': 1000},
+        'liquidity': {'usd': 1000},
+        'txns': {'h24': {'buys': 10, 'sells': 5}},
+        'info': {'socials': [{'type': 'url', 'url': f"{base_url}/site/{term}-{i}"}]}
+    }
+
+
+async def _start_server():
+    stats = {'search': 0, 'not_modified': 0, 'site': 0}
+    prices = {}  # pairAddress -> price override
+
+    async def search(request):
+        stats['search'] += 1
+        await asyncio.sleep(DELAY)
+        term = request.query['q']
+        base_url = request.app['base_url']
+        pairs = [_pair(term, i, base_url, prices.get(f"{term}-{i}", 0.001)) for i in range(5)]
+        pairs.append(dict(pairs[0], chainId='tron', pairAddress='other-chain'))
+
+        body = json.dumps({'pairs': pairs})
+        etag = '"%s"' % hashlib.md5(body.encode()).hexdigest()
+        if request.headers.get('If-None-Match') == etag:
+            stats['not_modified'] += 1
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(text=body, content_type='application/json', headers={'ETag': etag})
+
+    async def site(request):
+        stats['site'] += 1
+        await asyncio.sleep(DELAY)
+        return web.Response(text='ok')
+
+    app = web.Application()
+    app.router.add_get('/latest/dex/search', search)
+    app.router.add_get('/site/{name}', site)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site_ = web.TCPSite(runner, '127.0.0.1', 0)
+    await site_.start()
+    port = site_._server.sockets[0].getsockname()[1]
+    app['base_url'] = f"http://127.0.0.1:{port}"
+    return runner, app['base_url'], stats, prices
+
+
+OPEN_GATES = {'MIN_LIQUIDITY_USD': 0, 'MIN_VOLUME_24H_USD': 0,
+              'MIN_TRANSACTIONS_24H': 0, 'MIN_PRICE_CHANGE_1H': 0}
+
+
+def _make_hunter(base_url, **overrides):
+    tmp = tempfile.mkdtemp()
+    # افتراضياً بوابات رقمية مفتوحة: كل الأزواج تصل للفحوص الشبكية
+    settings = dict(OPEN_GATES, **overrides)
+    config = MemeHunterConfig(DEXSCREENER_API=f"{base_url}/latest/dex",
+                              STATE_FILE=os.path.join(tmp, 'state.pkl'),
+                              JOURNAL_DB=os.path.join(tmp, 'journal.db'),
+                              **settings)
+    hunter = MemeHunter(config)
+    hunter._attach_session(create_http_session(config))
+    return hunter
+
+
+async def _close(hunter, runner):
+    await hunter.session.close()
+    hunter.telegram.journal.close()
+    await runner.cleanup()
+
+
+async def _scan():
+    runner, base_url, stats, _ = await _start_server()
+    hunter = _make_hunter(base_url)
+    try:
+        started = time.time()
+        pairs = await hunter.dex_scanner.search_trending_tokens()
+        search_time = time.time() - started
+
+        started = time.time()
+        await hunter.scan_and_analyze()
+        scan_time = time.time() - started
+    finally:
+        await _close(hunter, runner)
+    return pairs, search_time, scan_time, stats
+
+
+async def _cycles():
+    runner, base_url, stats, prices = await _start_server()
+    hunter = _make_hunter(base_url)
+    snapshots = []
+    try:
+        await hunter.scan_and_analyze()
+        snapshots.append(dict(stats))
+
+        # خلال TTL: لا طلبات بحث ولا فحوص جديدة
+        await hunter.scan_and_analyze()
+        snapshots.append(dict(stats))
+
+        # بعد TTL: طلبات شرطية 304 - وزوج واحد تحرك سعره 10%
+        hunter.dex_scanner.cache.ttl = 0
+        prices['pepe-2'] = 0.0011
+        await hunter.scan_and_analyze()
+        snapshots.append(dict(stats))
+    finally:
+        await _close(hunter, runner)
+    return snapshots
+
+
+async def _staged():
+    runner, base_url, stats, _ = await _start_server()
+    strict = _make_hunter(base_url, MIN_LIQUIDITY_USD=50000)
+    relaxed = _make_hunter(base_url)
+    relaxed.signal_tracker.gate.record('addr-pump-0')
+    try:
+        await strict.scan_and_analyze()
+        strict_sites = stats['site']
+        await relaxed.scan_and_analyze()
+    finally:
+        await _close(strict, runner)
+        await relaxed.session.close()
+        relaxed.telegram.journal.close()
+    return strict.filter_stats, strict_sites, relaxed.filter_stats
+
+
+async def _discovery():
+    """35 عملة جديدة (دفعتان): الدفعة الثانية تفشل مرة، وعملة بلا زوج حتى الدورة الثالثة"""
+    state = {'lookups': [], 'failed': False, 'listed': False}
+
+    async def profiles(request):
+        return web.json_response([{'chainId': 'solana', 'tokenAddress': f"tok-{i}"} for i in range(35)])
+
+    async def tokens(request):
+        addresses = request.match_info['addresses'].split(',')
+        state['lookups'].append(len(addresses))
+        if 'tok-30' in addresses and not state['failed']:
+            state['failed'] = True
+            return web.Response(status=500)
+        pairs = [{'chainId': 'solana', 'pairAddress': f"pair-{a}", 'baseToken': {'address': a},
+                  'liquidity': {'usd': 1000}}
+                 for a in addresses if a != 'tok-1' or state['listed']]
+        return web.json_response({'pairs': pairs})
+
+    app = web.Application()
+    app.router.add_get('/profiles', profiles)
+    app.router.add_get('/boosts', lambda request: web.json_response([]))
+    app.router.add_get('/latest/dex/tokens/{addresses}', tokens)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site_ = web.TCPSite(runner, '127.0.0.1', 0)
+    await site_.start()
+    base_url = f"http://127.0.0.1:{site_._server.sockets[0].getsockname()[1]}"
+
+    config = MemeHunterConfig(DEXSCREENER_API=f"{base_url}/latest/dex",
+                              DEXSCREENER_PROFILES_API=f"{base_url}/profiles",
+                              DEXSCREENER_BOOSTS_API=f"{base_url}/boosts")
+    scanner = DexScreenerScanner(config)
+    scanner.session = create_http_session(config)
+    cycles = []
+    try:
+        for _ in range(3):
+            cycles.append(sorted(p['baseToken']['address'] for p in await scanner.discover_new_pairs()))
+            state['listed'] = len(cycles) == 2
+        cycles.append(await scanner.discover_new_pairs())
+    finally:
+        await scanner.session.close()
+        await runner.cleanup()
+    return cycles, state['lookups']
+
+
+async def _shutdown_during_evaluation():
+    """إيقاف البوت بينما خيط السجل ينتظر سعر زوج عبر الـ loop"""
+    stats = {'pairs': 0, 'served': 0}
+
+    async def pair(request):
+        stats['pairs'] += 1
+        await asyncio.sleep(DELAY)
+        stats['served'] += 1
+        return web.json_response({'pair': {'priceUsd': '1.0'}})
+
+    app = web.Application()
+    app.router.add_get('/latest/dex/pairs/{chain}/{pair}', pair)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site_ = web.TCPSite(runner, '127.0.0.1', 0)
+    await site_.start()
+    hunter = _make_hunter(f"http://127.0.0.1:{site_._server.sockets[0].getsockname()[1]}")
+    hunter._loop = asyncio.get_running_loop()
+    journal = hunter.telegram.journal
+    journal.flush_interval, journal.eval_interval = 0.05, 0
+    try:
+        journal.record('SLOW', 'BUY', 1.0, 2.0, 3.0, 0.5, instrument='solana/slow-pair')
+        journal.start()
+        while stats['pairs'] == 0:
+            await asyncio.sleep(0.01)
+        started = time.time()
+        await hunter._shutdown([])
+        elapsed = time.time() - started
+    finally:
+        await runner.cleanup()
+    return elapsed, stats, journal._thread.is_alive(), hunter.session
+
+
+def test_concurrent_scan():
+    """Test searches and per-token checks run concurrently"""
+    pairs, search_time, scan_time, stats = asyncio.run(_scan())
+    terms = len(DexScreenerScanner.SEARCH_TERMS)
+
+    print_test("chain filter + dedup", len(pairs) == terms * 5, f"{len(pairs)} pairs")
+    print_test("searches in parallel", search_time < terms * DELAY / 2, f"{search_time:.2f}s")
+    # 35 مواقع بحد 10 متوازية = 4 دفعات
+    print_test("all websites checked", stats['site'] == terms * 5, str(stats))
+    print_test("scan in a few round trips", scan_time < 8 * DELAY, f"{scan_time:.2f}s")
+
+
+def test_cached_cycles():
+    """Test TTL cache, conditional requests and per-pair analysis reuse"""
+    first, second, third = asyncio.run(_cycles())
+    terms = len(DexScreenerScanner.SEARCH_TERMS)
+
+    print_test("first cycle fetches everything", first == {'search': terms, 'not_modified': 0, 'site': terms * 5})
+    print_test("second cycle served from cache", second == first, str(second))
+    print_test("revalidated with ETag", third['not_modified'] == terms - 1, str(third))
+    print_test("only moved pair re-analyzed", third['site'] == first['site'] + 1)
+
+
+def test_staged_filter():
+    """Test cheap gates reject before any network check"""
+    strict, strict_sites, relaxed = asyncio.run(_staged())
+    terms = len(DexScreenerScanner.SEARCH_TERMS)
+
+    print_test("cheap gate rejects all", strict.rejected['cheap'] == {'liquidity': terms * 5}, strict.summary())
+    print_test("no network checks", strict_sites == 0 and strict.entered['network'] == 0)
+    print_test("cooldown rejected from cached state", relaxed.rejected['cached'] == {'cooldown': 1},
+               relaxed.summary())
+    print_test("rest reach network stage", relaxed.entered['network'] == terms * 5 - 1)
+
+
+def test_discovery_retries():
+    """Test tokens are only marked seen once their pair resolves, per failed batch"""
+    (first, second, third, fourth), lookups = asyncio.run(_discovery())
+    batch_one = {f"tok-{i}" for i in range(30)} - {'tok-1'}
+
+    print_test("failed batch does not drop the other", set(first) == batch_one, f"{len(first)} pairs")
+    print_test("failed batch retried next cycle", second == sorted(f"tok-{i}" for i in range(30, 35)))
+    print_test("token without pair retried until listed", third == ['tok-1'])
+    print_test("resolved tokens not looked up again", fourth == [] and lookups == [30, 5, 6, 1], str(lookups))
+
+
+def test_shutdown_while_evaluating():
+    """Test shutdown lets the journal's in-flight price fetch finish on the loop"""
+    elapsed, stats, alive, session = asyncio.run(_shutdown_during_evaluation())
+
+    print_test("shutdown not stalled by join", elapsed < 3 * DELAY + 1, f"{elapsed:.2f}s")
+    print_test("price fetch completed", stats['served'] == 1, str(stats))
+    print_test("journal thread stopped before session close", not alive and session is None)
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Async Meme Hunter - Test Suite")
+    print("=" * 60)
+
+    test_concurrent_scan()
+    test_cached_cycles()
+    test_staged_filter()
+    test_discovery_retries()
+    test_shutdown_while_evaluating()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
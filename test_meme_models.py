@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Meme Hunter Data Models
+اختبار TokenData / MemeSignal المضغوطة (slots)
+"""
+
+import sys
+import os
+import pickle
+import tracemalloc
+from dataclasses import asdict, make_dataclass, fields
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from meme_hunter import TokenData, MemeSignal, SignalTracker, MemeHunterConfig
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def _token(i=0, **overrides):
+    values = {f.name: 0 for f in fields(TokenData)}
+    values.update(
+        symbol=f"T{i}", name=f"Token {i}", address=f"addr{i}", chain='solana',
+        price_usd=0.001 * (i + 1), price_change_1h=float(i), transactions_24h=100 + i,
+        liquidity_locked=bool(i % 2), honeypot_risk=False, website_url=None,
+        telegram_url=None, twitter_url=None, dex_name='raydium', pair_address=f"pair{i}",
+        total_score=50.0 + i, risk_level='MEDIUM', detected_at=datetime(2026, 1, 1, 12, 0, i % 60)
+    )
+    values.update(overrides)
+    return TokenData(**values)
+
+
+def test_slotted_models():
+    """Test slotted records keep dataclass behaviour and save memory"""
+    token = _token(1)
+    signal = MemeSignal(token=token, signal_type='MEME_OPPORTUNITY', entry_price=1.0,
+                        targets=[1.5, 2.5, 6.0], stop_loss=0.85, position_size_usd=10,
+                        reasoning='x', urgency='HIGH')
+
+    print_test("no per-instance __dict__", not hasattr(token, '__dict__') and not hasattr(signal, '__dict__'))
+    print_test("equality and asdict", _token(1) == token and asdict(signal)['token']['symbol'] == 'T1')
+    print_test("pickle round trip", pickle.loads(pickle.dumps(signal)) == signal)
+
+    # نفس الحقول بدون slots للمقارنة
+    Plain = make_dataclass('Plain', [(f.name, f.type) for f in fields(TokenData)])
+    values = asdict(token)
+
+    def measure(factory):
+        tracemalloc.start()
+        items = [factory(**values) for _ in range(5000)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del items
+        return size
+
+    slotted, plain = measure(TokenData), measure(Plain)
+    print_test("memory per record drops", slotted < plain * 0.7,
+               f"{slotted / 5000:.0f}B vs {plain / 5000:.0f}B")
+
+    today = MemeSignal(**dict(asdict(signal), token=_token(2, detected_at=datetime.now())))
+    tracker = SignalTracker(MemeHunterConfig())
+    tracker.signals_today.append(today)
+    restored = SignalTracker(MemeHunterConfig())
+    restored.restore_state(tracker.to_state())
+    print_test("tracker state round trip", restored.signals_today == [today])
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Meme Models - Test Suite")
+    print("=" * 60)
+
+    test_slotted_models()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Batch Meme Scoring
+اختبار تطابق التقييم الدفعي (NumPy) مع التقييم الفردي بت ببت
+"""
+
+import sys
+import os
+import random
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from meme_hunter import ScoringEngine, MemeHunterConfig
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+# قيم الحدود بالضبط + قيم حولها
+EDGES_1H = [-5, 0, 9.999, 10, 19.5, 20, 29.9, 30, 49.99, 50, 120, float('nan')]
+EDGES_24H = [0, 499, 500, 500.01, 999, 1000, 1000.5, 5000, float('nan')]
+EDGES_TXNS = [0, 9999, 10000, 15000, 19999, 20000, 50000]
+EDGES_SECURITY = [0, 49.9, 50, 69, 70, 89.99, 90, 100, float('nan')]
+WHALES = ['LOW', 'MEDIUM', 'HIGH', 'EXTREME', 'UNKNOWN']
+
+
+def _candidate(rng):
+    """مرشح عشوائي بنفس شكل قواميس المحللات (مع مفاتيح ناقصة أحياناً)"""
+    price_action = {
+        'price_change_1h': rng.choice(EDGES_1H + [rng.uniform(-50, 200)]),
+        'price_change_24h': rng.choice(EDGES_24H + [rng.uniform(0, 3000)]),
+        'transactions_24h': rng.choice(EDGES_TXNS + [rng.randint(0, 60000)])
+    }
+    liquidity = {'liquidity_score': rng.choice([0, 35, 60, rng.uniform(0, 100)]),
+                 'is_locked': rng.random() < 0.5}
+    social = {'social_score': rng.choice([0, 50, rng.uniform(0, 100)])}
+    holders = {'distribution_score': rng.choice([10, 40, rng.uniform(0, 100)]),
+               'whale_risk': rng.choice(WHALES)}
+    security = {'security_score': rng.choice(EDGES_SECURITY + [rng.uniform(0, 100)])}
+    for data in (price_action, liquidity, holders, security):
+        if rng.random() < 0.05:
+            data.pop(rng.choice(list(data)))
+    return price_action, liquidity, social, holders, security
+
+
+def test_batch_matches_scalar():
+    """Test score_batch gives exactly the scalar totals and risk levels"""
+    engine = ScoringEngine(MemeHunterConfig())
+    rng = random.Random(37)
+    candidates = [_candidate(rng) for _ in range(5000)]
+
+    scalar = [engine.calculate_total_score(*candidate) for candidate in candidates]
+    batch = engine.score_batch(candidates)
+
+    mismatched = [i for i, (a, b) in enumerate(zip(scalar, batch))
+                  if a[1] != b[1] or a[0].hex() != float(b[0]).hex()]
+    print_test("same length", len(batch) == len(scalar))
+    print_test("bit-identical totals and risk", not mismatched,
+               f"{len(mismatched)} mismatches" if mismatched else "")
+    print_test("plain python types", type(batch[0][0]) is float and type(batch[0][1]) is str)
+    print_test("all risk levels covered", {risk for _, risk in batch} == {'LOW', 'MEDIUM', 'HIGH', 'EXTREME'})
+    print_test("empty batch", engine.score_batch([]) == [])
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Meme Scoring - Test Suite")
+    print("=" * 60)
+
+    test_batch_matches_scalar()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for On-Chain Data Providers
+اختبار التجميع، الكاش، المهلة وقاطع الدائرة عبر خادم JSON-RPC المحلي
+"""
+
+import sys
+import os
+import time
+import asyncio
+
+import aiohttp
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from onchain_providers import CircuitBreaker, LocalRpcServer, create_rpc_registry, _holder_stats
+from meme_hunter import HolderAnalyzer, SecurityChecker, MemeHunterConfig
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+async def _batching():
+    server = LocalRpcServer()
+    url = await server.start()
+    async with aiohttp.ClientSession() as session:
+        registry = create_rpc_registry(session, {'solana': url}, max_batch=50)
+        addresses = [f"tok{i}" for i in range(120)]
+        first = await asyncio.gather(*(registry.fetch('holders', 'solana', a) for a in addresses))
+        calls_after_first = server.calls
+        await asyncio.gather(*(registry.fetch('holders', 'solana', a) for a in addresses))
+        missing_chain = await registry.fetch('holders', 'bsc', 'tok0')
+
+        analyzer = HolderAnalyzer(MemeHunterConfig())
+        analyzer.providers = registry
+        holders = await analyzer.analyze_holders('tok1', 'solana')
+        stats = registry.stats()['solana:holders']
+    await server.stop()
+    return addresses, first, calls_after_first, server.calls, missing_chain, holders, stats
+
+
+def test_batched_lookups():
+    """Test concurrent lookups share RPC calls and results are cached"""
+    addresses, first, calls_first, calls_total, missing_chain, holders, stats = asyncio.run(_batching())
+    print_test("120 lookups in 3 RPC calls", calls_first == 3, f"{calls_first} calls")
+    print_test("results match addresses", first == [_holder_stats(a) for a in addresses])
+    print_test("second pass served from cache", calls_total == 3 and stats['cache_hits'] >= 120)
+    print_test("chain without provider → None", missing_chain is None)
+    print_test("analyzer uses provider data",
+               holders['total_holders'] == _holder_stats('tok1')['total_holders']
+               and holders['whale_risk'] != 'UNKNOWN')
+
+
+async def _slow_explorer():
+    server = LocalRpcServer(latency=1.0)
+    url = await server.start()
+    async with aiohttp.ClientSession() as session:
+        registry = create_rpc_registry(session, {'solana': url}, timeout=0.1, batch_window=0.005)
+        provider = registry.get_provider('security', 'solana')
+        provider.breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.3)
+        checker = SecurityChecker(MemeHunterConfig())
+        checker.providers = registry
+
+        started = time.monotonic()
+        results = [await checker.check_token_security(f"slow{i}", 'solana') for i in range(4)]
+        elapsed = time.monotonic() - started
+        state_open = provider.breaker.state
+        calls_while_open = server.calls
+
+        server.latency = 0
+        await asyncio.sleep(0.35)
+        recovered = await provider.get('fresh')
+        stats = dict(provider.stats)
+        state_after = provider.breaker.state
+    await server.stop()
+    return results, elapsed, state_open, calls_while_open, recovered, stats, state_after
+
+
+def test_timeout_and_breaker():
+    """Test a slow explorer falls back fast, trips the breaker and recovers"""
+    results, elapsed, state_open, calls, recovered, stats, state_after = asyncio.run(_slow_explorer())
+    print_test("slow provider never blocks", elapsed < 0.5, f"{elapsed:.2f}s for 4 checks")
+    print_test("fallback values used", all(r['contract_verified'] and not r['honeypot_risk'] for r in results))
+    print_test("breaker opens after 2 failures", state_open == 'open' and calls == 2
+               and stats['short_circuited'] == 2, str(stats))
+    print_test("half-open trial closes breaker", recovered is not None and state_after == 'closed')
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 On-Chain Providers - Test Suite")
+    print("=" * 60)
+
+    test_batched_lookups()
+    test_timeout_and_breaker()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
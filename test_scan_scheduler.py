@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Scan Scheduler
+اختبار توقيت الفحص المتكيف، ترتيب الـ heap، ميزانية الطلبات، وربطها بـ CryptoKillerBot
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scan_scheduler import ScanScheduler
+import crypto_killer_bot
+from crypto_killer_bot import CryptoKillerBot, CryptoKillerStrategy, KillerConfig
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_interval():
+    """Test quiet symbols wait an hour and near-miss or active ones a minute"""
+    scheduler = ScanScheduler()
+    quiet = scheduler.interval(atr_ratio=0.8, volume_spike=0.9, score=0)
+    near = scheduler.interval(score=250)
+    spike = scheduler.interval(volume_spike=3.5)
+    hot = scheduler.interval(atr_ratio=1.4)
+    middle = scheduler.interval(score=100)
+    print_test("quiet → hourly", quiet == 3600, f"{quiet:.0f}s")
+    print_test("near miss / spike / ATR → every minute", near == spike == hot == 60)
+    print_test("monotonic in between", 60 < middle < 3600
+               and scheduler.interval(score=150) < middle, f"{middle:.0f}s")
+
+
+def test_heap_and_budget():
+    """Test due order, the per-minute budget and universe changes"""
+    clock = Clock()
+    scheduler = ScanScheduler(requests_per_minute=5, clock=clock)
+    symbols = [f"C{i}/USDT" for i in range(12)]
+    scheduler.sync(symbols)
+
+    first = scheduler.due()
+    print_test("budget caps a cycle", first == symbols[:5], str(first))
+    print_test("budget exhausted → wait", scheduler.due() == [] and scheduler.next_due_in() == 60)
+
+    for symbol in first:
+        scheduler.record(symbol, score=300 if symbol == 'C0/USDT' else 0)
+    clock.now += 60
+    second = scheduler.due()
+    print_test("overdue before rescheduled", second == symbols[5:10])
+    for symbol in second:
+        scheduler.record(symbol)
+
+    clock.now += 60
+    third = scheduler.due()
+    print_test("near miss back after a minute", third == ['C10/USDT', 'C11/USDT', 'C0/USDT'], str(third))
+
+    print_test("in flight not duplicated by sync", scheduler.sync(symbols) == 0 and 'C0/USDT' not in scheduler.due())
+    for symbol in third:
+        scheduler.record(symbol)
+    scheduler.sync(symbols[:3] + ['NEW/USDT'])
+    clock.now += 60
+    print_test("removed symbols forgotten", scheduler.due() == ['NEW/USDT'] and len(scheduler) == 3)
+    clock.now += 3600
+    print_test("quiet symbols after an hour", sorted(scheduler.due()) == sorted(symbols[:3]))
+
+
+def test_budget_spent_on_active():
+    """Test a fixed budget is spent mostly on active symbols over a simulated day"""
+    clock = Clock()
+    scheduler = ScanScheduler(requests_per_minute=10, clock=clock)
+    active = {f"A{i}/USDT" for i in range(3)}
+    symbols = sorted(active) + [f"Q{i}/USDT" for i in range(27)]
+    scheduler.sync(symbols)
+    scans = {s: 0 for s in symbols}
+    for _ in range(24 * 60):                # دقيقة بدقيقة
+        for symbol in scheduler.due():
+            scans[symbol] += 1
+            scheduler.record(symbol, score=220 if symbol in active else 20)
+        clock.now += 60
+    active_share = sum(scans[s] for s in active) / sum(scans.values())
+    fixed = 24 * 60 // 5 * len(symbols)     # الفحص الثابت كل 5 دقائق
+    print_test("active symbols every minute", min(scans[s] for s in active) >= 24 * 60 - 3,
+               str(sorted(scans[s] for s in active)))
+    print_test("budget spent where signals are likely", active_share > 0.75 and sum(scans.values()) < fixed,
+               f"{sum(scans.values())} vs {fixed}, active share {active_share:.0%}")
+
+
+def test_killer_bot_wiring():
+    """Test the killer bot reschedules each scanned symbol from its score and activity"""
+    bot = object.__new__(CryptoKillerBot)
+    bot.strategy = CryptoKillerStrategy()
+    clock = Clock()
+    bot.scheduler = ScanScheduler(clock=clock)
+    rng = np.random.default_rng(50)
+
+    def fetch(symbol):
+        if symbol == 'DOWN/USDT':
+            return None
+        close = 100 + np.cumsum(rng.normal(0, 0.5, 200))
+        volume = rng.uniform(1, 10, 200)
+        if symbol == 'SPIKE/USDT':
+            volume[-1] = 100
+        return pd.DataFrame({'open': close, 'high': close + 0.5, 'low': close - 0.5,
+                             'close': close, 'volume': volume})
+    bot._fetch_frame = fetch
+
+    symbols = ['FLAT/USDT', 'SPIKE/USDT', 'DOWN/USDT']
+    bot.scheduler.sync(symbols)
+    bot._scan_symbols(bot.scheduler.due())
+    pending = {s: at - clock.now for at, seq, s in bot.scheduler._heap if bot.scheduler._entries.get(s) == seq}
+    print_test("all symbols rescheduled", set(pending) == set(symbols), str(pending))
+    print_test("volume spike → next minute", pending['SPIKE/USDT'] == KillerConfig.SCAN_MIN_INTERVAL)
+    print_test("failed fetch retried", pending['DOWN/USDT'] == KillerConfig.SCAN_INTERVAL)
+
+
+def test_interrupted_scan_requeued():
+    """Test symbols picked by due() are not lost when the scan raises"""
+    bot = object.__new__(CryptoKillerBot)
+    clock = Clock()
+    bot.scheduler = ScanScheduler(clock=clock)
+    bot._fetch_frame = lambda symbol: pd.DataFrame({'close': [1.0]})
+
+    class Broken:
+        def __init__(self, frames):
+            raise ValueError("bad batch")
+
+    symbols = ['AAA/USDT', 'BBB/USDT']
+    bot.scheduler.sync(symbols)
+    picked = bot.scheduler.due()
+    original = crypto_killer_bot.BatchIndicators
+    crypto_killer_bot.BatchIndicators = Broken
+    try:
+        bot._scan_symbols(picked)
+        raised = False
+    except ValueError:
+        raised = True
+    finally:
+        crypto_killer_bot.BatchIndicators = original
+
+    print_test("error still propagates", raised)
+    print_test("nothing left in flight", not bot.scheduler._inflight)
+    clock.now += KillerConfig.SCAN_INTERVAL
+    print_test("picked symbols scanned again", sorted(bot.scheduler.due()) == symbols)
+    print_test("requeue skips recorded symbols", bot.scheduler.requeue(symbols, 60) == 2
+               and bot.scheduler.requeue(symbols, 60) == 0)
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Scan Scheduler - Test Suite")
+    print("=" * 60)
+
+    test_interval()
+    test_heap_and_budget()
+    test_budget_spent_on_active()
+    test_killer_bot_wiring()
+    test_interrupted_scan_requeued()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
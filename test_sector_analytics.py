@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Sector Analytics
+اختبار قاموس القطاعات المُجمّع، الاختزالات المجمّعة مقابل pandas groupby، وزخم القطاع في الإشارة والتنبيه
+"""
+
+import sys
+import os
+import ast
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sector_analytics import SectorMap, compute_sector_stats
+from advanced_trading_bot import TradingConfig, TechnicalAnalyzer, TelegramNotifier
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def _coins(count=60, seed=48):
+    rng = np.random.default_rng(seed)
+    bases = list(TradingConfig.CRYPTO_SECTORS)[:count - 5] + ['NEW1', 'NEW2', 'NEW3', 'NEW4', 'NEW5']
+    return [{'symbol': f"{b}/USDT", 'change_24h': float(rng.normal(0, 5)),
+             'volume': float(rng.uniform(1e6, 1e8))} for b in bases]
+
+
+def test_sector_map():
+    """Test the literal has no silently overwritten keys and lookups use the primary sector"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'advanced_trading_bot.py')
+    tree = ast.parse(open(path, encoding='utf-8').read())
+    keys = next(node.value.keys for node in ast.walk(tree) if isinstance(node, ast.Assign)
+                and getattr(node.targets[0], 'id', None) == 'CRYPTO_SECTORS')
+    names = [k.value for k in keys]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    print_test("no duplicate keys", not duplicates, str(duplicates))
+
+    print_test("primary sector", TradingConfig.get_sector('AAVE/USDT') == 'DeFi (Lending)'
+               and TradingConfig.get_sector('DOGEUSDT') == 'Memecoin'
+               and TradingConfig.get_sector('ens/USDT') == 'Governance')
+    print_test("unknown → Other", TradingConfig.get_sector('NEW1/USDT') == 'Other')
+    lookup = SectorMap({'A': 'X', 'B': 'Y'})
+    print_test("codes", list(lookup.codes(['A/USDT', 'B/USDT', 'C/USDT'])) == [0, 1, 2]
+               and lookup.names == ['X', 'Y', 'Other'])
+
+
+def test_matches_groupby():
+    """Test the bincount reductions equal a pandas groupby per sector"""
+    coins = _coins()
+    snapshot = compute_sector_stats(coins, TradingConfig.SECTOR_LOOKUP)
+
+    df = pd.DataFrame(coins)
+    df['sector'] = df['symbol'].map(TradingConfig.get_sector)
+    df['weighted'] = df['change_24h'] * df['volume']
+    market = df['weighted'].sum() / df['volume'].sum()
+    grouped = df.groupby('sector').agg(count=('symbol', 'size'), volume=('volume', 'sum'),
+                                       weighted=('weighted', 'sum'),
+                                       breadth=('change_24h', lambda c: (c > 0).mean()))
+    errors = []
+    for sector, row in grouped.iterrows():
+        stats = snapshot.stats[sector]
+        errors += [abs(stats['return'] - row['weighted'] / row['volume']),
+                   abs(stats['relative_strength'] - (row['weighted'] / row['volume'] - market)),
+                   abs(stats['volume_share'] - row['volume'] / df['volume'].sum()),
+                   abs(stats['breadth'] - row['breadth']), abs(stats['count'] - row['count'])]
+    print_test("same as groupby", set(snapshot.stats) == set(grouped.index) and max(errors) < 1e-9,
+               f"{len(grouped)} sectors")
+    ranks = sorted(s['rank'] for s in snapshot.stats.values())
+    print_test("ranks", ranks == list(range(1, len(ranks) + 1))
+               and snapshot.stats[snapshot.leaders(1)[0]]['rank'] == 1)
+    print_test("features", snapshot.features('NEW1/USDT')['sector'] == 'Other'
+               and snapshot.features('MISSING/USDT') is None)
+    print_test("empty universe", compute_sector_stats([], TradingConfig.SECTOR_LOOKUP).stats == {})
+
+
+def test_signal_and_alert():
+    """Test sector momentum tips a borderline signal and shows in the alert"""
+    analysis = {'ema': {'signal': 'BUY'}, 'rsi': {'value': 50}, 'macd': {'trend': 'NEUTRAL'}}
+    trend = {'ema': {'signal': 'BUY'}}
+    analyzer = TechnicalAnalyzer()
+    coins = [{'symbol': 'SOL/USDT', 'change_24h': 8.0, 'volume': 5e7},
+             {'symbol': 'ETH/USDT', 'change_24h': 6.0, 'volume': 5e7},
+             {'symbol': 'DOGE/USDT', 'change_24h': -3.0, 'volume': 2e8},
+             {'symbol': 'SHIB/USDT', 'change_24h': -4.0, 'volume': 1e8}]
+    lookup = SectorMap({'SOL': 'Layer 1', 'ETH': 'Layer 1', 'DOGE': 'Memecoin', 'SHIB': 'Memecoin'})
+    snapshot = compute_sector_stats(coins, lookup)
+    leading = snapshot.features('SOL/USDT')
+
+    base = analyzer.generate_trading_signal(analysis, trend)
+    print_test("unchanged without sector", base == analyzer.generate_trading_signal(analysis, trend, None)
+               and base[0] == 'NEUTRAL')
+    print_test("leading sector adds momentum", leading['momentum'] == 'LEADING'
+               and analyzer.generate_trading_signal(analysis, trend, leading)[0] == 'BUY')
+    print_test("lagging sector", snapshot.features('DOGE/USDT')['momentum'] == 'LAGGING')
+
+    notifier = object.__new__(TelegramNotifier)
+    message = notifier._format_alert_message('SOL/USDT', {'signal_type': 'BUY', 'current_price': 100,
+                                                          'sector': leading})
+    print_test("alert shows sector", 'Layer 1' in message and 'RS' in message)
+    print_test("alert without sector", '🧭' not in notifier._format_alert_message('SOL/USDT', {'current_price': 100}))
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Sector Analytics - Test Suite")
+    print("=" * 60)
+
+    test_sector_map()
+    test_matches_groupby()
+    test_signal_and_alert()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
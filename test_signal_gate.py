@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Signal Gate
+اختبار الحد اليومي والكولداون والحفظ/الاسترجاع
+"""
+
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from signal_gate import SignalGate
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def test_limits_and_cooldown():
+    """Test daily limits, per-key limits and cooldown expiry"""
+    gate = SignalGate(cooldown_hours=1, max_per_day=3, max_per_key_per_day=2)
+    now = datetime.now()
+
+    print_test("fresh key allowed", gate.allow('BTC'))
+    gate.record('BTC', last_price=100.0)
+    print_test("cooldown blocks", gate.blocked_reason('BTC') == 'cooldown')
+    print_test("meta kept", gate.last_signal('BTC')[1] == {'last_price': 100.0})
+    print_test("remaining time", timedelta(minutes=59) < gate.cooldown_remaining('BTC') <= timedelta(hours=1))
+
+    # إشارة قديمة (انتهى كولداونها) تُحسب في عداد اليوم فقط
+    earlier = max(now - timedelta(hours=2), now.replace(hour=0, minute=0, second=0, microsecond=0))
+    gate.record('ETH', at=earlier)
+    print_test("expired cooldown not stored", gate.last_signal('ETH') is None or earlier + timedelta(hours=1) > now)
+    gate.record('ETH', at=earlier)
+    print_test("per-key daily limit", gate.blocked_reason('ETH') in ('key_daily_limit', 'daily_limit'))
+    print_test("total daily limit", gate.today_count == 3 and gate.blocked_reason('SOL') == 'daily_limit')
+
+    tomorrow = now + timedelta(days=1)
+    print_test("new day resets counters", gate.blocked_reason('SOL', now=tomorrow) is None
+               and gate.today_count == 0)
+    print_test("expired cooldown evicted lazily", gate.blocked_reason('BTC', now=tomorrow) is None
+               and len(gate._cooldowns) == 0)
+
+
+def test_state_and_scale():
+    """Test state round trip and O(1) checks over many keys"""
+    gate = SignalGate(cooldown_hours=4, max_per_day=100000)
+    for i in range(20000):
+        gate.record(f"tok{i}")
+    restored = SignalGate(cooldown_hours=4, max_per_day=100000)
+    restored.restore_state(gate.to_state())
+    print_test("state round trip", restored.today_count == 20000 and len(restored) == 20000
+               and restored.blocked_reason('tok5') == 'cooldown')
+
+    # إعادة تسجيل نفس المفتاح: المدخل القديم في الـ heap يُتجاهل عند الحذف
+    gate.record('tok0', at=datetime.now() + timedelta(hours=10))
+    gate._evict(datetime.now() + timedelta(hours=5))
+    print_test("stale heap entries ignored", len(gate._cooldowns) == 1 and 'tok0' in gate._cooldowns)
+
+    started = time.perf_counter()
+    for i in range(20000):
+        restored.blocked_reason(f"new{i}")
+    elapsed = time.perf_counter() - started
+    print_test("20k checks fast", elapsed < 0.5, f"{elapsed * 1000:.0f}ms")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Signal Gate - Test Suite")
+    print("=" * 60)
+
+    test_limits_and_cooldown()
+    test_state_and_scale()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for State Snapshot Store
+اختبار حفظ واسترجاع حالة البوت
+"""
+
+import sys
+import os
+import tempfile
+from collections import deque
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from state_store import StateStore
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def test_round_trip():
+    """Test save → load"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.pkl')
+        store = StateStore(path)
+
+        print_test("missing file → empty state", store.load() == {})
+
+        state = {
+            'last_signal_time': {'BTC': datetime(2024, 1, 1, 12, 0)},
+            'history': {'ETH': deque([1, 2, 3])}
+        }
+        print_test("save", store.save(state))
+        print_test("load", StateStore(path).load() == state)
+
+        # لا ملفات مؤقتة متبقية بعد الاستبدال الذري
+        leftovers = [f for f in os.listdir(tmp) if f != 'state.pkl']
+        print_test("no temp files left", leftovers == [], str(leftovers))
+
+
+def test_corrupt_file():
+    """Test corrupt snapshot is ignored"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.pkl')
+        with open(path, 'wb') as f:
+            f.write(b'not a pickle')
+        print_test("corrupt file → empty state", StateStore(path).load() == {})
+
+
+def test_checkpoint_on_stop():
+    """Test final checkpoint on stop()"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.pkl')
+        counter = {'n': 0}
+
+        def provider():
+            counter['n'] += 1
+            return {'n': counter['n']}
+
+        store = StateStore(path, interval=3600)
+        store.start(provider)
+        store.stop()
+        print_test("final checkpoint", StateStore(path).load() == {'n': 1})
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 State Store - Test Suite")
+    print("=" * 60)
+
+    test_round_trip()
+    test_corrupt_file()
+    test_checkpoint_on_stop()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Tail Windows
+اختبار كشف الـ Range بتمريرة واحدة مقابل الحلقات الأصلية في البوتات الثلاثة
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tail_windows import TailWindows
+from crypto_adaptive_bot import RangeStrategy, AdaptiveConfig
+from crypto_killer_bot import RangeDetector, KillerConfig
+from advanced_trading_bot import TechnicalAnalyzer
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+# ============================================================================
+# المرجع: الحلقات الأصلية
+# ============================================================================
+
+def _legacy_adaptive(df):
+    max_range = AdaptiveConfig.CONSOLIDATION_MAX_RANGE_PCT / 100
+    for lookback in range(AdaptiveConfig.CONSOLIDATION_MAX_CANDLES, AdaptiveConfig.CONSOLIDATION_MIN_CANDLES - 1, -1):
+        window = df.iloc[-lookback:]
+        high, low = window['high'].max(), window['low'].min()
+        range_pct = (high - low) / low
+        if range_pct <= max_range:
+            position = (df['close'].iloc[-1] - low) / (high - low) if high > low else 0.5
+            return {'found': True, 'score': 100, 'duration_candles': lookback, 'range_pct': range_pct * 100,
+                    'high': high, 'low': low, 'position': position * 100, 'in_discount': position < 0.4}
+    return {'found': False, 'score': 0}
+
+
+def _legacy_killer_duration(df):
+    recent = df.tail(int(KillerConfig.RANGE_MAX_DURATION))
+    high, low = recent['high'].max(), recent['low'].min()
+    return high, low, sum(1 for i in range(len(recent))
+                          if recent.iloc[i]['low'] >= low * 0.995 and recent.iloc[i]['high'] <= high * 1.005)
+
+
+def _random_frames(count=300, seed=43):
+    rng = np.random.default_rng(seed)
+    for t in range(count):
+        n = int(rng.integers(10, 80))
+        # تذبذب يتغير لتظهر نوافذ ضيقة بأطوال مختلفة
+        close = 100 * np.exp(np.cumsum(rng.normal(0, rng.choice([0.0005, 0.002, 0.01]), n)))
+        yield pd.DataFrame({
+            'open': close,
+            'high': close * (1 + rng.uniform(0, 0.002, n)),
+            'low': close * (1 - rng.uniform(0, 0.002, n)),
+            'close': close,
+            'volume': rng.uniform(1, 100, n)
+        })
+
+
+# ============================================================================
+# الاختبارات
+# ============================================================================
+
+def test_same_best_window():
+    """Test the adaptive bot picks the same window as the 17-slice loop"""
+    strategy = RangeStrategy()
+    mismatches, lengths = 0, set()
+    for df in _random_frames():
+        result = strategy._detect_consolidation(df)
+        mismatches += repr(result) != repr(_legacy_adaptive(df))
+        lengths.add(result.get('duration_candles'))
+    print_test("identical result on 300 frames", mismatches == 0, f"{len(lengths)} distinct windows")
+    print_test("window lengths exercised", len(lengths) > 5 and None in lengths)
+
+
+def test_killer_and_advanced():
+    """Test the other two bots read the same range from the shared windows"""
+    detector, analyzer = RangeDetector(), TechnicalAnalyzer()
+    mismatches = 0
+    for df in _random_frames():
+        high, low, duration = _legacy_killer_duration(df)
+        result = detector.detect_consolidation(df)
+        if result.get('in_range'):
+            mismatches += (result['high'], result['low'], result['duration']) != (high, low, duration)
+        elif len(df) >= KillerConfig.RANGE_MIN_DURATION:
+            mismatches += 'range_pct' in result and result['range_pct'] != (high - low) / low * 100
+
+        if len(df) >= 20:
+            consolidation = analyzer._detect_consolidation(df)
+            recent = df.tail(20)
+            mismatches += (consolidation['high'], consolidation['low']) != (
+                float(recent['high'].values.max()), float(recent['low'].values.min()))
+    print_test("killer + advanced ranges identical", mismatches == 0)
+
+
+def test_windows_and_speed():
+    """Test suffix stats for every length and the single-pass speedup"""
+    rng = np.random.default_rng(5)
+    close = rng.uniform(90, 110, 200)
+    close[-3] = np.nan
+    df = pd.DataFrame({'high': close + 1, 'low': close - 1, 'close': rng.uniform(90, 110, 200)})
+    windows = TailWindows(df, 32)
+    print_test("max/min/mean per length", all(
+        windows.high_of(n) == df['high'].iloc[-n:].max() and windows.low_of(n) == df['low'].iloc[-n:].min()
+        and np.isclose(windows.mean_of(n), df['close'].iloc[-n:].mean()) for n in range(1, 33)))
+    print_test("longer than data", TailWindows(df.head(5), 32).high_of(32) == df['high'].head(5).max())
+
+    strategy = RangeStrategy()
+    frames = list(_random_frames(100, seed=9))
+    started = time.perf_counter()
+    for df in frames:
+        _legacy_adaptive(df)
+    legacy = time.perf_counter() - started
+    started = time.perf_counter()
+    for df in frames:
+        strategy._detect_consolidation(df)
+    single = time.perf_counter() - started
+    print_test("single pass faster", single < legacy, f"{legacy * 1000:.0f}ms → {single * 1000:.0f}ms")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Tail Windows - Test Suite")
+    print("=" * 60)
+
+    test_same_best_window()
+    test_killer_and_advanced()
+    test_windows_and_speed()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Trade Outcome Monitor
+اختبار متابعة الصفقات المفتوحة (T1 / T2 / SL / Trailing / Time)
+"""
+
+import sys
+import os
+import time
+import random
+import pickle
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from trade_monitor import TradeMonitor, journal_outcome
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def test_targets_and_stops():
+    """Test T1 → T2 for BUY and SL for SELL"""
+    events = []
+    monitor = TradeMonitor(events.append)
+    buy = monitor.add('AAA/USDT', 'BUY', 100, 103, 105, 98)
+    sell = monitor.add('AAA/USDT', 'SELL', 100, 97, 95, 102)
+
+    for price in (101, 103.2, 102.4, 105.1):
+        monitor.on_price('AAA/USDT', price)
+
+    kinds = [(e['signal_id'], e['event']) for e in events]
+    print_test("SELL SL, BUY T1 then T2", kinds == [(sell, 'SL'), (buy, 'T1'), (buy, 'T2')], str(kinds))
+    print_test("all closed", len(monitor) == 0)
+    print_test("T2 pnl", abs(events[-1]['pnl_pct'] - 5.1) < 1e-9)
+
+
+def test_trailing_and_time_exit():
+    """Test trailing stop follows the peak and time exit"""
+    events = []
+    monitor = TradeMonitor(events.append)
+    trail = monitor.add('BBB/USDT', 'BUY', 100, 150, 160, 90,
+                        trailing_trigger_pct=3, trailing_pct=1.5)
+    timed = monitor.add('CCC/USDT', 'BUY', 10, 11, 12, 9, max_hours=1)
+
+    for price in (102, 103.5, 106, 104.5):
+        monitor.on_price('BBB/USDT', price)
+    print_test("no trailing exit above peak - 1.5%", events == [])
+
+    monitor.on_price('BBB/USDT', 104.3)
+    print_test("trailing exit", [e['event'] for e in events] == ['TRAIL'])
+    print_test("trailing signal id", events[0]['signal_id'] == trail)
+
+    monitor.on_price('CCC/USDT', 10.2)
+    monitor.check_time_exits(now=time.time() + 2 * 3600)
+    print_test("time exit", events[-1]['event'] == 'TIME' and events[-1]['signal_id'] == timed)
+    print_test("time exit outcome", journal_outcome(events[-1]) == 'EXPIRED')
+    print_test("stop after T1 outcome", journal_outcome(dict(events[-1], event='SL', t1_hit=True)) == 'T1_SL')
+
+
+def test_many_open_signals():
+    """Test thousands of open signals stay consistent"""
+    rng = random.Random(7)
+    events = []
+    monitor = TradeMonitor(events.append)
+    for _ in range(5000):
+        entry = rng.uniform(90, 110)
+        monitor.add('DDD/USDT', 'BUY', entry, entry * 1.03, entry * 1.05, entry * 0.98,
+                    trailing_trigger_pct=2, trailing_pct=1)
+
+    start = time.time()
+    price = 100.0
+    for _ in range(2000):
+        price *= 1 + rng.uniform(-0.004, 0.004)
+        monitor.on_price('DDD/USDT', price)
+    elapsed = time.time() - start
+
+    closed = {e['signal_id'] for e in events if e['closed']}
+    print_test("closed + open = total", len(closed) + len(monitor) == 5000,
+               f"{len(closed)} closed in {elapsed:.2f}s")
+
+
+def test_restart_restore():
+    """Test open trades survive a snapshot/restore with T1 and trailing progress"""
+    before = []
+    monitor = TradeMonitor(before.append)
+    t1 = monitor.add('AAA/USDT', 'BUY', 100, 103, 110, 98, signal_id='t1')
+    trail = monitor.add('BBB/USDT', 'SELL', 100, 80, 70, 110, signal_id='trail',
+                        trailing_trigger_pct=3, trailing_pct=1.5)
+    timed = monitor.add('CCC/USDT', 'BUY', 10, 11, 12, 9, signal_id='timed', max_hours=1)
+    monitor.on_price('AAA/USDT', 103.5)
+    for price in (96, 94):
+        monitor.on_price('BBB/USDT', price)
+    print_test("progress before restart", [e['event'] for e in before] == ['T1'])
+
+    events = []
+    restored = TradeMonitor(events.append)
+    restored.restore_state(pickle.loads(pickle.dumps(monitor.to_state())))
+    print_test("all open trades restored", len(restored) == 3 and restored.open_symbols() == monitor.open_symbols())
+
+    restored.on_price('AAA/USDT', 104)
+    print_test("T1 not re-fired", events == [])
+    restored.on_price('AAA/USDT', 97.5)
+    print_test("stop after T1 keeps t1_hit", events[-1]['signal_id'] == t1
+               and journal_outcome(events[-1]) == 'T1_SL')
+
+    restored.on_price('BBB/USDT', 95.3)
+    print_test("no trailing exit under low + 1.5%", events[-1]['signal_id'] == t1)
+    restored.on_price('BBB/USDT', 95.5)
+    print_test("trailing peak kept (94 + 1.5%)", events[-1]['signal_id'] == trail
+               and events[-1]['event'] == 'TRAIL', str(events[-1]['price']))
+
+    restored.check_time_exits(now=time.time() + 2 * 3600)
+    print_test("expiry kept", events[-1]['signal_id'] == timed and events[-1]['event'] == 'TIME')
+    restored.restore_state({})
+    print_test("empty state", len(restored) == 0)
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Trade Monitor - Test Suite")
+    print("=" * 60)
+
+    test_targets_and_stops()
+    test_trailing_and_time_exit()
+    test_many_open_signals()
+    test_restart_restore()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Universe Prefilter
+اختبار الفلتر المسبق لكل أزواج USDT
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from universe_prefilter import UniversePrefilter
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+def _make_universe(n=300, seed=3):
+    rng = np.random.default_rng(seed)
+    tickers, candles = {}, {}
+    for i in range(n):
+        symbol = f"C{i:03d}/USDT"
+        price = float(rng.uniform(0.1, 100))
+        tickers[symbol] = {
+            'last': price,
+            'high': price * 1.05,
+            'low': price * 0.95,
+            'bid': price * 0.9999,
+            'ask': price * 1.0001,
+            'quoteVolume': float(rng.uniform(5e5, 5e7))
+        }
+        closes = price * np.exp(np.cumsum(rng.normal(0, 0.002, 25)))
+        volumes = rng.uniform(100, 200, 25)
+        candles[symbol] = [[t, c, c * 1.001, c * 0.999, c, v]
+                           for t, (c, v) in enumerate(zip(closes, volumes))]
+    # عملة متقلبة بانفجار حجم واضح في آخر شمعة مغلقة
+    for t, candle in enumerate(candles['C299/USDT']):
+        candle[4] *= 1.03 if t % 2 else 0.97
+    candles['C299/USDT'][-2][5] = 10_000
+    return tickers, candles
+
+
+def test_stage1():
+    """Test ticker-only filter"""
+    tickers, _ = _make_universe()
+    tickers['WIDE/USDT'] = {'last': 1.0, 'high': 1.1, 'low': 0.9, 'bid': 0.98, 'ask': 1.02,
+                            'quoteVolume': 9e7}
+    prefilter = UniversePrefilter(lambda *a, **k: [])
+    stage1 = prefilter.stage1(tickers, tickers.keys())
+    volumes = [tickers[s]['quoteVolume'] for s in stage1]
+    print_test("wide spread rejected", 'WIDE/USDT' not in stage1)
+    print_test("low volume rejected", all(v >= 1_000_000 for v in volumes), f"{len(stage1)} kept")
+    print_test("sorted by volume", volumes == sorted(volumes, reverse=True))
+
+
+def test_select():
+    """Test two-stage selection and candle caching"""
+    tickers, candles = _make_universe()
+    tickers['C299/USDT']['quoteVolume'] = 2e6
+    calls = []
+
+    def loader(symbol, timeframe, limit=None):
+        calls.append(symbol)
+        return candles[symbol][-limit:]
+
+    prefilter = UniversePrefilter(loader, max_survivors=20, core_top=5)
+    survivors = prefilter.select(tickers, tickers.keys())
+    stage1 = prefilter.stage1(tickers, tickers.keys())
+
+    print_test("survivor count", len(survivors) == 20, str(prefilter.last_stats))
+    print_test("core top by volume kept", survivors[:5] == stage1[:5])
+    print_test("volume spike survives", 'C299/USDT' in survivors)
+
+    fetched = len(calls)
+    prefilter.select(tickers, tickers.keys())
+    print_test("candles cached within bar", len(calls) == fetched, f"{fetched} fetches")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Universe Prefilter - Test Suite")
+    print("=" * 60)
+
+    test_stage1()
+    test_select()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧪 Test Suite for Zone Registry
+اختبار فهرس الفترات وسجل FVG / Order Blocks التدريجي مقابل إعادة الكشف الكاملة
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from zone_registry import IntervalIndex, ZoneRegistry
+from crypto_killer_bot import FVGHunter, SmartOrderBlockDetector, KillerConfig
+
+
+def print_test(name, passed, message=""):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    msg = f" - {message}" if message else ""
+    print(f"  {status}: {name}{msg}")
+    assert passed, name
+
+
+# ============================================================================
+# المرجع: إعادة الكشف الكاملة بالحلقات
+# ============================================================================
+
+def _reference_fvg(df):
+    high, low, close = df['high'].values, df['low'].values, df['close'].values
+    zones = []
+    for i in range(1, len(df) - 1):
+        gap_size = low[i+1] - high[i-1]
+        if gap_size <= 0:
+            continue
+        gap_percent = gap_size / close[i] * 100
+        if gap_percent <= KillerConfig.FVG_MIN_SIZE * 100:
+            continue
+        filled = 0
+        for j in range(i + 2, len(df)):
+            if low[j] <= low[i+1]:
+                filled = max(filled, min(100.0, (low[i+1] - low[j]) / gap_size * 100))
+        if filled < KillerConfig.FVG_MAX_FILLED:
+            zones.append((i, low[i+1], high[i-1], filled))
+    return zones
+
+
+def _reference_order_blocks(df):
+    blocks = []
+    avg_volume = df['volume'].rolling(50).mean()
+    for i in range(20, len(df) - 5):
+        candle = df.iloc[i]
+        full_range = candle['high'] - candle['low']
+        if full_range == 0:
+            continue
+        if (candle['close'] < candle['open']
+                and abs(candle['close'] - candle['open']) / full_range > KillerConfig.OB_BODY_THRESHOLD
+                and candle['volume'] > avg_volume.iloc[i] * KillerConfig.OB_VOLUME_MULTIPLIER):
+            next_3 = df.iloc[i+1:i+4]
+            if all(next_3['close'] > next_3['open']):
+                rally_size = (df['close'].iloc[i+3] - df['close'].iloc[i]) / df['close'].iloc[i]
+                if rally_size > KillerConfig.OB_RALLY_MIN:
+                    touches = sum(1 for j in range(i + 4, len(df))
+                                  if df['low'].iloc[j] <= candle['high'] and df['high'].iloc[j] >= candle['low'])
+                    if touches <= KillerConfig.OB_MAX_TOUCHES:
+                        blocks.append((i, candle['high'], candle['low'], touches, rally_size * 100))
+    return blocks
+
+
+def _random_candles(n=400, seed=42):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = close - rng.normal(0, 1, n)
+    volume = rng.uniform(100, 200, n)
+    # قفزات (FVG) وشموع هابطة ضخمة يليها صعود (OB)
+    for i in range(60, n - 6, 37):
+        open_[i], close[i] = close[i - 1] + 2, close[i - 1] - 2
+        volume[i] = 1000
+        for k in range(1, 4):
+            open_[i + k] = close[i + k - 1] + 0.1
+            close[i + k] = open_[i + k] + 1.5
+        close[i + 4:] += close[i + 3] - close[i + 4] + 0.5
+        open_[i + 4:] += close[i + 3] - open_[i + 4] + 0.5
+    high = np.maximum(open_, close) + rng.uniform(0, 0.3, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 0.3, n)
+    index = pd.date_range('2024-01-01', periods=n, freq='15min')
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}, index=index)
+
+
+def _windows(df, size=200):
+    """نوافذ منزلقة مثل جلب الشموع كل دورة (الشمعة الأخيرة قيد التكوين وتتغير)"""
+    rng = np.random.default_rng(7)
+    for end in range(size, len(df) + 1):
+        window = df.iloc[end - size:end].copy()
+        window.iloc[-1, window.columns.get_loc('low')] -= rng.uniform(0, 3)
+        yield window
+
+
+# ============================================================================
+# الاختبارات
+# ============================================================================
+
+def test_interval_index():
+    """Test stabbing and overlap queries against brute force"""
+    rng = np.random.default_rng(1)
+    index, intervals = IntervalIndex(), {}
+    mismatches = 0
+    for step in range(2000):
+        if intervals and rng.random() < 0.3:
+            item_id = int(rng.choice(list(intervals)))
+            index.remove(item_id, intervals.pop(item_id)[0])
+        else:
+            low = float(rng.integers(0, 100))
+            intervals[step] = (low, low + float(rng.integers(0, 20)))
+            index.add(step, *intervals[step])
+        lo = float(rng.integers(0, 120))
+        hi = lo + float(rng.integers(0, 5))
+        expected = sorted(i for i, (a, b) in intervals.items() if a <= hi and b >= lo)
+        mismatches += sorted(index.overlapping(lo, hi)) != expected
+        mismatches += sorted(index.containing(lo)) != sorted(i for i, (a, b) in intervals.items() if a <= lo <= b)
+    print_test("queries match brute force", mismatches == 0, f"{len(index)} intervals left")
+
+
+def test_fvg_incremental():
+    """Test the per-symbol FVG registry matches a full rescan on every window"""
+    hunter = FVGHunter()
+    mismatches, seen = 0, 0
+    for window in _windows(_random_candles()):
+        tracked = hunter.detect_premium_fvg(window, 'BTC/USDT')
+        rescanned = FVGHunter().detect_premium_fvg(window)
+        reference = _reference_fvg(window)
+        as_tuples = sorted((z['index'], z['top'], z['bottom'], z['filled_percent']) for z in tracked)
+        mismatches += repr(tracked) != repr(rescanned) or as_tuples != sorted(reference)
+        seen += len(tracked)
+    print_test("incremental FVG == full rescan", mismatches == 0 and seen > 0, f"{seen} zones seen")
+
+    book = hunter.registry.book('BTC/USDT')
+    price = next(iter(book.zones.values())).low if book.zones else 0.0
+    inside = hunter.registry.containing('BTC/USDT', price)
+    print_test("price lookup", all(z.low <= price <= z.high for z in inside)
+               and len(inside) == sum(z.low <= price <= z.high for z in book.zones.values()))
+    print_test("filled gaps retired", all(z.fill < KillerConfig.FVG_MAX_FILLED for z in book.zones.values()))
+
+
+def test_order_blocks_incremental():
+    """Test the per-symbol order-block registry matches the original touch-counting loop"""
+    detector = SmartOrderBlockDetector()
+    mismatches, seen = 0, 0
+    for window in _windows(_random_candles()):
+        tracked = detector.find_institutional_order_blocks(window, 'ETH/USDT')
+        rescanned = SmartOrderBlockDetector().find_institutional_order_blocks(window)
+        reference = _reference_order_blocks(window)
+        as_tuples = sorted((b['index'], b['high'], b['low'], b['touches'], b['strength']) for b in tracked)
+        mismatches += repr(tracked) != repr(rescanned) or as_tuples != sorted(reference)
+        seen += len(tracked)
+    print_test("incremental OB == original loop", mismatches == 0 and seen > 0, f"{seen} blocks seen")
+
+
+def test_discontinuity_resets():
+    """Test a window that does not continue the previous one is rebuilt from scratch"""
+    hunter = FVGHunter()
+    df = _random_candles()
+    hunter.detect_premium_fvg(df.iloc[:150], 'SOL/USDT')
+    later = df.iloc[200:400]
+    print_test("gap in history rebuilt", repr(hunter.detect_premium_fvg(later, 'SOL/USDT'))
+               == repr(FVGHunter().detect_premium_fvg(later)))
+    print_test("registry stats", hunter.registry.stats()['symbols'] == 1 and len(ZoneRegistry()) == 0)
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "=" * 60)
+    print("🧪 Zone Registry - Test Suite")
+    print("=" * 60)
+
+    test_interval_index()
+    test_fvg_incremental()
+    test_order_blocks_incremental()
+    test_discontinuity_resets()
+
+    print("\n✅ All tests completed successfully!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
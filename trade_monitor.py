@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📡 Trade Outcome Monitor
+متابعة الإشارات المفتوحة مقابل الأسعار الحية وإطلاق تنبيهات المتابعة
+
+- مستويات الإطلاق مرتبة لكل عملة (bisect) - كل تحديث سعر O(log n + k)
+- T1 / T2 / SL / Trailing Stop / خروج زمني
+- الـ Trailing مجمّع حسب القمة (peak) - لا مسح كامل مع كل قمة جديدة
+- الخروج الزمني عبر min-heap
+- to_state / restore_state: الصفقات المفتوحة تنجو من إعادة التشغيل (StateStore)
+"""
+
+import time
+import heapq
+import uuid
+import bisect
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+# price_fetcher(symbols) -> {symbol: last_price}
+PriceFetcher = Callable[[List[str]], Dict[str, float]]
+
+# أنواع الأحداث
+EVENT_T1 = 'T1'
+EVENT_T2 = 'T2'
+EVENT_SL = 'SL'
+EVENT_TRAIL = 'TRAIL'
+EVENT_TIME = 'TIME'
+
+_ARM = 'ARM'  # تفعيل الـ Trailing (داخلي)
+
+# عناوين رسائل المتابعة
+EVENT_TITLES = {
+    EVENT_T1: '🎯 T1 Hit',
+    EVENT_T2: '🏆 T2 Hit',
+    EVENT_SL: '🛑 Stop Loss',
+    EVENT_TRAIL: '📉 Trailing Stop',
+    EVENT_TIME: '⏰ Time Exit'
+}
+
+
+def ccxt_price_fetcher(exchange) -> PriceFetcher:
+    """جلب آخر سعر لعدة عملات بطلب واحد من منصة ccxt"""
+    def fetch(symbols: List[str]) -> Dict[str, float]:
+        tickers = exchange.fetch_tickers(symbols)
+        return {s: t['last'] for s, t in tickers.items() if t.get('last')}
+    return fetch
+
+
+def journal_outcome(event: Dict) -> str:
+    """تحويل حدث الإغلاق إلى نتيجة سجل الإشارات (SignalJournal)"""
+    kind = event['event']
+    if kind == EVENT_SL:
+        return 'T1_SL' if event['t1_hit'] else 'SL'
+    if kind == EVENT_TIME:
+        return 'T1_EXPIRED' if event['t1_hit'] else 'EXPIRED'
+    return kind
+
+
+class _OpenTrade:
+    __slots__ = ('signal_id', 'symbol', 'side', 'entry', 'target1', 'target2', 'stop_loss',
+                 'expires_at', 'trailing_trigger_pct', 'trailing_pct', 'meta', 't1_hit', 'closed', 'triggers')
+
+    def __init__(self, signal_id, symbol, side, entry, target1, target2, stop_loss,
+                 expires_at, trailing_trigger_pct, trailing_pct, meta):
+        self.signal_id = signal_id
+        self.symbol = symbol
+        self.side = side
+        self.entry = entry
+        self.target1 = target1
+        self.target2 = target2
+        self.stop_loss = stop_loss
+        self.expires_at = expires_at
+        self.trailing_trigger_pct = trailing_trigger_pct
+        self.trailing_pct = trailing_pct
+        self.meta = meta
+        self.t1_hit = False
+        self.closed = False
+        self.triggers: List[tuple] = []  # (book, key) لإزالة المستويات عند الإغلاق
+
+
+# حقول الحفظ بترتيب معاملات _OpenTrade ثم t1_hit
+_STATE_FIELDS = ('signal_id', 'symbol', 'side', 'entry', 'target1', 'target2', 'stop_loss', 'expires_at',
+                 'trailing_trigger_pct', 'trailing_pct', 'meta', 't1_hit')
+
+
+class _TriggerBook:
+    """مستويات مرتبة تصاعدياً - تُطلق كل المستويات <= x"""
+
+    def __init__(self):
+        self.keys: List[tuple] = []   # (level, seq)
+        self.refs: Dict[int, tuple] = {}  # seq -> (trade, kind)
+
+    def add(self, key: tuple, trade: _OpenTrade, kind: str):
+        bisect.insort(self.keys, key)
+        self.refs[key[1]] = (trade, kind)
+
+    def remove(self, key: tuple):
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+            self.refs.pop(key[1], None)
+
+    def pop_le(self, x: float) -> List[tuple]:
+        i = bisect.bisect_right(self.keys, (x, float('inf')))
+        if i == 0:
+            return []
+        fired, self.keys[:i] = self.keys[:i], []
+        return [(key,) + self.refs.pop(key[1]) for key in fired]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class _TrailingGroup:
+    """
+    صفقات Trailing بنفس النسبة والاتجاه مجمّعة حسب القمة.
+    السعر الجديد يدمج كل القمم الأقل منه في قمة واحدة (دمج مُطفأ O(1))،
+    والخروج يطلق لاحقة القمم >= x / factor.
+    """
+
+    def __init__(self, factor: float):
+        self.factor = factor
+        self.peaks: List[float] = []
+        self.buckets: Dict[float, List[_OpenTrade]] = {}
+
+    def add(self, peak: float, trade: _OpenTrade):
+        if peak not in self.buckets:
+            bisect.insort(self.peaks, peak)
+            self.buckets[peak] = []
+        self.buckets[peak].append(trade)
+
+    def update(self, x: float) -> List[_OpenTrade]:
+        # 1) الخروج: القمم التي ابتعد عنها السعر بأكثر من النسبة
+        fired = []
+        j = bisect.bisect_left(self.peaks, x / self.factor)
+        if j < len(self.peaks):
+            for peak in self.peaks[j:]:
+                fired.extend(t for t in self.buckets.pop(peak) if not t.closed)
+            del self.peaks[j:]
+
+        # 2) القمم الأقل من السعر الحالي ترتفع إليه
+        i = bisect.bisect_left(self.peaks, x)
+        if i > 0:
+            merged = []
+            for peak in self.peaks[:i]:
+                merged.extend(t for t in self.buckets.pop(peak) if not t.closed)
+            del self.peaks[:i]
+            if merged:
+                self.add(x, merged[0])
+                self.buckets[x].extend(merged[1:])
+
+        return fired
+
+
+class TradeMonitor:
+    """مراقب نتائج الإشارات المفتوحة"""
+
+    def __init__(self, on_event: Callable[[Dict], None], poll_interval: float = 15.0):
+        self.on_event = on_event
+        self.poll_interval = poll_interval
+
+        self._trades: Dict[str, _OpenTrade] = {}
+        # مستويات الصعود (p >= level) ومستويات الهبوط (-p >= -level) لكل عملة
+        self._rise: Dict[str, _TriggerBook] = defaultdict(_TriggerBook)
+        self._fall: Dict[str, _TriggerBook] = defaultdict(_TriggerBook)
+        # symbol -> {(side, pct): _TrailingGroup}
+        self._trailing: Dict[str, Dict[tuple, _TrailingGroup]] = defaultdict(dict)
+        self._expiry_heap: List[tuple] = []
+        self._last_price: Dict[str, float] = {}
+        self._seq = 0
+
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._price_fetcher: Optional[PriceFetcher] = None
+
+    # ------------------------------------------------------------------
+    # إضافة / إزالة
+    # ------------------------------------------------------------------
+
+    def add(self, symbol: str, side: str, entry: float, target1: float, target2: float,
+            stop_loss: float, signal_id: str = None, max_hours: float = None,
+            trailing_trigger_pct: float = None, trailing_pct: float = None,
+            meta: Dict = None) -> str:
+        """إضافة إشارة للمراقبة"""
+        side = side.upper()
+        signal_id = signal_id or uuid.uuid4().hex
+        expires_at = time.time() + max_hours * 3600 if max_hours else None
+        armed = trailing_trigger_pct and trailing_pct
+        trade = _OpenTrade(signal_id, symbol, side, entry, target1, target2, stop_loss, expires_at,
+                           trailing_trigger_pct if armed else None, trailing_pct if armed else None,
+                           meta or {})
+
+        with self._lock:
+            self._register(trade)
+        return signal_id
+
+    def _register(self, trade: _OpenTrade, trailing_peak: float = None):
+        """إضافة مستويات الصفقة (بدون T1 إذا لُمس، وبدون ARM إذا تفعّل الـ Trailing)"""
+        symbol = trade.symbol
+        self._trades[trade.signal_id] = trade
+        # BUY: الأهداف في كتاب الصعود والوقف في كتاب الهبوط - والعكس لـ SELL
+        direction = 1 if trade.side == 'BUY' else -1
+        favorable = self._rise[symbol] if trade.side == 'BUY' else self._fall[symbol]
+        adverse = self._fall[symbol] if trade.side == 'BUY' else self._rise[symbol]
+
+        if not trade.t1_hit:
+            self._add_trigger(favorable, trade, EVENT_T1, direction * trade.target1)
+        self._add_trigger(favorable, trade, EVENT_T2, direction * trade.target2)
+        self._add_trigger(adverse, trade, EVENT_SL, -direction * trade.stop_loss)
+        if trade.trailing_pct:
+            if trailing_peak is not None:
+                self._arm_trailing(trade, trailing_peak)
+            else:
+                arm_level = trade.entry * (1 + direction * trade.trailing_trigger_pct / 100)
+                self._add_trigger(favorable, trade, _ARM, direction * arm_level)
+
+        if trade.expires_at is not None:
+            heapq.heappush(self._expiry_heap, (trade.expires_at, trade.signal_id))
+
+    def remove(self, signal_id: str):
+        """إزالة إشارة من المراقبة بدون حدث"""
+        with self._lock:
+            trade = self._trades.get(signal_id)
+            if trade is not None:
+                self._close(trade)
+
+    def open_symbols(self) -> List[str]:
+        with self._lock:
+            return sorted({t.symbol for t in self._trades.values()})
+
+    def __len__(self):
+        return len(self._trades)
+
+    # ------------------------------------------------------------------
+    # الحفظ والاسترجاع
+    # ------------------------------------------------------------------
+
+    def to_state(self) -> Dict:
+        """الصفقات المفتوحة كقواميس بسيطة (StateStore) - مع قمة الـ Trailing إن تفعّل"""
+        with self._lock:
+            peaks = {}
+            for groups in self._trailing.values():
+                for (side, _), group in groups.items():
+                    for peak, trades in group.buckets.items():
+                        for trade in trades:
+                            if not trade.closed:
+                                peaks[trade.signal_id] = peak if side == 'BUY' else -peak
+            return {
+                'trades': [
+                    {name: getattr(trade, name) for name in _STATE_FIELDS}
+                    for trade in self._trades.values()
+                ],
+                'trailing_peaks': peaks
+            }
+
+    def restore_state(self, state: Dict):
+        """إعادة تسجيل الصفقات المفتوحة من آخر لقطة (المنتهية تُغلق مع أول check_time_exits)"""
+        if not state:
+            return
+        peaks = state.get('trailing_peaks', {})
+        with self._lock:
+            for data in state.get('trades', []):
+                if data['signal_id'] in self._trades:
+                    continue
+                trade = _OpenTrade(*(data[name] for name in _STATE_FIELDS[:-1]))
+                trade.t1_hit = data['t1_hit']
+                self._register(trade, peaks.get(trade.signal_id))
+
+    def _add_trigger(self, book: _TriggerBook, trade: _OpenTrade, kind: str, level: float):
+        self._seq += 1
+        key = (level, self._seq)
+        book.add(key, trade, kind)
+        trade.triggers.append((book, key))
+
+    def _close(self, trade: _OpenTrade):
+        trade.closed = True
+        for book, key in trade.triggers:
+            book.remove(key)
+        trade.triggers = []
+        self._trades.pop(trade.signal_id, None)
+
+    # ------------------------------------------------------------------
+    # تحديثات الأسعار
+    # ------------------------------------------------------------------
+
+    def on_price(self, symbol: str, price: float) -> List[Dict]:
+        """معالجة سعر جديد لعملة - يعيد الأحداث الناتجة"""
+        events = []
+        with self._lock:
+            self._last_price[symbol] = price
+
+            # المستويات المُطلقة مرتبة حسب المستوى: T1 قبل T2 عند القفزات
+            fired = []
+            if symbol in self._rise:
+                fired.extend(self._rise[symbol].pop_le(price))
+            if symbol in self._fall:
+                fired.extend(self._fall[symbol].pop_le(-price))
+
+            for key, trade, kind in fired:
+                if trade.closed:
+                    continue
+                trade.triggers = [(b, k) for b, k in trade.triggers if k != key]
+
+                if kind == _ARM:
+                    self._arm_trailing(trade, price)
+                elif kind == EVENT_T1:
+                    trade.t1_hit = True
+                    events.append(self._event(trade, EVENT_T1, price, closed=False))
+                else:
+                    events.append(self._event(trade, kind, price, closed=True))
+                    self._close(trade)
+
+            for (side, _), group in self._trailing.get(symbol, {}).items():
+                x = price if side == 'BUY' else -price
+                for trade in group.update(x):
+                    events.append(self._event(trade, EVENT_TRAIL, price, closed=True))
+                    self._close(trade)
+
+        self._emit(events)
+        return events
+
+    def on_prices(self, prices: Dict[str, float]) -> List[Dict]:
+        events = []
+        for symbol, price in prices.items():
+            events.extend(self.on_price(symbol, price))
+        events.extend(self.check_time_exits())
+        return events
+
+    def check_time_exits(self, now: float = None) -> List[Dict]:
+        """خروج زمني للصفقات التي تجاوزت المدة القصوى"""
+        now = now or time.time()
+        events = []
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                _, signal_id = heapq.heappop(self._expiry_heap)
+                trade = self._trades.get(signal_id)
+                if trade is None or trade.closed:
+                    continue
+                price = self._last_price.get(trade.symbol, trade.entry)
+                events.append(self._event(trade, EVENT_TIME, price, closed=True))
+                self._close(trade)
+
+        self._emit(events)
+        return events
+
+    def _arm_trailing(self, trade: _OpenTrade, price: float):
+        pct = trade.trailing_pct
+        factor = 1 - pct / 100 if trade.side == 'BUY' else 1 + pct / 100
+        groups = self._trailing[trade.symbol]
+        group = groups.get((trade.side, pct))
+        if group is None:
+            group = groups[(trade.side, pct)] = _TrailingGroup(factor)
+        group.add(price if trade.side == 'BUY' else -price, trade)
+
+    def _event(self, trade: _OpenTrade, kind: str, price: float, closed: bool) -> Dict:
+        direction = 1 if trade.side == 'BUY' else -1
+        return {
+            'signal_id': trade.signal_id,
+            'symbol': trade.symbol,
+            'side': trade.side,
+            'event': kind,
+            'price': price,
+            'entry': trade.entry,
+            'pnl_pct': (price - trade.entry) / trade.entry * 100 * direction if trade.entry else 0.0,
+            't1_hit': trade.t1_hit,
+            'closed': closed,
+            'meta': trade.meta
+        }
+
+    def _emit(self, events: Iterable[Dict]):
+        for event in events:
+            try:
+                self.on_event(event)
+            except Exception as e:
+                logging.warning(f"⚠️ Trade monitor callback failed: {e}")
+
+    # ------------------------------------------------------------------
+    # الاستطلاع الدوري للأسعار
+    # ------------------------------------------------------------------
+
+    def start(self, price_fetcher: PriceFetcher):
+        """بدء استطلاع الأسعار في خيط خلفي"""
+        self._price_fetcher = price_fetcher
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _poll_loop(self):
+        while not self._stop_event.wait(self.poll_interval):
+            symbols = self.open_symbols()
+            if not symbols:
+                continue
+            try:
+                self.on_prices(self._price_fetcher(symbols))
+            except Exception as e:
+                logging.warning(f"⚠️ Trade monitor price poll failed: {e}")
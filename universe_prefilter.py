@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🌐 Universe Prefilter
+فلتر مسبق رخيص لكل أزواج USDT قبل التحليل الكامل المكلف
+
+المرحلة 1: لقطة الـ tickers كاملة (مصفوفات NumPy) - السيولة، السبريد، مدى 24h
+المرحلة 2: آخر شموع قليلة (مخزنة لكل شمعة مغلقة) كمصفوفة 2-D لكل العملات دفعة واحدة
+           - التقلب، انفجار الحجم، انضغاط النطاق
+فقط الناجون يمرون للاستراتيجية الكاملة.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# candle_loader(symbol, timeframe, limit=N) -> [[ts, open, high, low, close, volume], ...]
+# (توقيع exchange.fetch_ohlcv نفسه)
+CandleLoader = Callable[..., List[List[float]]]
+
+_TIMEFRAME_SECONDS = {'1m': 60, '5m': 300, '15m': 900, '30m': 1800, '1h': 3600, '4h': 14400}
+
+
+def _rank(values: np.ndarray) -> np.ndarray:
+    """ترتيب مئوي 0..1 (الأعلى = 1)"""
+    if len(values) < 2:
+        return np.ones(len(values))
+    return values.argsort().argsort() / (len(values) - 1)
+
+
+class UniversePrefilter:
+    """فلتر من مرحلتين لتوسيع نطاق المسح لمئات الأزواج"""
+
+    def __init__(self, candle_loader: CandleLoader, timeframe: str = '15m', candles: int = 24,
+                 min_volume_usdt: float = 1_000_000, max_spread_pct: float = 0.3,
+                 min_range_pct: float = 1.0, max_survivors: int = 40, core_top: int = 10,
+                 max_workers: int = 8):
+        self.candle_loader = candle_loader
+        self.timeframe = timeframe
+        self.candles = candles
+        self.min_volume_usdt = min_volume_usdt
+        self.max_spread_pct = max_spread_pct
+        self.min_range_pct = min_range_pct
+        self.max_survivors = max_survivors
+        self.core_top = core_top
+        self.max_workers = max_workers
+
+        self._tf_seconds = _TIMEFRAME_SECONDS.get(timeframe, 900)
+        # symbol -> (candle_bucket, ndarray[candles, 6])
+        self._cache: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self.last_stats: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # المرحلة 1: الـ tickers
+    # ------------------------------------------------------------------
+
+    def stage1(self, tickers: Dict[str, Dict], symbols: Iterable[str]) -> List[str]:
+        """فلترة كل الأزواج من لقطة الـ tickers - يعيدها مرتبة حسب الحجم"""
+        symbols = [s for s in symbols if s in tickers]
+        if not symbols:
+            return []
+
+        def column(key):
+            return np.fromiter(((tickers[s].get(key) or 0.0) for s in symbols),
+                               dtype=float, count=len(symbols))
+
+        last, high, low = column('last'), column('high'), column('low')
+        bid, ask, volume = column('bid'), column('ask'), column('quoteVolume')
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            range_pct = np.where(last > 0, (high - low) / last * 100, 0.0)
+            spread_pct = np.where((bid > 0) & (ask > 0), (ask - bid) / last * 100, 0.0)
+
+        mask = (
+            (last > 0)
+            & (volume >= self.min_volume_usdt)
+            & (spread_pct <= self.max_spread_pct)
+            & (range_pct >= self.min_range_pct)
+        )
+        idx = np.flatnonzero(mask)
+        idx = idx[np.argsort(-volume[idx], kind='stable')]
+        return [symbols[i] for i in idx]
+
+    # ------------------------------------------------------------------
+    # المرحلة 2: الشموع الأخيرة
+    # ------------------------------------------------------------------
+
+    def stage2(self, candles: Dict[str, np.ndarray]) -> List[str]:
+        """تقييم كل العملات دفعة واحدة من آخر الشموع - يعيدها مرتبة حسب النقاط"""
+        symbols = [s for s, c in candles.items() if c is not None and len(c) >= self.candles]
+        if not symbols:
+            return []
+
+        block = np.stack([candles[s][-self.candles:] for s in symbols])  # (n, k, 6)
+        highs, lows, closes, volumes = block[:, :, 2], block[:, :, 3], block[:, :, 4], block[:, :, 5]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # التقلب: انحراف العوائد اللوغاريتمية
+            returns = np.diff(np.log(np.maximum(closes, 1e-12)), axis=1)
+            volatility = np.nan_to_num(returns.std(axis=1))
+
+            # انفجار الحجم: آخر شمعة مغلقة مقابل متوسط ما قبلها
+            base_volume = volumes[:, :-1].mean(axis=1)
+            volume_spike = np.nan_to_num(np.where(base_volume > 0, volumes[:, -1] / base_volume, 0.0))
+
+            # انضغاط النطاق: نطاق الثلث الأخير مقابل نطاق النافذة كاملة (أصغر = أكثر انضغاطاً)
+            tail = max(2, self.candles // 3)
+            full_range = highs.max(axis=1) - lows.min(axis=1)
+            tail_range = highs[:, -tail:].max(axis=1) - lows[:, -tail:].min(axis=1)
+            compression = np.nan_to_num(np.where(full_range > 0, tail_range / full_range, 1.0), nan=1.0)
+
+        score = 0.35 * _rank(volatility) + 0.40 * _rank(volume_spike) + 0.25 * (1 - _rank(compression))
+        order = np.argsort(-score, kind='stable')
+        return [symbols[i] for i in order]
+
+    # ------------------------------------------------------------------
+    # التشغيل الكامل
+    # ------------------------------------------------------------------
+
+    def select(self, tickers: Dict[str, Dict], symbols: Iterable[str]) -> List[str]:
+        """المرحلتان معاً - يعيد الناجين (أعلى حجم + أفضل نقاط المرحلة 2)"""
+        started = time.time()
+        stage1 = self.stage1(tickers, symbols)
+        candles = self._load_candles(stage1)
+        stage2 = self.stage2(candles)
+
+        survivors = stage1[:self.core_top]
+        chosen = set(survivors)
+        for symbol in stage2:
+            if len(survivors) >= self.max_survivors:
+                break
+            if symbol not in chosen:
+                survivors.append(symbol)
+                chosen.add(symbol)
+
+        self.last_stats = {
+            'universe': len(tickers),
+            'stage1': len(stage1),
+            'stage2': len(stage2),
+            'survivors': len(survivors)
+        }
+        logging.info(
+            f"🌐 Prefilter: {len(stage1)} → {len(stage2)} → {len(survivors)} "
+            f"({time.time() - started:.1f}s)"
+        )
+        return survivors
+
+    def _load_candles(self, symbols: List[str]) -> Dict[str, np.ndarray]:
+        """تحميل الشموع الأخيرة - إعادة الجلب فقط عند إغلاق شمعة جديدة"""
+        bucket = int(time.time() // self._tf_seconds)
+        with self._lock:
+            stale = [s for s in symbols if self._cache.get(s, (None,))[0] != bucket]
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for symbol, data in zip(stale, executor.map(self._fetch, stale)):
+                    if data is not None:
+                        with self._lock:
+                            self._cache[symbol] = (bucket, data)
+
+        with self._lock:
+            wanted = set(symbols)
+            # تنظيف العملات التي خرجت من المرحلة 1
+            for symbol in [s for s in self._cache if s not in wanted]:
+                del self._cache[symbol]
+            return {s: self._cache[s][1] for s in symbols if s in self._cache}
+
+    def _fetch(self, symbol: str) -> Optional[np.ndarray]:
+        try:
+            # +1 لاستبعاد الشمعة الحالية غير المغلقة
+            data = self.candle_loader(symbol, self.timeframe, limit=self.candles + 1)
+            if not data or len(data) < self.candles + 1:
+                return None
+            return np.asarray(data[-(self.candles + 1):-1], dtype=float)
+        except Exception as e:
+            logging.debug(f"Prefilter candles failed for {symbol}: {e}")
+            return None
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📐 Zone Registry
+سجل دائم لمناطق الأسعار (FVG / Order Blocks) لكل عملة
+
+- IntervalIndex: الفترات مرتبة حسب الحد السفلي + شجرة مقاطع لأكبر حد علوي
+  → "أي المناطق تحتوي هذا السعر؟" و"أي المناطق لمستها الشمعة؟" في O(log n + k)
+- ZoneBook: مناطق عملة واحدة، تُحدّث تدريجياً مع كل شمعة مغلقة (نسبة الملء / عدد الاختبارات)
+  بدل إعادة الكشف من الصفر في كل مسح؛ المناطق المستهلكة تُحذف من الفهرس
+- ZoneRegistry: ZoneBook لكل عملة (آمن للاستخدام من عدة threads)
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+INF = float('inf')
+
+
+class IntervalIndex:
+    """فهرس فترات مغلقة [low, high] بمعرّفات"""
+
+    def __init__(self):
+        self._lows: List[float] = []
+        self._highs: List[float] = []
+        self._ids: List[int] = []
+        # شجرة المقاطع تُبنى عند أول استعلام بعد أي تعديل
+        self._tree: Optional[List[float]] = None
+        self._size = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, item_id: int, low: float, high: float):
+        pos = bisect_right(self._lows, low)
+        self._lows.insert(pos, low)
+        self._highs.insert(pos, high)
+        self._ids.insert(pos, item_id)
+        self._tree = None
+
+    def remove(self, item_id: int, low: float):
+        pos = self._ids.index(item_id, bisect_left(self._lows, low))
+        del self._lows[pos], self._highs[pos], self._ids[pos]
+        self._tree = None
+
+    def _build(self):
+        size = 1
+        while size < len(self._highs):
+            size *= 2
+        tree = [-INF] * (2 * size)
+        tree[size:size + len(self._highs)] = self._highs
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._tree, self._size = tree, size
+
+    def overlapping(self, low: float, high: float) -> List[int]:
+        """معرّفات الفترات المتقاطعة مع [low, high] (الأطراف مشمولة) مرتبة حسب الحد السفلي"""
+        end = bisect_right(self._lows, high)
+        if end == 0:
+            return []
+        if self._tree is None:
+            self._build()
+        tree, size = self._tree, self._size
+
+        found = []
+        stack = [(1, 0, size)]
+        while stack:
+            node, start, stop = stack.pop()
+            if start >= end or tree[node] < low:
+                continue
+            if node >= size:
+                found.append(self._ids[start])
+                continue
+            mid = (start + stop) // 2
+            stack.append((2 * node + 1, mid, stop))
+            stack.append((2 * node, start, mid))
+        return found
+
+    def containing(self, price: float) -> List[int]:
+        """معرّفات الفترات التي تحتوي السعر"""
+        return self.overlapping(price, price)
+
+
+@dataclass
+class Zone:
+    """منطقة سعرية واحدة (FVG أو Order Block)"""
+    id: int
+    kind: str
+    low: float
+    high: float
+    seq: int                  # الرقم التسلسلي لشمعة المنطقة
+    fill: float = 0.0         # نسبة الملء %
+    touches: int = 0          # عدد الاختبارات
+    data: Dict = field(default_factory=dict)
+
+
+class ZoneBook:
+    """
+    مناطق عملة واحدة
+    الشموع المغلقة تُعالج مرة واحدة: pending() يعطي موضع أول شمعة جديدة في النافذة
+    و advance() يسجلها؛ seq يرقّم الشموع المغلقة ترقيماً مطلقاً لا يتغير مع انزلاق النافذة
+    """
+
+    def __init__(self):
+        self.zones: Dict[int, Zone] = {}
+        self.index = IntervalIndex()
+        self.last_key = None
+        self.seq = -1
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self.zones)
+
+    def reset(self):
+        self.zones.clear()
+        self.index = IntervalIndex()
+        self.last_key = None
+        self.seq = -1
+
+    def pending(self, keys) -> int:
+        """موضع أول شمعة لم تُعالج في keys (index الـ DataFrame) - يبدأ من الصفر إذا انقطعت السلسلة"""
+        if self.last_key is not None:
+            try:
+                pos = keys.get_loc(self.last_key)
+            except KeyError:
+                pos = None
+            if isinstance(pos, int):
+                return pos + 1
+        self.reset()
+        return 0
+
+    def advance(self, key):
+        """تسجيل شمعة مغلقة تمت معالجتها"""
+        self.last_key = key
+        self.seq += 1
+
+    def position(self, zone: Zone, last_closed: int) -> int:
+        """موضع شمعة المنطقة في النافذة الحالية (last_closed = موضع آخر شمعة مغلقة)"""
+        return last_closed - (self.seq - zone.seq)
+
+    def add(self, kind: str, low: float, high: float, seq: int, data: Optional[Dict] = None) -> Zone:
+        zone = Zone(self._next_id, kind, low, high, seq, data=data or {})
+        self._next_id += 1
+        self.zones[zone.id] = zone
+        self.index.add(zone.id, low, high)
+        return zone
+
+    def retire(self, zone: Zone):
+        """حذف منطقة مستهلكة (مملوءة / مُختبرة أكثر من الحد)"""
+        if self.zones.pop(zone.id, None) is not None:
+            self.index.remove(zone.id, zone.low)
+
+    def retire_before(self, seq: int):
+        """حذف المناطق التي خرجت شمعتها من النافذة (المناطق مضافة بترتيب seq)"""
+        for zone in list(self.zones.values()):
+            if zone.seq >= seq:
+                break
+            self.retire(zone)
+
+    def overlapping(self, low: float, high: float) -> List[Zone]:
+        return [self.zones[zone_id] for zone_id in self.index.overlapping(low, high)]
+
+    def containing(self, price: float) -> List[Zone]:
+        return [self.zones[zone_id] for zone_id in self.index.containing(price)]
+
+
+class ZoneRegistry:
+    """ZoneBook لكل عملة"""
+
+    def __init__(self):
+        self._books: Dict[str, ZoneBook] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._books)
+
+    def book(self, symbol: str) -> ZoneBook:
+        with self._lock:
+            book = self._books.get(symbol)
+            if book is None:
+                book = self._books[symbol] = ZoneBook()
+            return book
+
+    def drop(self, symbol: str):
+        with self._lock:
+            self._books.pop(symbol, None)
+
+    def containing(self, symbol: str, price: float) -> List[Zone]:
+        """المناطق النشطة لعملة التي تحتوي السعر"""
+        with self._lock:
+            book = self._books.get(symbol)
+        return book.containing(price) if book is not None else []
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'symbols': len(self._books),
+                    'zones': sum(len(book) for book in self._books.values())}